@@ -0,0 +1,248 @@
+from datetime import date, timedelta
+from threading import Lock
+from typing import Callable, Dict, List, Optional
+from HotelBookingSystem import Room, RoomType
+
+
+# Segment tree over the days of the booking horizon.
+# Every room of a type owns one bit, a leaf holds the bitmask of rooms free on that night
+# and an inner node holds the AND of its children, i.e. the rooms free on every night of its range.
+# Booking clears a room's bit over a range of nights, releasing sets it again; both are lazy range updates.
+class DayMaskTree:
+    def __init__(self, days:int):
+        self.days=days
+        self.value=[0]*(4*days)
+        self.clear_mask=[0]*(4*days)
+        self.set_mask=[0]*(4*days)
+
+    def build(self, leaves:List[int]):
+        """Bulk load one free-room mask per day, O(days) instead of one range update per booking."""
+        self.clear_mask=[0]*(4*self.days)
+        self.set_mask=[0]*(4*self.days)
+        self._build(1, 0, self.days-1, leaves)
+
+    def _build(self, node:int, lo:int, hi:int, leaves:List[int]):
+        if lo==hi:
+            self.value[node]=leaves[lo]
+            return
+        mid=(lo+hi)//2
+        self._build(2*node, lo, mid, leaves)
+        self._build(2*node+1, mid+1, hi, leaves)
+        self.value[node]=self.value[2*node] & self.value[2*node+1]
+
+    def _apply(self, node:int, clear:int, set_:int):
+        self.value[node]=(self.value[node] & ~clear) | set_
+        self.clear_mask[node]=(self.clear_mask[node] & ~set_) | clear
+        self.set_mask[node]=(self.set_mask[node] & ~clear) | set_
+
+    def _push(self, node:int):
+        clear, set_=self.clear_mask[node], self.set_mask[node]
+        if clear or set_:
+            self._apply(2*node, clear, set_)
+            self._apply(2*node+1, clear, set_)
+            self.clear_mask[node]=0
+            self.set_mask[node]=0
+
+    def _update(self, node:int, lo:int, hi:int, left:int, right:int, clear:int, set_:int):
+        if right<lo or hi<left:
+            return
+        if left<=lo and hi<=right:
+            self._apply(node, clear, set_)
+            return
+        self._push(node)
+        mid=(lo+hi)//2
+        self._update(2*node, lo, mid, left, right, clear, set_)
+        self._update(2*node+1, mid+1, hi, left, right, clear, set_)
+        self.value[node]=self.value[2*node] & self.value[2*node+1]
+
+    def _query(self, node:int, lo:int, hi:int, left:int, right:int)->int:
+        if right<lo or hi<left:
+            return -1
+        if left<=lo and hi<=right:
+            return self.value[node]
+        self._push(node)
+        mid=(lo+hi)//2
+        return self._query(2*node, lo, mid, left, right) & self._query(2*node+1, mid+1, hi, left, right)
+
+    def mark_booked(self, first_day:int, last_day:int, bits:int):
+        self._update(1, 0, self.days-1, first_day, last_day, bits, 0)
+
+    def mark_free(self, first_day:int, last_day:int, bits:int):
+        self._update(1, 0, self.days-1, first_day, last_day, 0, bits)
+
+    def free_rooms(self, first_day:int, last_day:int)->int:
+        """Bitmask of rooms free on every night from first_day to last_day, O(log days)."""
+        return self._query(1, 0, self.days-1, first_day, last_day)
+
+
+class RoomTypeAvailability:
+    def __init__(self, start:int, days:int):
+        # first night of this type's tree as a date ordinal, moves forward with the index horizon
+        self.start=start
+        self.tree=DayMaskTree(days)
+        self.rooms:List[Room]=[]
+        self.bits:Dict[str,int]={}
+        self.lock=Lock()
+
+
+# The horizon starts at today and moves forward when the day changes: the first read on a new day rebuilds
+# every type's tree from the room calendars, the nights that fell into the past drop out and the new far end
+# nights come in. Each type is rolled with all its room locks held, taken in room number order before the
+# type's lock like Room.book does, so no booking of the type is half applied while its tree is rebuilt.
+# Rooms added to the index call book/release themselves under the room lock right after changing their
+# calendar, so the changes of a room reach the index in the same order as its calendar.
+class AvailabilityIndex:
+    def __init__(self, start:date=None, days:int=365, today:Callable[[],date]=date.today):
+        """
+        :param start: First night covered by the index, defaults to today
+        :param days: Length of the booking horizon. Stays outside it fall back to checking room calendars.
+        :param today: Clock for the current day, once it passes `start` the horizon starts at today
+        """
+        self.today=today
+        self.start=(start or today()).toordinal()
+        self.days=days
+        self.types:Dict[RoomType,RoomTypeAvailability]={room_type:RoomTypeAvailability(self.start, days) for room_type in RoomType}
+        self.roll_lock=Lock()
+
+    def get_horizon(self)->tuple:
+        self._advance()
+        return date.fromordinal(self.start), date.fromordinal(self.start+self.days)
+
+    def _advance(self):
+        # only called from reads, a booking runs under a room lock and must not wait for the other rooms
+        if self.today().toordinal()>self.start:
+            self.advance(self.today())
+
+    def advance(self, day:date):
+        """Move the horizon forward to start at `day`, a no-op if it already starts there or later."""
+        start=day.toordinal()
+        with self.roll_lock:
+            if start<=self.start:
+                return
+            for index in list(self.types.values()):
+                self._roll(index, start)
+            self.start=start
+
+    def _roll(self, index:RoomTypeAvailability, start:int):
+        rooms=sorted(list(index.rooms), key=lambda room: room.get_room_number())
+        for room in rooms:
+            room.lock.acquire()
+        try:
+            with index.lock:
+                index.start=start
+                index.tree.build(self._free_masks(index, start))
+        finally:
+            for room in reversed(rooms):
+                room.lock.release()
+
+    def _free_masks(self, index:RoomTypeAvailability, start:int)->List[int]:
+        """Free room bitmask per night of the horizon starting at `start`, read from the room calendars."""
+        booked=[0]*self.days
+        for room in index.rooms:
+            bit=index.bits[room.get_room_number()]
+            for checkin, checkout, _ in room.calendar.get_bookings():
+                nights=self._nights(start, checkin, checkout)
+                if nights:
+                    for day in range(nights[0], nights[1]+1):
+                        booked[day]|=bit
+        everyone=(1<<len(index.rooms))-1
+        return [everyone & ~mask for mask in booked]
+
+    def _nights(self, start:int, checkin:date, checkout:date):
+        """Night indexes of the stay clipped to the horizon starting at `start`, None if nothing overlaps."""
+        first=max(checkin.toordinal()-start, 0)
+        last=min(checkout.toordinal()-start, self.days)-1
+        return (first, last) if first<=last else None
+
+    def _covers(self, start:int, checkin:date, checkout:date)->bool:
+        return checkin.toordinal()>=start and checkout.toordinal()<=start+self.days
+
+    def add_room(self, room:Room):
+        index=self.types[room.get_type()]
+        with index.lock:
+            if room.get_room_number() in index.bits:
+                return
+            bit=1<<len(index.rooms)
+            index.bits[room.get_room_number()]=bit
+            index.rooms.append(room)
+            room.availability=self
+            index.tree.mark_free(0, self.days-1, bit)
+            for checkin, checkout, _ in room.calendar.get_bookings():
+                nights=self._nights(index.start, checkin, checkout)
+                if nights:
+                    index.tree.mark_booked(nights[0], nights[1], bit)
+
+    def rebuild(self, rooms:List[Room]):
+        """Re-index every room from its calendar in one pass, used when restoring a hotel."""
+        self.start=max(self.start, self.today().toordinal())
+        by_type={room_type:[] for room_type in RoomType}
+        for room in rooms:
+            by_type[room.get_type()].append(room)
+        for room_type, typed_rooms in by_type.items():
+            index=RoomTypeAvailability(self.start, self.days)
+            for position, room in enumerate(typed_rooms):
+                index.bits[room.get_room_number()]=1<<position
+                index.rooms.append(room)
+                room.availability=self
+            index.tree.build(self._free_masks(index, self.start))
+            self.types[room_type]=index
+
+    def book(self, room:Room, checkin:date, checkout:date):
+        index=self.types[room.get_type()]
+        with index.lock:
+            nights=self._nights(index.start, checkin, checkout)
+            if nights:
+                index.tree.mark_booked(nights[0], nights[1], index.bits[room.get_room_number()])
+
+    def release(self, room:Room, checkin:date, checkout:date):
+        index=self.types[room.get_type()]
+        with index.lock:
+            nights=self._nights(index.start, checkin, checkout)
+            if nights:
+                index.tree.mark_free(nights[0], nights[1], index.bits[room.get_room_number()])
+
+    def _free_mask(self, index:RoomTypeAvailability, checkin:date, checkout:date)->Optional[int]:
+        """Rooms free for the whole stay, None if the stay is not inside the horizon."""
+        with index.lock:
+            if not self._covers(index.start, checkin, checkout):
+                return None
+            first, last=self._nights(index.start, checkin, checkout)
+            return index.tree.free_rooms(first, last)
+
+    def count_available(self, room_type:RoomType, checkin:date, checkout:date)->int:
+        """Rooms of the type free for the whole stay."""
+        if checkin>=checkout:
+            raise ValueError("Check-out must be after check-in")
+        self._advance()
+        index=self.types[room_type]
+        mask=self._free_mask(index, checkin, checkout)
+        if mask is None:
+            return sum(1 for room in list(index.rooms) if room.is_available(checkin, checkout))
+        return mask.bit_count()
+
+    def search(self, room_type:RoomType, checkin:date, checkout:date, limit:int=None)->List[Room]:
+        """Rooms of the type free for the whole stay; only free rooms are visited."""
+        if checkin>=checkout:
+            raise ValueError("Check-out must be after check-in")
+        self._advance()
+        index=self.types[room_type]
+        mask=self._free_mask(index, checkin, checkout)
+        if mask is None:
+            rooms=[room for room in list(index.rooms) if room.is_available(checkin, checkout)]
+            return rooms[:limit] if limit is not None else rooms
+        rooms=[]
+        while mask and (limit is None or len(rooms)<limit):
+            low=mask & -mask
+            rooms.append(index.rooms[low.bit_length()-1])
+            mask^=low
+        return rooms
+
+    def booked_count(self, room_type:RoomType, night:date)->int:
+        """Rooms of the type booked on a single night."""
+        self._advance()
+        index=self.types[room_type]
+        with index.lock:
+            day=night.toordinal()-index.start
+            if 0<=day<self.days:
+                return len(index.rooms)-index.tree.free_rooms(day, day).bit_count()
+        return sum(1 for room in list(index.rooms) if not room.is_available(night, night+timedelta(days=1)))
@@ -0,0 +1,72 @@
+import heapq
+import itertools
+import time
+from threading import Condition, Thread
+from typing import Callable, Optional
+
+
+# Min-heap of hold deadlines. Adding a hold is O(log n) and a sweep only pops holds that are due,
+# it never scans all reservations. Holds confirmed early simply stay in the heap until their deadline
+# and are skipped then (lazy deletion). One sweeper can serve several hotels: each hold may carry its own callback.
+class HoldExpiry:
+    def __init__(self, on_expire:Callable[['Reservation',float],None]=None, clock:Callable[[],float]=time.monotonic):
+        """
+        :param on_expire: Called with each reservation whose hold deadline has passed and the sweep time,
+            unless the hold was added with a callback of its own
+        :param clock: Monotonic time source, deadlines are expressed in it
+        """
+        self.on_expire=on_expire
+        self.clock=clock
+        self.heap=[]
+        self.counter=itertools.count()
+        self.cond=Condition()
+        self.thread:Optional[Thread]=None
+        self.running=False
+
+    def add(self, reservation:'Reservation', ttl:float, on_expire:Callable[['Reservation',float],None]=None)->float:
+        deadline=self.clock()+ttl
+        reservation.expires_at=deadline
+        with self.cond:
+            heapq.heappush(self.heap, (deadline, next(self.counter), reservation, on_expire or self.on_expire))
+            if self.heap[0][2] is reservation:
+                self.cond.notify()
+        return deadline
+
+    def sweep(self, now:float=None)->int:
+        """Expire every hold due at `now`, returns how many were handed to on_expire."""
+        now=self.clock() if now is None else now
+        due=[]
+        with self.cond:
+            while self.heap and self.heap[0][0]<=now:
+                due.append(heapq.heappop(self.heap)[2:])
+        for reservation, on_expire in due:
+            on_expire(reservation, now)
+        return len(due)
+
+    def start(self):
+        with self.cond:
+            if self.running:
+                return
+            self.running=True
+        self.thread=Thread(target=self._run, name="hold-expiry", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        with self.cond:
+            self.running=False
+            self.cond.notify()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread=None
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while self.running and (not self.heap or self.heap[0][0]>self.clock()):
+                    self.cond.wait(self.heap[0][0]-self.clock() if self.heap else None)
+                if not self.running:
+                    return
+            self.sweep()
+
+    def __len__(self)->int:
+        return len(self.heap)
@@ -0,0 +1,697 @@
+"""Hotel Booking Benchmarks
+Run from this directory:
+    python HotelBookingBenchmark.py availability        # AvailabilityIndex vs scanning room calendars
+    python HotelBookingBenchmark.py concurrency         # multi-threaded book_room, per-room vs global locking
+    python HotelBookingBenchmark.py payments            # booking throughput under slow payment backends
+    python HotelBookingBenchmark.py group               # book_rooms vs a book_room loop for large groups
+    python HotelBookingBenchmark.py recovery            # journal write rate and crash recovery time
+    python HotelBookingBenchmark.py pricing             # prefix sum rate tables vs per night pricing
+    python HotelBookingBenchmark.py analytics           # columnar occupancy/ADR/RevPAR vs iterating Reservation objects
+    python HotelBookingBenchmark.py chain               # HotelChain booking throughput across worker processes
+    python HotelBookingBenchmark.py load                # mixed booking/cancel/check-in/check-out load test
+    python HotelBookingBenchmark.py --output results.json availability
+    python HotelBookingBenchmark.py --compare results.json load
+
+With --output every benchmark's rows are written as JSON for regression tracking,
+--compare prints the change of every *_per_sec figure against such a file.
+"""
+import bisect
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+from HotelBookingSystem import Guest, Reservation, ReservationStatus, Room, RoomType
+from RoomCalendar import RoomCalendar
+from ReservationJournal import ReservationJournal, event_record, guest_record, hold_record, room_record
+from AvailabilityIndex import AvailabilityIndex
+from HotelChain import HotelChain
+from HotelManagement import HotelManagement
+from PaymentPipeline import FakePaymentProvider, PaymentPipeline
+from PricingEngine import PricingEngine
+from RevenueAnalytics import RevenueAnalytics, np
+
+
+def make_rooms(count:int, rng:random.Random)->list:
+    types=list(RoomType)
+    return [Room(types[rng.randrange(len(types))], f"R{i:05d}", rng.choice((100.0, 150.0, 200.0, 400.0))) for i in range(count)]
+
+
+def random_stay(start:date, days:int, rng:random.Random, max_nights:int=7)->tuple:
+    nights=rng.randint(1, max_nights)
+    checkin=start+timedelta(days=rng.randrange(days-nights))
+    return checkin, checkin+timedelta(days=nights)
+
+
+def availability_search(rooms:int=5000, days:int=365, bookings:int=200_000, queries:int=2000, seed:int=3)->list[dict]:
+    """
+    Fills a `rooms` x `days` inventory with random stays, then answers "how many / which rooms of a type are
+    free from D1 to D2" through the index and by scanning every room calendar of that type.
+    """
+    rng=random.Random(seed)
+    start=date.today()
+    inventory=make_rooms(rooms, rng)
+    index=AvailabilityIndex(start, days)
+    for room in inventory:
+        index.add_room(room)
+
+    booked=0
+    fill_start=time.perf_counter()
+    for _ in range(bookings):
+        room=inventory[rng.randrange(rooms)]
+        checkin, checkout=random_stay(start, days, rng)
+        # rooms added to the index update it themselves
+        if room.book(checkin, checkout, str(uuid.uuid4())):
+            booked+=1
+    fill_seconds=time.perf_counter()-fill_start
+
+    by_type={room_type:[room for room in inventory if room.get_type()==room_type] for room_type in RoomType}
+    workload=[(rng.choice(list(RoomType)),)+random_stay(start, days, rng, 14) for _ in range(queries)]
+
+    results=[]
+    timings={}
+    for name, count, search in (
+        ("index", index.count_available, index.search),
+        ("scan", lambda t, a, b: sum(1 for room in by_type[t] if room.is_available(a, b)),
+                 lambda t, a, b: [room for room in by_type[t] if room.is_available(a, b)]),
+    ):
+        t0=time.perf_counter()
+        counts=[count(*query) for query in workload]
+        t1=time.perf_counter()
+        listed=[len(search(*query)) for query in workload]
+        t2=time.perf_counter()
+        timings[name]=(counts, listed)
+        results.append({
+            "method": name,
+            "rooms": rooms,
+            "days": days,
+            "bookings": booked,
+            "count_us": round((t1-t0)/queries*1e6, 2),
+            "list_us": round((t2-t1)/queries*1e6, 2),
+            "index_update_us": round(fill_seconds/bookings*1e6, 2) if name=="index" else None,
+        })
+    if timings["index"]!=timings["scan"]:
+        raise AssertionError("AvailabilityIndex disagrees with room calendars")
+    return results
+
+
+class SlowPayment:
+    """Stands in for a payment provider round trip."""
+    def __init__(self, latency:float):
+        self.latency=latency
+
+    def pay(self, price:float)->bool:
+        time.sleep(self.latency)
+        return price>0
+
+
+def reset_hotel():
+    if HotelManagement._instance is not None:
+        HotelManagement._instance.shutdown()
+        HotelManagement._instance=None
+
+
+def fresh_hotel(rooms:int, payment_latency:float, rng:random.Random)->HotelManagement:
+    reset_hotel()
+    hotel=HotelManagement()
+    hotel.payment_manager.paymentMethods=[SlowPayment(payment_latency)]
+    for room in make_rooms(rooms, rng):
+        hotel.add_rooms(room)
+    return hotel
+
+
+def run_threads(threads:int, worker)->float:
+    pool=[threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start=time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+    return time.perf_counter()-start
+
+
+def double_bookings(hotel:HotelManagement)->int:
+    """Overlapping stays of the same room among live reservations, should always be 0."""
+    stays={}
+    for reservation in hotel.reservations.values():
+        for room in reservation.get_rooms():
+            stays.setdefault(room.get_room_number(), []).append((reservation.checkin, reservation.checkout))
+    violations=0
+    for ranges in stays.values():
+        ranges.sort()
+        violations+=sum(1 for (_, end), (start, _) in zip(ranges, ranges[1:]) if start<end)
+    return violations
+
+
+def booking_concurrency(thread_counts=(1, 4, 16, 32), rooms:int=500, bookings_per_thread:int=50, payment_latency:float=0.002, seed:int=5)->list[dict]:
+    """
+    Threads book random rooms and dates while every payment sleeps `payment_latency` seconds.
+    "global" replays the old behaviour of one hotel wide lock held across payment.
+    """
+    results=[]
+    start_day=date.today()
+    for mode in ("per_room", "global"):
+        for threads in thread_counts:
+            rng=random.Random(seed)
+            hotel=fresh_hotel(rooms, payment_latency, rng)
+            room_list=list(hotel.rooms.values())
+            guest=Guest("Load", "0", "load@example.com")
+            global_lock=threading.Lock()
+            booked=[0]*threads
+
+            def worker(i:int):
+                local=random.Random(seed*1000+i)
+                for _ in range(bookings_per_thread):
+                    room=local.choice(room_list)
+                    checkin, checkout=random_stay(start_day, 60, local)
+                    if mode=="global":
+                        with global_lock:
+                            result=hotel.book_room(guest, room, checkin, checkout, 0)
+                    else:
+                        result=hotel.book_room(guest, room, checkin, checkout, 0)
+                    if result:
+                        booked[i]+=1
+
+            elapsed=run_threads(threads, worker)
+            attempts=threads*bookings_per_thread
+            results.append({
+                "locking": mode,
+                "threads": threads,
+                "attempts": attempts,
+                "booked": sum(booked),
+                "seconds": round(elapsed, 3),
+                "bookings_per_sec": round(attempts/elapsed),
+                "double_bookings": double_bookings(hotel),
+            })
+    reset_hotel()
+    return results
+
+
+class TimedLock:
+    """Drop-in for Room.lock that records how long contended acquisitions waited, in ns."""
+    def __init__(self, waits:list):
+        self.lock=threading.RLock()
+        self.waits=waits
+
+    def acquire(self, blocking:bool=True, timeout:float=-1)->bool:
+        if self.lock.acquire(False):
+            return True
+        start=time.perf_counter_ns()
+        acquired=self.lock.acquire(blocking, timeout)
+        self.waits.append(time.perf_counter_ns()-start)
+        return acquired
+
+    def release(self):
+        self.lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class LoadWorkload:
+    """
+    Operation stream for one load test thread. Rooms are picked with Zipf(`skew`) popularity,
+    lead times are exponential around `mean_lead` days and short stays dominate.
+    """
+    OPS=("book", "cancel", "check_in", "check_out")
+
+    def __init__(self, rooms:list, start_day:date, rng:random.Random, mix=(0.6, 0.15, 0.15, 0.1), skew:float=1.1,
+                 mean_lead:float=14.0, horizon:int=90):
+        self.rooms=rooms
+        self.start_day=start_day
+        self.rng=rng
+        self.mix=list(itertools.accumulate(mix))
+        self.mean_lead=mean_lead
+        self.horizon=horizon
+        self.popularity=list(itertools.accumulate(1/(rank+1)**skew for rank in range(len(rooms))))
+
+    def room(self)->Room:
+        return self.rooms[bisect.bisect_left(self.popularity, self.rng.random()*self.popularity[-1])]
+
+    def stay(self)->tuple:
+        nights=self.rng.choices((1, 2, 3, 4, 5, 7), (30, 25, 18, 12, 8, 7))[0]
+        lead=min(int(self.rng.expovariate(1/self.mean_lead)), self.horizon-nights)
+        checkin=self.start_day+timedelta(days=lead)
+        return checkin, checkin+timedelta(days=nights)
+
+    def op(self)->str:
+        return self.OPS[bisect.bisect_left(self.mix, self.rng.random()*self.mix[-1])]
+
+
+def latency_percentile(samples:list, q:float)->float:
+    if not samples:
+        return 0.0
+    ordered=sorted(samples)
+    return ordered[min(len(ordered)-1, int(q*len(ordered)))]
+
+
+def load_test(thread_counts=(1, 8, 32), rooms:int=300, ops_per_thread:int=400, payment_latency:float=0.001,
+              skew:float=1.1, seed:int=31)->list[dict]:
+    """
+    Threads run a mixed booking/cancel/check-in/check-out workload against one HotelManagement, every
+    thread working on its own guest and reservations. Room locks are swapped for TimedLock to measure
+    contention, latencies are per operation and wall clock.
+    """
+    results=[]
+    start_day=date.today()
+    for threads in thread_counts:
+        rng=random.Random(seed)
+        hotel=fresh_hotel(rooms, payment_latency, rng)
+        waits=[]
+        for room in hotel.rooms.values():
+            room.lock=TimedLock(waits)
+        room_list=sorted(hotel.rooms.values(), key=lambda room: room.get_room_number())
+        latencies={op:[] for op in LoadWorkload.OPS}
+        outcomes={op:[0, 0] for op in LoadWorkload.OPS}
+
+        def worker(i:int):
+            workload=LoadWorkload(room_list, start_day, random.Random(seed*1000+i), skew=skew)
+            guest=Guest(f"Load {i}", f"{i:010d}", f"load{i}@example.com")
+            hotel.add_guests(guest)
+            booked, in_house=[], []
+            local={op:[] for op in LoadWorkload.OPS}
+            local_outcomes={op:[0, 0] for op in LoadWorkload.OPS}
+            for _ in range(ops_per_thread):
+                op=workload.op()
+                if op=="cancel" and not booked or op=="check_in" and not booked or op=="check_out" and not in_house:
+                    op="book"
+                t0=time.perf_counter()
+                if op=="book":
+                    id=hotel.book_room(guest, workload.room(), *workload.stay(), 0)
+                    ok=id is not None
+                    if ok:
+                        booked.append(id)
+                elif op=="cancel":
+                    ok=hotel.cancel_reservation(guest, booked.pop(workload.rng.randrange(len(booked))))
+                elif op=="check_in":
+                    # the front desk on the arrival day
+                    id=booked.pop(workload.rng.randrange(len(booked)))
+                    ok=hotel.check_in(id, hotel.reservations[id].checkin)
+                    if ok:
+                        in_house.append(id)
+                else:
+                    ok=hotel.check_out(in_house.pop(workload.rng.randrange(len(in_house))))
+                local[op].append(time.perf_counter()-t0)
+                local_outcomes[op][0 if ok else 1]+=1
+            for op in LoadWorkload.OPS:
+                latencies[op].extend(local[op])
+                outcomes[op][0]+=local_outcomes[op][0]
+                outcomes[op][1]+=local_outcomes[op][1]
+
+        elapsed=run_threads(threads, worker)
+        ops=threads*ops_per_thread
+        row={"threads": threads, "ops": ops, "seconds": round(elapsed, 3), "ops_per_sec": round(ops/elapsed)}
+        for op in LoadWorkload.OPS:
+            row[f"{op}_ok"]=outcomes[op][0]
+            row[f"{op}_failed"]=outcomes[op][1]
+            row[f"{op}_p50_ms"]=round(latency_percentile(latencies[op], 0.5)*1000, 3)
+            row[f"{op}_p99_ms"]=round(latency_percentile(latencies[op], 0.99)*1000, 3)
+        every=[latency for samples in latencies.values() for latency in samples]
+        row["p95_ms"]=round(latency_percentile(every, 0.95)*1000, 3)
+        row["p99_ms"]=round(latency_percentile(every, 0.99)*1000, 3)
+        row["contended_lock_acquires"]=len(waits)
+        row["lock_wait_ms"]=round(sum(waits)/1e6, 3)
+        row["lock_wait_p99_ms"]=round(latency_percentile(waits, 0.99)/1e6, 3)
+        row["double_bookings"]=double_bookings(hotel)
+        results.append(row)
+    reset_hotel()
+    return results
+
+
+def payment_backends(latencies=(0.02, 0.1), rooms:int=2000, bookings:int=2000, seed:int=9)->list[dict]:
+    """
+    Places `bookings` holds and confirms them all without waiting, so throughput is bounded by payment.
+    "executor" charges each hold on the 32 thread payment executor against a blocking provider,
+    "pipeline" sends them through PaymentPipeline to a FakePaymentProvider with the same latency per call.
+    """
+    results=[]
+    start_day=date.today()
+    for latency in latencies:
+        for mode in ("executor", "pipeline"):
+            rng=random.Random(seed)
+            hotel=fresh_hotel(rooms, latency, rng)
+            pipeline=None
+            if mode=="pipeline":
+                pipeline=PaymentPipeline({0: FakePaymentProvider(latency=latency, max_batch=50, max_concurrency=8, seed=seed)}).start()
+                hotel.set_payment_pipeline(pipeline)
+            room_list=list(hotel.rooms.values())
+            guest=Guest("Load", "0", "load@example.com")
+            with redirect_stdout(io.StringIO()):
+                start=time.perf_counter()
+                confirmations=[]
+                for _ in range(bookings):
+                    checkin, checkout=random_stay(start_day, 90, rng)
+                    id=hotel.hold_room(guest, rng.choice(room_list), checkin, checkout, 0)
+                    if id is not None:
+                        confirmations.append(hotel.confirm_hold_async(id))
+                confirmed=sum(1 for confirmation in confirmations if confirmation.result())
+                elapsed=time.perf_counter()-start
+            row={
+                "backend": mode,
+                "payment_latency_ms": latency*1000,
+                "holds": len(confirmations),
+                "confirmed": confirmed,
+                "seconds": round(elapsed, 3),
+                "bookings_per_sec": round(confirmed/elapsed),
+            }
+            if pipeline is not None:
+                row["provider_calls"]=pipeline.stats["batches"]
+                pipeline.stop()
+            results.append(row)
+    reset_hotel()
+    return results
+
+
+def group_booking(group_sizes=(50, 100, 200), rooms:int=5000, groups:int=5, payment_latency:float=0.005, seed:int=13)->list[dict]:
+    """
+    Books `groups` groups of each size as one book_rooms call, and the same demand room by room through
+    book_room (search, then one booking and one payment per room). Payments sleep `payment_latency`.
+    """
+    results=[]
+    start_day=date.today()
+    types=list(RoomType)
+    for mode in ("book_rooms", "book_room_loop"):
+        for size in group_sizes:
+            rng=random.Random(seed)
+            hotel=fresh_hotel(rooms, payment_latency, rng)
+            guest=Guest("Tour", "0", "tour@example.com")
+            booked_rooms=0
+            with redirect_stdout(io.StringIO()):
+                start=time.perf_counter()
+                for _ in range(groups):
+                    checkin, checkout=random_stay(start_day, 120, rng, 4)
+                    requirements={room_type: 0 for room_type in types}
+                    for _ in range(size):
+                        requirements[rng.choice(types)]+=1
+                    if mode=="book_rooms":
+                        id=hotel.book_rooms(guest, requirements, checkin, checkout, 0)
+                        if id is not None:
+                            booked_rooms+=len(hotel.reservations[id].get_rooms())
+                    else:
+                        for room_type, count in requirements.items():
+                            for room in hotel.search_available(room_type, checkin, checkout, count):
+                                if hotel.book_room(guest, room, checkin, checkout, 0):
+                                    booked_rooms+=1
+                elapsed=time.perf_counter()-start
+            results.append({
+                "mode": mode,
+                "group_size": size,
+                "groups": groups,
+                "rooms_booked": booked_rooms,
+                "ms_per_group": round(elapsed/groups*1000, 2),
+                "payments": groups if mode=="book_rooms" else booked_rooms,
+            })
+    reset_hotel()
+    return results
+
+
+def write_booking_year(journal:ReservationJournal, inventory:list, guests:list, bookings:int, rng:random.Random, start_day:date)->int:
+    """Journal a year of non overlapping stays: hold + confirm, some cancellations, check-in/out for the first weeks."""
+    calendars={room.get_room_number(): RoomCalendar() for room in inventory}
+    events=0
+    for _ in range(bookings):
+        room=rng.choice(inventory)
+        checkin, checkout=random_stay(start_day, 365, rng)
+        reservation=Reservation(rng.choice(guests), room, checkin, checkout, 0)
+        if not room.is_available(checkin, checkout) or not calendars[room.get_room_number()].book(checkin, checkout, reservation.get_id()):
+            continue
+        journal.append(hold_record(reservation))
+        journal.append(event_record("confirm", reservation))
+        events+=2
+        roll=rng.random()
+        if roll<0.05:
+            journal.append(event_record("release", reservation))
+            events+=1
+        elif (checkin-start_day).days<30:
+            journal.append(event_record("checkin", reservation))
+            journal.append(event_record("checkout", reservation))
+            events+=2
+    return events
+
+
+def journal_recovery(rooms:int=2000, guests:int=20000, bookings:int=150_000, tail:int=15_000, seed:int=17)->list[dict]:
+    """
+    Writes a year of bookings for a `rooms` room property to a journal, then measures recovery
+    from the journal alone and from a snapshot plus a `tail` bookings long journal tail.
+    """
+    rng=random.Random(seed)
+    start_day=date.today()
+    directory=tempfile.mkdtemp(prefix="hotel-journal-")
+    results=[]
+    try:
+        inventory=make_rooms(rooms, rng)
+        people=[Guest(f"Guest {i}", f"{i:010d}", f"guest{i}@example.com") for i in range(guests)]
+        journal=ReservationJournal(directory).open()
+        t0=time.perf_counter()
+        for guest in people:
+            journal.append(guest_record(guest))
+        for room in inventory:
+            journal.append(room_record(room))
+        events=guests+rooms+write_booking_year(journal, inventory, people, bookings, rng, start_day)
+        journal.close()
+        write_seconds=time.perf_counter()-t0
+        size=sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        results.append({"phase": "write", "events": events, "seconds": round(write_seconds, 3),
+                        "events_per_sec": round(events/write_seconds), "journal_mb": round(size/2**20, 2)})
+
+        reset_hotel()
+        hotel=HotelManagement()
+        stats=ReservationJournal(directory).recover(hotel)
+        results.append({"phase": "recover_journal", "events": stats["events"], "reservations": stats["reservations"],
+                        "seconds": round(stats["seconds"], 3)})
+
+        journal=ReservationJournal(directory).open()
+        journal.snapshot(hotel)
+        tail_rng=random.Random(seed+1)
+        write_booking_year(journal, list(hotel.rooms.values()), list(hotel.guests.values()), tail, tail_rng, start_day)
+        journal.close()
+
+        reset_hotel()
+        hotel=HotelManagement()
+        stats=ReservationJournal(directory).recover(hotel)
+        results.append({"phase": "recover_snapshot_and_tail", "events": stats["events"], "reservations": stats["reservations"],
+                        "seconds": round(stats["seconds"], 3)})
+    finally:
+        reset_hotel()
+        shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+def dynamic_pricing(rooms:int=2000, bookings:int=100_000, quotes:int=50_000, seed:int=23)->list[dict]:
+    """
+    Fills a year with bookings through PricingEngine.book (occupancy surge updates), then prices random stays
+    from the prefix sums, from the quote cache and by walking the nights one by one.
+    """
+    rng=random.Random(seed)
+    start_day=date.today()
+    engine=PricingEngine(start_day, weekend_factor=1.2)
+    engine.add_season(start_day+timedelta(days=150), start_day+timedelta(days=240), 1.5)
+    inventory=make_rooms(rooms, rng)
+    for room in inventory:
+        engine.add_room(room)
+    stays=[(rng.choice(inventory), *random_stay(start_day, 365, rng)) for _ in range(bookings)]
+    t0=time.perf_counter()
+    for room, checkin, checkout in stays:
+        engine.book(room, checkin, checkout)
+    book_seconds=time.perf_counter()-t0
+
+    def per_night(room, checkin, checkout):
+        # no rate table: season x weekday x surge evaluated for every night of the stay
+        table=engine.tables[room.get_type()]
+        first=checkin.toordinal()-table.start
+        total=sum(table.base[day]*engine._surge(table.booked[day], table.rooms) for day in range(first, first+(checkout-checkin).days))
+        return round(room.get_price()*total, 2)
+
+    sample=[(rng.choice(inventory), *random_stay(start_day, 365, rng, 28)) for _ in range(quotes)]
+    mismatches=sum(1 for stay in sample[:1000] if abs(engine.quote(*stay)-per_night(*stay))>0.01)
+    results=[{"phase": "occupancy_updates", "ops": bookings, "ops_per_sec": round(bookings/book_seconds)}]
+    for name, price in (("per_night", per_night), ("prefix_sums", engine.quote), ("cached", engine.quote)):
+        if name=="prefix_sums":
+            for table in engine.tables.values():
+                table.clear_quotes()
+            engine.cache_size=0
+        elif name=="cached":
+            engine.cache_size=100_000
+            for stay in sample:
+                engine.quote(*stay)
+        t0=time.perf_counter()
+        for stay in sample:
+            price(*stay)
+        elapsed=time.perf_counter()-t0
+        results.append({"phase": name, "ops": quotes, "ops_per_sec": round(quotes/elapsed), "mismatches": mismatches})
+    return results
+
+
+def object_daily_metrics(reservations:list, start:date, days:int, rooms:int)->list:
+    """The per Reservation loop the analytics replace: walk every night of every confirmed stay."""
+    sold=[0]*days
+    revenue=[0.0]*days
+    first_day=start.toordinal()
+    for reservation in reservations:
+        if reservation.get_status()!=ReservationStatus.confirmed:
+            continue
+        nights=(reservation.checkout-reservation.checkin).days
+        rate=reservation.get_amount()/nights
+        for day in range(reservation.checkin.toordinal()-first_day, reservation.checkout.toordinal()-first_day):
+            if 0<=day<days:
+                sold[day]+=1
+                revenue[day]+=rate
+    return [(sold[day]/rooms, revenue[day]/sold[day] if sold[day] else 0.0, revenue[day]/rooms) for day in range(days)]
+
+
+def revenue_analytics(rooms:int=2000, history:int=2_000_000, object_history:int=200_000, years:int=5, seed:int=29)->list[dict]:
+    """
+    Loads `history` stays spread over `years` years into RevenueAnalytics and times a year of daily metrics,
+    the per room type and per channel breakdowns. The baseline walks `object_history` Reservation objects.
+    """
+    rng=random.Random(seed)
+    first_day=date.today()-timedelta(days=365*years)
+    inventory=make_rooms(rooms, rng)
+    channels=("direct", "website", "ota", "corporate")
+    analytics=RevenueAnalytics()
+    for room in inventory:
+        analytics.add_room(room)
+    t0=time.perf_counter()
+    for _ in range(history):
+        room=rng.choice(inventory)
+        checkin, checkout=random_stay(first_day, 365*years, rng)
+        nights=checkout.toordinal()-checkin.toordinal()
+        analytics.append_row(room.get_room_number(), room.get_type(), rng.choice(channels), checkin.toordinal(),
+                             checkout.toordinal(), nights*room.get_price())
+    load_seconds=time.perf_counter()-t0
+    year_start=date.today()-timedelta(days=365)
+    year_end=date.today()
+    backend="numpy" if np is not None else "array"
+    results=[{"phase": "load", "backend": backend, "rows": history, "rows_per_sec": round(history/load_seconds)}]
+    for name, query in (("daily", lambda: analytics.daily(year_start, year_end)),
+                        ("by_room_type", lambda: analytics.by_room_type(year_start, year_end)),
+                        ("by_channel", lambda: analytics.by_channel(year_start, year_end))):
+        t0=time.perf_counter()
+        query()
+        elapsed=time.perf_counter()-t0
+        results.append({"phase": name, "backend": backend, "rows": history, "seconds": round(elapsed, 3),
+                        "rows_per_sec": round(history/elapsed)})
+    reservations=[]
+    for _ in range(object_history):
+        room=rng.choice(inventory)
+        reservation=Reservation(None, room, *random_stay(first_day, 365*years, rng), 0)
+        reservation.status=ReservationStatus.confirmed
+        reservations.append(reservation)
+    t0=time.perf_counter()
+    object_daily_metrics(reservations, year_start, 365, rooms)
+    elapsed=time.perf_counter()-t0
+    results.append({"phase": "daily", "backend": "objects", "rows": object_history, "seconds": round(elapsed, 3),
+                    "rows_per_sec": round(object_history/elapsed)})
+    return results
+
+
+def chain_scaling(worker_counts=(1, 2, 4), properties:int=16, rooms:int=200, guests:int=500, rounds:int=10, batch:int=1000, seed:int=19)->list[dict]:
+    """
+    Each round books `batch` random stays spread over all properties in one execute_batch call
+    and cancels every fourth confirmed one, then a scatter-gather search runs across the chain.
+    """
+    results=[]
+    start_day=date.today()
+    for workers in worker_counts:
+        rng=random.Random(seed)
+        with HotelChain(workers) as chain:
+            property_ids=[f"hotel-{i}" for i in range(properties)]
+            people=[guest_record(Guest(f"Guest {i}", f"{i:010d}", f"guest{i}@example.com")) for i in range(guests)]
+            for property_id in property_ids:
+                chain.add_property(property_id)
+                chain.execute_batch([("add_room", property_id, room_record(room)) for room in make_rooms(rooms, rng)])
+            ops=booked=0
+            start=time.perf_counter()
+            for _ in range(rounds):
+                books=[]
+                for _ in range(batch):
+                    checkin, checkout=random_stay(start_day, 365, rng)
+                    books.append(("book_room", rng.choice(property_ids), rng.choice(people), f"R{rng.randrange(rooms):05d}", checkin, checkout, 0))
+                ids=chain.execute_batch(books)
+                cancels=[("cancel_reservation", book[1], book[2], id) for book, id in zip(books[::4], ids[::4]) if id is not None]
+                chain.execute_batch(cancels)
+                booked+=sum(1 for id in ids if id is not None)
+                ops+=len(books)+len(cancels)
+            elapsed=time.perf_counter()-start
+            query_start=time.perf_counter()
+            chain.search_available(RoomType.deluxe, start_day+timedelta(days=30), start_day+timedelta(days=33))
+            query_ms=(time.perf_counter()-query_start)*1000
+        results.append({"workers": workers, "ops": ops, "booked": booked, "seconds": round(elapsed, 3),
+                        "ops_per_sec": round(ops/elapsed), "scatter_search_ms": round(query_ms, 3)})
+    return results
+
+
+def print_rows(rows:list[dict])->None:
+    for row in rows:
+        print(" | ".join(f"{key}: {value}" for key, value in row.items()))
+
+
+BENCHMARKS={
+    "availability": availability_search,
+    "concurrency": booking_concurrency,
+    "payments": payment_backends,
+    "group": group_booking,
+    "recovery": journal_recovery,
+    "pricing": dynamic_pricing,
+    "analytics": revenue_analytics,
+    "chain": chain_scaling,
+    "load": load_test,
+}
+
+
+def compare_reports(baseline:dict, report:dict)->None:
+    """Print the relative change of every *_per_sec figure, rows are matched by position."""
+    for name, rows in report["benchmarks"].items():
+        old_rows=baseline.get("benchmarks", {}).get(name)
+        if not old_rows:
+            continue
+        print(f"--- {name} vs baseline ---")
+        for position, (old, new) in enumerate(zip(old_rows, rows)):
+            changes=[f"{key}: {old[key]} -> {value} ({(value-old[key])/old[key]*100:+.1f}%)"
+                     for key, value in new.items() if key.endswith("_per_sec") and old.get(key)]
+            if changes:
+                print(f"row {position} | "+" | ".join(changes))
+
+
+def main(args:list[str])->None:
+    output=None
+    if "--output" in args:
+        position=args.index("--output")
+        output=args[position+1]
+        args=args[:position]+args[position+2:]
+    baseline=None
+    if "--compare" in args:
+        position=args.index("--compare")
+        with open(args[position+1]) as f:
+            baseline=json.load(f)
+        args=args[:position]+args[position+2:]
+    report={"python": platform.python_version(), "timestamp": time.time(), "benchmarks": {}}
+    for name in args or list(BENCHMARKS):
+        print(f"--- {name} ---")
+        rows=BENCHMARKS[name]()
+        print_rows(rows)
+        report["benchmarks"][name]=rows
+    if baseline is not None:
+        compare_reports(baseline, report)
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {output}")
+
+
+if __name__=='__main__':
+    main(sys.argv[1:])
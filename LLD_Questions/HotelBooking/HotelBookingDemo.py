@@ -1,6 +1,6 @@
 from HotelManagement import HotelManagement
 from HotelBookingSystem import Guest, Room, RoomType
-from datetime import date
+from datetime import date, timedelta
 
 class HotelManagementDemo:
     @staticmethod
@@ -21,7 +21,7 @@ class HotelManagementDemo:
 
         # Book a room
         check_in_date = date.today()
-        check_out_date = check_in_date.replace(day=check_in_date.day + 3)
+        check_out_date = check_in_date + timedelta(days=3)
         reservation1 = hotel_management_system.book_room(guest1, room1, check_in_date, check_out_date, 1)
         # if reservation1:
         #     print(f"Reservation created: {reservation1.id}")
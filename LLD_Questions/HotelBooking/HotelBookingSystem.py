@@ -1,8 +1,10 @@
 from enum import Enum as Enum
 import uuid
 from abc import ABC, abstractmethod
-from threading import Lock
+from threading import Lock, RLock
+from typing import List, Optional
 from datetime import date
+from RoomCalendar import RoomCalendar
 
 
 class RoomType(Enum):
@@ -11,12 +13,13 @@ class RoomType(Enum):
     suite="SUITE"
     deluxe="DELUXE"
 
+# Whether a guest is in the room right now, future bookings only live in the room's calendar
 class RoomStatus(Enum):
     available="AVAILABLE"
-    booked="BOOKED"
     occupied="OCCUPIED"
 
 class ReservationStatus(Enum):
+    pending="PENDING"
     confirmed="CONFIRMED"
     cancelled="CANCELLED"
 
@@ -36,6 +39,9 @@ class Guest:
     
     def get_phone(self)->str:
         return self.phone
+
+    def get_email(self)->str:
+        return self.email
     
     def get_address(self)->str:
         return self.address
@@ -46,26 +52,105 @@ class Room:
         self.type=type
         self.status=RoomStatus.available
         self.price=price
-        self.lock=Lock()
+        self.calendar=RoomCalendar()
+        # reservation whose guest is in the room, None while it is available
+        self.occupant:Optional[str]=None
+        # AvailabilityIndex of the hotel, updated in the same critical section as the calendar
+        self.availability=None
+        # re-entrant so a caller holding several room locks can still call book/release
+        self.lock=RLock()
 
-    def book(self)->bool:
+    # Bookings live in the calendar, status only tracks whether a guest is in the room right now
+    def is_available(self, checkin:date, checkout:date)->bool:
         with self.lock:
-            if self.status==RoomStatus.available:
-                self.status=RoomStatus.booked
-                return True
-            return False
+            return self.calendar.is_available(checkin, checkout)
+
+    def book(self, checkin:date, checkout:date, reservation_id:str)->bool:
+        with self.lock:
+            if not self.calendar.book(checkin, checkout, reservation_id):
+                return False
+            if self.availability is not None:
+                self.availability.book(self, checkin, checkout)
+            return True
+
+    def release(self, checkin:date, checkout:date, reservation_id:str)->bool:
+        with self.lock:
+            if not self.calendar.release(checkin, checkout, reservation_id):
+                return False
+            if self.availability is not None:
+                self.availability.release(self, checkin, checkout)
+            return True
+
+    @staticmethod
+    def _lock_in_order(rooms:List['Room'])->List['Room']:
+        ordered=sorted(set(rooms), key=lambda room: room.get_room_number())
+        for room in ordered:
+            room.lock.acquire()
+        return ordered
+
+    @staticmethod
+    def book_many(rooms:List['Room'], checkin:date, checkout:date, reservation_id:str)->bool:
+        """All or nothing booking of several rooms. Locks are taken in room number order so two
+        multi-room bookings can never wait on each other in a cycle."""
+        ordered=Room._lock_in_order(rooms)
+        try:
+            if not all(room.calendar.is_available(checkin, checkout) for room in ordered):
+                return False
+            for room in ordered:
+                room.book(checkin, checkout, reservation_id)
+            return True
+        finally:
+            for room in reversed(ordered):
+                room.lock.release()
 
-    def checkin(self)->bool:
+    def can_checkin(self, reservation_id:str, day:date)->bool:
+        """The room is empty and the night of `day` belongs to this reservation. Call with the room lock held."""
+        return self.status!=RoomStatus.occupied and self.calendar.reservation_on(day)==reservation_id
+
+    def checkin(self, reservation_id:str, day:date=None)->bool:
         with self.lock:
-            if self.status == RoomStatus.booked:
+            if self.can_checkin(reservation_id, day or date.today()):
                 self.status=RoomStatus.occupied
+                self.occupant=reservation_id
                 return True
             return False
 
-    def checkout(self)->bool:
+    @staticmethod
+    def checkin_many(rooms:List['Room'], reservation_id:str, day:date)->bool:
+        """All or nothing check-in, every room is validated under its lock before any of them turns occupied."""
+        ordered=Room._lock_in_order(rooms)
+        try:
+            if not all(room.can_checkin(reservation_id, day) for room in ordered):
+                return False
+            for room in ordered:
+                room.status=RoomStatus.occupied
+                room.occupant=reservation_id
+            return True
+        finally:
+            for room in reversed(ordered):
+                room.lock.release()
+
+    @staticmethod
+    def checkout_many(rooms:List['Room'], reservation_id:str)->bool:
+        """All or nothing check-out, only when this reservation is in every one of the rooms."""
+        ordered=Room._lock_in_order(rooms)
+        try:
+            if not all(room.status==RoomStatus.occupied and room.occupant==reservation_id for room in ordered):
+                return False
+            for room in ordered:
+                room.status=RoomStatus.available
+                room.occupant=None
+            return True
+        finally:
+            for room in reversed(ordered):
+                room.lock.release()
+
+    def checkout(self, reservation_id:str=None)->bool:
+        """Free the room, only if `reservation_id` is the one in it when given."""
         with self.lock:
-            if self.status==RoomStatus.occupied:
+            if self.status==RoomStatus.occupied and reservation_id in (None, self.occupant):
                 self.status=RoomStatus.available
+                self.occupant=None
                 return True
             return False
 
@@ -82,15 +167,21 @@ class Room:
         return self.price
 
 class Reservation:
-    def __init__(self, guest:Guest, room:Room, checkin:date, checkout:date, payment:int):
-        self.id=str(uuid.uuid4())
+    def __init__(self, guest:Guest, room:Room, checkin:date, checkout:date, payment:int, payment_manager:'PaymentManager'=None, id:str=None):
+        self.id=id or str(uuid.uuid4())
         self.guest=guest
         self.room=room
         self.checkin=checkin
         self.checkout=checkout
-        self.status=ReservationStatus.confirmed
-        self.payment_manager=PaymentManager()
+        self.status=ReservationStatus.pending
+        self.payment_manager=payment_manager or PaymentManager.get_default()
         self.payment_type=payment
+        self.expires_at=None
+        self.charging=False
+        # price quoted when the hold was placed, None charges the list price
+        self.amount=None
+        # where the booking came from (direct, website, OTA...), used by the revenue analytics
+        self.channel="direct"
         self.lock=Lock()
 
     def get_id(self)->str:
@@ -98,27 +189,110 @@ class Reservation:
     
     def get_room(self)->Room:
         return self.room
+
+    def get_rooms(self)->List[Room]:
+        return [self.room]
     
     def get_guest(self)->Guest:
         return self.guest
     
-    def reserve(self)->bool:
+    def get_status(self)->ReservationStatus:
+        return self.status
+
+    def get_amount(self)->float:
+        if self.amount is not None:
+            return self.amount
+        return ((self.checkout-self.checkin).days)*self.room.get_price()
+
+    # Hold then confirm: hold() takes the dates under the room lock only, the hold is charged
+    # without any lock (begin_charge() shields it from expiry meanwhile) and settle() confirms or releases it.
+    def hold(self)->bool:
+        return self.room.book(self.checkin, self.checkout, self.id)
+
+    def charge(self)->bool:
+        return self.payment_manager.pay(self.payment_type, self.get_amount())
+
+    def begin_charge(self)->bool:
         with self.lock:
-            if self.room.get_status()==RoomStatus.available:
-                if(self.room.book()):
-                    if PaymentManager().pay(self.payment_type, ((self.checkout-self.checkin).days)*self.room.get_price()):
-                        return True
+            if self.status==ReservationStatus.pending and not self.charging:
+                self.charging=True
+                return True
+            return False
+
+    def settle(self, paid:bool)->bool:
+        with self.lock:
+            self.charging=False
+            if self.status!=ReservationStatus.pending:
+                return False
+            if paid:
+                self.status=ReservationStatus.confirmed
+                return True
+            self._cancel_hold()
+            return False
+
+    def release(self)->bool:
+        with self.lock:
+            if self.status==ReservationStatus.pending and not self.charging:
+                self._cancel_hold()
+                return True
+            return False
+
+    def expire(self, now:float)->bool:
+        with self.lock:
+            if self.status==ReservationStatus.pending and not self.charging and self.expires_at is not None and self.expires_at<=now:
+                self._cancel_hold()
+                return True
             return False
 
+    def _cancel_hold(self):
+        self.status=ReservationStatus.cancelled
+        self._release_rooms()
+
+    def _release_rooms(self):
+        self.room.release(self.checkin, self.checkout, self.id)
+
+    def reserve(self)->bool:
+        if not self.hold():
+            return False
+        self.begin_charge()
+        return self.settle(self.charge())
+
     def cancel(self, guest:Guest)->bool:
         with self.lock:
             if  self.guest.get_id()==guest.get_id():
                 if self.status==ReservationStatus.confirmed:
                     self.status=ReservationStatus.cancelled
-                    self.room.checkout()
+                    self._release_rooms()
+                    # a guest already in house gives the rooms back as well
+                    for room in self.get_rooms():
+                        room.checkout(self.id)
                     return True
             return False
 
+# One reservation, one payment and one id for several rooms over the same dates.
+# The rooms are held all or nothing through Room.book_many.
+class GroupReservation(Reservation):
+    def __init__(self, guest:Guest, rooms:List[Room], checkin:date, checkout:date, payment:int, payment_manager:'PaymentManager'=None, id:str=None):
+        if not rooms:
+            raise ValueError("A group reservation needs at least one room")
+        super().__init__(guest, rooms[0], checkin, checkout, payment, payment_manager, id)
+        self.rooms=list(rooms)
+
+    def get_rooms(self)->List[Room]:
+        return list(self.rooms)
+
+    def get_amount(self)->float:
+        if self.amount is not None:
+            return self.amount
+        return ((self.checkout-self.checkin).days)*sum(room.get_price() for room in self.rooms)
+
+    def hold(self)->bool:
+        return Room.book_many(self.rooms, self.checkin, self.checkout, self.id)
+
+    def _release_rooms(self):
+        for room in self.rooms:
+            room.release(self.checkin, self.checkout, self.id)
+
 # Strategy patterm 
 class Payment(ABC):
     @abstractmethod
@@ -126,8 +300,17 @@ class Payment(ABC):
         pass
 
 class PaymentManager:
-    def __init__(self):
-        self.paymentMethods=[CreditCardPayment(), UPIPayment(), CashPayment()]
+    _default=None
+
+    def __init__(self, methods:List[Payment]=None):
+        self.paymentMethods=methods if methods is not None else [CreditCardPayment(), UPIPayment(), CashPayment()]
+
+    @classmethod
+    def get_default(cls)->'PaymentManager':
+        # the strategies are stateless, so reservations without their own manager share one
+        if cls._default is None:
+            cls._default=cls()
+        return cls._default
 
     def pay(self, id:int, price:float)->bool:
         if id>=0 and id<len(self.paymentMethods):
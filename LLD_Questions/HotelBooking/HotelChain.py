@@ -0,0 +1,227 @@
+import multiprocessing as mp
+import os
+import sys
+from datetime import date
+from typing import Dict, List, Optional
+from HotelBookingSystem import Guest, Room, RoomType
+from HotelManagement import HotelManagement
+from ReservationJournal import guest_record, room_record
+
+
+# Runs inside a worker process and owns one HotelManagement per property placed on it.
+# Guests and rooms cross the process boundary as plain records, reservations are referred to by id.
+class PropertyWorker:
+    def __init__(self):
+        self.properties:Dict[str,HotelManagement]={}
+
+    def add_property(self, property_id:str)->bool:
+        if property_id in self.properties:
+            return False
+        self.properties[property_id]=HotelManagement.create()
+        return True
+
+    def _guest(self, hotel:HotelManagement, record:Dict)->Guest:
+        guest=hotel.get_guest(record["id"])
+        if guest is None:
+            guest=Guest(record["name"], record["phone"], record["email"])
+            guest.id=record["id"]
+            hotel.add_guests(guest)
+        return guest
+
+    def add_guest(self, property_id:str, record:Dict)->bool:
+        self._guest(self.properties[property_id], record)
+        return True
+
+    def add_room(self, property_id:str, record:Dict)->bool:
+        self.properties[property_id].add_rooms(Room(RoomType(record["type"]), record["number"], record["price"]))
+        return True
+
+    def book_room(self, property_id:str, guest:Dict, room_number, checkin:date, checkout:date, payment:int)->Optional[str]:
+        hotel=self.properties[property_id]
+        return hotel.book_room(self._guest(hotel, guest), hotel.get_room(room_number), checkin, checkout, payment)
+
+    def book_rooms(self, property_id:str, guest:Dict, requirements:Dict, checkin:date, checkout:date, payment:int)->Optional[str]:
+        hotel=self.properties[property_id]
+        return hotel.book_rooms(self._guest(hotel, guest), {RoomType(k): v for k, v in requirements.items()}, checkin, checkout, payment)
+
+    def cancel_reservation(self, property_id:str, guest:Dict, reservation_id:str)->bool:
+        hotel=self.properties[property_id]
+        return hotel.cancel_reservation(self._guest(hotel, guest), reservation_id)
+
+    def check_in(self, property_id:str, reservation_id:str, day:date=None)->bool:
+        return self.properties[property_id].check_in(reservation_id, day)
+
+    def check_out(self, property_id:str, reservation_id:str)->bool:
+        return self.properties[property_id].check_out(reservation_id)
+
+    def search(self, room_type:str, checkin:date, checkout:date, limit:int)->List[tuple]:
+        """(property_id, free rooms, up to `limit` room numbers) for every local property with a free room."""
+        results=[]
+        for property_id, hotel in self.properties.items():
+            count=hotel.count_available(RoomType(room_type), checkin, checkout)
+            if count:
+                rooms=[room.get_room_number() for room in hotel.search_available(RoomType(room_type), checkin, checkout, limit)]
+                results.append((property_id, count, rooms))
+        return results
+
+    def shutdown(self):
+        for hotel in self.properties.values():
+            hotel.shutdown()
+
+    def handle(self, op:str, args:tuple):
+        return getattr(self, op)(*args)
+
+    def handle_batch(self, operations:List[tuple])->List[tuple]:
+        """(ok, result or exception) per operation, a failing operation does not stop the ones after it."""
+        replies=[]
+        for op, args in operations:
+            try:
+                replies.append((True, self.handle(op, args)))
+            except Exception as e:
+                replies.append((False, e))
+        return replies
+
+
+def worker_loop(conn, quiet:bool)->None:
+    if quiet:
+        sys.stdout=open(os.devnull, "w")
+    worker=PropertyWorker()
+    while True:
+        message=conn.recv()
+        if message is None:
+            break
+        kind, payload=message
+        try:
+            if kind=="batch":
+                conn.send((True, worker.handle_batch(payload)))
+            else:
+                conn.send((True, worker.handle(kind, payload)))
+        except Exception as e:
+            conn.send((False, e))
+    worker.shutdown()
+    conn.close()
+
+
+# Multi-property manager: properties are partitioned across worker processes and this router
+# forwards the familiar HotelManagement calls, keyed by property id, to the worker owning the property.
+class HotelChain:
+    def __init__(self, workers:int=None, quiet:bool=True, start_method:str=None):
+        """
+        :param workers: Number of worker processes, defaults to the CPU count
+        :param quiet: Silence the per-booking prints of HotelManagement inside the workers
+        """
+        context=mp.get_context(start_method)
+        self.connections=[]
+        self.processes=[]
+        for _ in range(workers or mp.cpu_count()):
+            parent, child=context.Pipe()
+            process=context.Process(target=worker_loop, args=(child, quiet), daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+        self.property_workers:Dict[str,int]={}
+        self.worker_load=[0]*len(self.connections)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for conn in self.connections:
+            conn.send(None)
+            conn.close()
+        for process in self.processes:
+            process.join()
+        self.connections=[]
+        self.processes=[]
+
+    def _call(self, worker:int, op:str, *args):
+        conn=self.connections[worker]
+        conn.send((op, args))
+        ok, result=conn.recv()
+        if not ok:
+            raise result
+        return result
+
+    def _gather(self, workers:List[int])->list:
+        # drain every reply before raising so no pipe is left with a stale response
+        replies=[self.connections[worker].recv() for worker in workers]
+        for ok, result in replies:
+            if not ok:
+                raise result
+        return [result for _, result in replies]
+
+    def _worker_of(self, property_id:str)->int:
+        worker=self.property_workers.get(property_id)
+        if worker is None:
+            raise KeyError(f"Unknown property {property_id}")
+        return worker
+
+    def add_property(self, property_id:str)->int:
+        """Place the property on the least loaded worker and return the worker index."""
+        if property_id in self.property_workers:
+            raise ValueError(f"Property {property_id} already exists")
+        worker=self.worker_load.index(min(self.worker_load))
+        self._call(worker, "add_property", property_id)
+        self.property_workers[property_id]=worker
+        self.worker_load[worker]+=1
+        return worker
+
+    def add_guests(self, property_id:str, guest:Guest):
+        self._call(self._worker_of(property_id), "add_guest", property_id, guest_record(guest))
+
+    def add_rooms(self, property_id:str, room:Room):
+        self._call(self._worker_of(property_id), "add_room", property_id, room_record(room))
+
+    def book_room(self, property_id:str, guest:Guest, room, checkin:date, checkout:date, payment:int)->Optional[str]:
+        """`room` is a Room or a room number."""
+        number=room.get_room_number() if isinstance(room, Room) else room
+        return self._call(self._worker_of(property_id), "book_room", property_id, guest_record(guest), number, checkin, checkout, payment)
+
+    def book_rooms(self, property_id:str, guest:Guest, requirements:Dict[RoomType,int], checkin:date, checkout:date, payment:int)->Optional[str]:
+        return self._call(self._worker_of(property_id), "book_rooms", property_id, guest_record(guest),
+                          {room_type.value: count for room_type, count in requirements.items()}, checkin, checkout, payment)
+
+    def cancel_reservation(self, property_id:str, guest:Guest, reservation_id:str)->bool:
+        return self._call(self._worker_of(property_id), "cancel_reservation", property_id, guest_record(guest), reservation_id)
+
+    def check_in(self, property_id:str, reservation_id:str, day:date=None)->bool:
+        return self._call(self._worker_of(property_id), "check_in", property_id, reservation_id, day)
+
+    def check_out(self, property_id:str, reservation_id:str)->bool:
+        return self._call(self._worker_of(property_id), "check_out", property_id, reservation_id)
+
+    def search_available(self, room_type:RoomType, checkin:date, checkout:date, limit:int=10)->Dict[str,tuple]:
+        """Scatter-gather over all properties: property id -> (free room count, up to `limit` room numbers)."""
+        for conn in self.connections:
+            conn.send(("search", (room_type.value, checkin, checkout, limit)))
+        results={}
+        for worker_results in self._gather(list(range(len(self.connections)))):
+            for property_id, count, rooms in worker_results:
+                results[property_id]=(count, rooms)
+        return results
+
+    def execute_batch(self, operations:List[tuple])->list:
+        """
+        Run many (op, property_id, *args) calls, op being a PropertyWorker method such as book_room or check_in,
+        with guests already given as records. Calls are grouped per worker and shipped in one message each,
+        so workers process them in parallel; order is kept within a property. Results come back in input order;
+        an operation that raised has its exception in its place instead, the rest of the batch still runs.
+        """
+        per_worker=[[] for _ in self.connections]
+        positions=[[] for _ in self.connections]
+        for position, (op, property_id, *args) in enumerate(operations):
+            worker=self._worker_of(property_id)
+            per_worker[worker].append((op, (property_id, *args)))
+            positions[worker].append(position)
+        busy=[worker for worker, batch in enumerate(per_worker) if batch]
+        for worker in busy:
+            self.connections[worker].send(("batch", per_worker[worker]))
+        results=[None]*len(operations)
+        for worker, worker_results in zip(busy, self._gather(busy)):
+            for position, (_, result) in zip(positions[worker], worker_results):
+                results[position]=result
+        return results
@@ -1,72 +1,356 @@
-from HotelBookingSystem import Guest, Reservation, Room
+from HotelBookingSystem import Guest, GroupReservation, PaymentManager, Reservation, ReservationStatus, Room, RoomType
+from AvailabilityIndex import AvailabilityIndex
+from ShardedMap import ShardedMap
+from ReservationIndex import ReservationIndex
+from ReservationJournal import ReservationJournal, event_record, guest_record, hold_record, room_record
+from HoldExpiry import HoldExpiry
+from PaymentPipeline import PaymentPipeline
+from PricingEngine import PricingEngine
+from RevenueAnalytics import RevenueAnalytics
+import os
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from threading import Lock
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from datetime import date
 
 class HotelManagement:
     _instance=None
+    # One payment executor and one hold expiry thread per process, shared by every instance (the singleton
+    # and each property of a HotelChain) and started on first use, so idle hotels cost no threads
+    _shared_lock=Lock()
+    _payment_executor:Optional[ThreadPoolExecutor]=None
+    _hold_expiry:Optional[HoldExpiry]=None
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance=super().__new__(cls)
-            cls._instance.guests : Dict[str, Guest]={}
-            cls._instance.rooms : Dict[str, Room]={}
-            cls._instance.reservations : Dict[str,Reservation]={}
-            cls._instance.lock=Lock()
+            cls._instance=cls.create()
         return cls._instance
+
+    @classmethod
+    def create(cls)->'HotelManagement':
+        """A standalone instance outside the process wide singleton, one per property in a HotelChain."""
+        instance=super().__new__(cls)
+        instance.guests : Dict[str, Guest]={}
+        instance.rooms : Dict[str, Room]={}
+        instance.reservations : ShardedMap=ShardedMap()
+        instance.availability=AvailabilityIndex()
+        instance.index=ReservationIndex()
+        instance.analytics=RevenueAnalytics()
+        instance.journal=None
+        instance.payment_manager=PaymentManager()
+        instance.payment_pipeline=None
+        instance.pricing=None
+        instance.hold_ttl=300.0
+        instance.pending=set()
+        instance.pending_lock=Lock()
+        instance.closed=False
+        return instance
+
+    @staticmethod
+    def _executor()->ThreadPoolExecutor:
+        if HotelManagement._payment_executor is None:
+            with HotelManagement._shared_lock:
+                if HotelManagement._payment_executor is None:
+                    HotelManagement._payment_executor=ThreadPoolExecutor(max_workers=32, thread_name_prefix="payment")
+        return HotelManagement._payment_executor
+
+    @staticmethod
+    def _expiry()->HoldExpiry:
+        if HotelManagement._hold_expiry is None:
+            with HotelManagement._shared_lock:
+                if HotelManagement._hold_expiry is None:
+                    hold_expiry=HoldExpiry()
+                    hold_expiry.start()
+                    HotelManagement._hold_expiry=hold_expiry
+        return HotelManagement._hold_expiry
+
+    @staticmethod
+    def _reset_shared():
+        # a forked child (HotelChain property workers) inherits the objects but not their threads
+        HotelManagement._shared_lock=Lock()
+        HotelManagement._payment_executor=None
+        HotelManagement._hold_expiry=None
     
+    def attach_journal(self, journal:Optional[ReservationJournal]):
+        """Record every booking, cancellation, check-in and check-out to `journal` from now on."""
+        self.journal=journal
+        # guests and rooms added before the journal are recorded first, replayed holds look them up
+        for guest in list(self.guests.values()):
+            self._log(guest_record(guest))
+        for room in list(self.rooms.values()):
+            self._log(room_record(room))
+
+    def _log(self, record:dict):
+        if self.journal is not None:
+            self.journal.append(record)
+
     def add_guests(self, guest:Guest):
         self.guests[guest.get_id()]=guest
+        self.index.add_guest(guest)
+        self._log(guest_record(guest))
 
     def get_guest(self, id)->Optional[Guest]:
         return self.guests.get(id);
 
+    # Front desk lookups, served by the secondary indexes in O(results)
+    def find_guest_by_phone(self, phone:str)->Optional[Guest]:
+        return self.index.find_guest_by_phone(phone)
+
+    def find_guest_by_email(self, email:str)->Optional[Guest]:
+        return self.index.find_guest_by_email(email)
+
+    def get_guest_reservations(self, guest_id:str)->List[Reservation]:
+        return self.index.reservations_of(guest_id)
+
+    def get_arrivals(self, day:date)->List[Reservation]:
+        """Confirmed reservations checking in on `day`."""
+        return [reservation for reservation in self.index.arriving(day) if reservation.get_status()==ReservationStatus.confirmed]
+
+    def get_departures(self, day:date)->List[Reservation]:
+        """Confirmed reservations checking out on `day`."""
+        return [reservation for reservation in self.index.departing(day) if reservation.get_status()==ReservationStatus.confirmed]
+
+    def get_in_house(self)->List[Reservation]:
+        return self.index.staying()
+
     def add_rooms(self, room:Room):
         self.rooms[room.get_room_number()]=room
+        self.availability.add_room(room)
+        self.analytics.add_room(room)
+        if self.pricing is not None:
+            self.pricing.add_room(room)
+        self._log(room_record(room))
     
     def get_room(self, room:int):
         return self.rooms[room]
     
-    def book_room(self, guest:Guest, room:Room, checkin:date, checkout:date, payment:int)->str:
-        with self.lock:
-            reservation=Reservation(guest, room, checkin, checkout, payment)
-            id=reservation.get_id()
-            if(reservation.reserve()):
-                print(f"Room no {room.get_room_number()} has been booked")
-                self.reservations[id]=reservation
-                return id
-            else:
-                print("Room unavailable")
+    def search_available(self, room_type:RoomType, checkin:date, checkout:date, limit:int=None)->List[Room]:
+        return self.availability.search(room_type, checkin, checkout, limit)
+
+    def count_available(self, room_type:RoomType, checkin:date, checkout:date)->int:
+        return self.availability.count_available(room_type, checkin, checkout)
+
+    def get_analytics(self)->RevenueAnalytics:
+        """Occupancy, ADR and RevPAR by night, room type and booking channel."""
+        return self.analytics
+
+    def set_pricing(self, pricing:Optional[PricingEngine]):
+        """Price stays with a PricingEngine instead of nights x list price, existing bookings count towards its occupancy."""
+        if pricing is not None:
+            pricing.rebuild(list(self.rooms.values()))
+        self.pricing=pricing
+
+    def quote(self, room:Room, checkin:date, checkout:date)->float:
+        if self.pricing is None:
+            return (checkout-checkin).days*room.get_price()
+        return self.pricing.quote(room, checkin, checkout)
+
+    # There is no hotel wide lock: the calendar check and insert happen under the room's lock,
+    # reservations live in a sharded map and payment runs on the payment executor while no lock is held.
+    # Booking is two phase, hold_room() places a hold that expires after hold_ttl seconds unless
+    # confirm_hold() charges and confirms it first. Charges go to the payment pipeline when one is set.
+    def hold_room(self, guest:Guest, room:Room, checkin:date, checkout:date, payment:int, ttl:float=None,
+                  channel:str="direct")->Optional[str]:
+        if checkin>=checkout:
+            print("Check-out must be after check-in")
+            return None
+        reservation=Reservation(guest, room, checkin, checkout, payment, self.payment_manager)
+        reservation.channel=channel
+        if not reservation.hold():
+            print("Room unavailable")
+            return None
+        return self._track_hold(reservation, ttl)
+
+    def hold_rooms(self, guest:Guest, requirements:Dict[RoomType,int], checkin:date, checkout:date, payment:int,
+                   ttl:float=None, attempts:int=3, channel:str="direct")->Optional[str]:
+        """
+        Hold requirements[room_type] rooms of every type under one GroupReservation, all or nothing.
+        Candidates come from the availability index; if another booking grabs one of them first the
+        whole set is re-picked, up to `attempts` times.
+        """
+        if checkin>=checkout:
+            print("Check-out must be after check-in")
+            return None
+        for _ in range(attempts):
+            rooms=[]
+            for room_type, count in requirements.items():
+                if count<=0:
+                    continue
+                candidates=self.availability.search(room_type, checkin, checkout, count)
+                if len(candidates)<count:
+                    print(f"Only {len(candidates)} {room_type.value} rooms available, {count} requested")
+                    return None
+                rooms.extend(candidates)
+            if not rooms:
                 return None
-    
-    def cancel_reservation(self, guest:Guest,reservation_id:str):
-        with self.lock:
-            reservation=self.reservations.get(reservation_id)
-            if reservation and reservation.cancel(guest):
-                print("Reservation cancelled")
-                del self.reservations[reservation_id]
-            else:
-                print("Not your booking")
-
-    def check_in(self, reservation_id:str):
-        with self.lock:
-            reservation=self.reservations.get(reservation_id)
-            if reservation:
-                if reservation.get_room().checkin():
-                    print(f"{reservation.get_guest().get_name()} Checked in room no {reservation.get_room().get_room_number()}")
+            reservation=GroupReservation(guest, rooms, checkin, checkout, payment, self.payment_manager)
+            reservation.channel=channel
+            if reservation.hold():
+                return self._track_hold(reservation, ttl)
+        print("Rooms unavailable")
+        return None
+
+    def _track_hold(self, reservation:Reservation, ttl:float=None)->str:
+        if reservation.get_guest().get_id() not in self.guests:
+            # booking without add_guests() registers the guest, so the hold can be replayed from the journal
+            self.add_guests(reservation.get_guest())
+        if self.pricing is not None:
+            # the price is fixed when the hold is placed, before the hold itself raises occupancy
+            reservation.amount=self.pricing.quote_rooms(reservation.get_rooms(), reservation.checkin, reservation.checkout)
+            for room in reservation.get_rooms():
+                self.pricing.book(room, reservation.checkin, reservation.checkout)
+        self.reservations[reservation.get_id()]=reservation
+        self.index.add(reservation)
+        self.analytics.add(reservation)
+        self._log(hold_record(reservation))
+        self._expiry().add(reservation, self.hold_ttl if ttl is None else ttl, self._expire_hold)
+        return reservation.get_id()
+
+    @staticmethod
+    def _room_numbers(reservation:Reservation)->str:
+        return ", ".join(str(room.get_room_number()) for room in reservation.get_rooms())
+
+    def set_payment_pipeline(self, pipeline:Optional[PaymentPipeline]):
+        """Charge holds through an asynchronous PaymentPipeline instead of the payment executor."""
+        self.payment_pipeline=pipeline
+
+    def confirm_hold_async(self, reservation_id:str)->Future:
+        """Start charging a hold, the returned future resolves to True once the reservation is confirmed."""
+        confirmation=Future()
+        reservation=self.reservations.get(reservation_id)
+        if reservation is None or not reservation.begin_charge():
+            print("Hold not found or expired")
+            confirmation.set_result(False)
+            return confirmation
+        with self.pending_lock:
+            self.pending.add(confirmation)
+        confirmation.add_done_callback(self._settled)
+        try:
+            if self.closed:
+                raise RuntimeError("Hotel has been shut down")
+            if self.payment_pipeline is not None:
+                charge=self.payment_pipeline.submit(reservation.payment_type, reservation.get_amount())
             else:
-                print("No reservation found")
-    
-    def check_out(self, reservation_id:str):
-        with self.lock:
-            reservation=self.reservations.get(reservation_id)
-            if reservation:
-                if reservation.get_room().checkout():
-                    print(f"{reservation.get_guest().get_name()} Checked out room of {reservation.get_room().get_room_number()}")
+                charge=self._executor().submit(reservation.charge)
+        except Exception as e:
+            # stopped pipeline or shut down hotel: fail the charge so the hold is released, not left charging
+            charge=Future()
+            charge.set_exception(e)
+
+        def settle(charge:Future):
+            paid=charge.exception() is None and bool(charge.result())
+            if reservation.settle(paid):
+                self.analytics.set_status(reservation, ReservationStatus.confirmed)
+                self._log(event_record("confirm", reservation))
+                print(f"Room no {self._room_numbers(reservation)} has been booked")
             else:
-                print("No reservation found")
+                self._forget(reservation)
+                print("Payment failed")
+            confirmation.set_result(paid)
+
+        charge.add_done_callback(settle)
+        return confirmation
 
+    def _settled(self, confirmation:Future):
+        with self.pending_lock:
+            self.pending.discard(confirmation)
 
+    def confirm_hold(self, reservation_id:str)->bool:
+        return self.confirm_hold_async(reservation_id).result()
 
+    def release_hold(self, reservation_id:str)->bool:
+        reservation=self.reservations.get(reservation_id)
+        if reservation is not None and reservation.release():
+            self._forget(reservation)
+            return True
+        return False
+
+    def _expire_hold(self, reservation:Reservation, now:float):
+        if self.closed:
+            return
+        if reservation.expire(now):
+            self._forget(reservation)
+            print(f"Hold on room no {self._room_numbers(reservation)} expired")
+
+    def _forget(self, reservation:Reservation):
+        self.reservations.pop(reservation.get_id())
+        self.index.remove(reservation)
+        self.analytics.set_status(reservation, ReservationStatus.cancelled)
+        self._log(event_record("release", reservation))
+        if self.pricing is not None:
+            for room in reservation.get_rooms():
+                self.pricing.release(room, reservation.checkin, reservation.checkout)
+
+    def book_room(self, guest:Guest, room:Room, checkin:date, checkout:date, payment:int, wait:bool=True,
+                  channel:str="direct")->str:
+        """
+        Hold the room and charge it asynchronously. With wait=False the hold id is returned
+        straight away and the reservation turns CONFIRMED (or goes away) once payment settles.
+        """
+        id=self.hold_room(guest, room, checkin, checkout, payment, channel=channel)
+        if id is None:
+            return None
+        confirmation=self.confirm_hold_async(id)
+        if not wait:
+            return id
+        return id if confirmation.result() else None
+
+    def book_rooms(self, guest:Guest, requirements:Dict[RoomType,int], checkin:date, checkout:date, payment:int, wait:bool=True,
+                   channel:str="direct")->Optional[str]:
+        """Group booking: every requested room or none of them, charged once for the total."""
+        id=self.hold_rooms(guest, requirements, checkin, checkout, payment, channel=channel)
+        if id is None:
+            return None
+        confirmation=self.confirm_hold_async(id)
+        if not wait:
+            return id
+        return id if confirmation.result() else None
+
+    def shutdown(self):
+        """Stop expiring holds and taking charges, wait for the charges in flight. The shared threads keep running."""
+        with self.pending_lock:
+            self.closed=True
+            pending=list(self.pending)
+        wait(pending)
+        if self.journal is not None:
+            self.journal.close()
     
-    
\ No newline at end of file
+    def cancel_reservation(self, guest:Guest,reservation_id:str)->bool:
+        reservation=self.reservations.get(reservation_id)
+        if reservation and reservation.cancel(guest):
+            print("Reservation cancelled")
+            self._forget(reservation)
+            return True
+        print("Not your booking")
+        return False
+
+    def check_in(self, reservation_id:str, day:date=None)->bool:
+        """Check the guest in on `day` (today by default), which has to be one of the reserved nights."""
+        day=day or date.today()
+        reservation=self.reservations.get(reservation_id)
+        if reservation:
+            with reservation.lock:
+                if reservation.get_status()==ReservationStatus.confirmed and Room.checkin_many(reservation.get_rooms(), reservation_id, day):
+                    self.index.checked_in(reservation)
+                    self._log(event_record("checkin", reservation))
+                    print(f"{reservation.get_guest().get_name()} Checked in room no {self._room_numbers(reservation)}")
+                    return True
+        else:
+            print("No reservation found")
+        return False
+    
+    def check_out(self, reservation_id:str)->bool:
+        reservation=self.reservations.get(reservation_id)
+        if reservation:
+            with reservation.lock:
+                if Room.checkout_many(reservation.get_rooms(), reservation_id):
+                    self.index.checked_out(reservation)
+                    self._log(event_record("checkout", reservation))
+                    print(f"{reservation.get_guest().get_name()} Checked out room of {self._room_numbers(reservation)}")
+                    return True
+        else:
+            print("No reservation found")
+        return False
+
+
+os.register_at_fork(after_in_child=HotelManagement._reset_shared)
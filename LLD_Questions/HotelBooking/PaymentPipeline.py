@@ -0,0 +1,235 @@
+import asyncio
+import itertools
+import random
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from threading import Event, Lock, Thread
+from typing import Dict, List, Optional
+
+
+class PaymentRequest:
+    def __init__(self, amount:float):
+        # the id doubles as an idempotency key, retries resend the same id
+        self.id=str(uuid.uuid4())
+        self.amount=amount
+        self.future:Optional[asyncio.Future]=None
+
+
+# Strategy pattern, asynchronous payment providers. A provider takes a batch of requests
+# and returns one success flag per request.
+class AsyncPaymentProvider(ABC):
+    def __init__(self, max_batch:int=1, max_concurrency:int=1, idempotent:bool=False):
+        """
+        :param max_batch: Largest number of requests sent in one call
+        :param max_concurrency: Calls allowed in flight at once
+        :param idempotent: The provider charges a PaymentRequest.id at most once, only then are batches retried
+        """
+        self.max_batch=max_batch
+        self.max_concurrency=max_concurrency
+        self.idempotent=idempotent
+
+    @abstractmethod
+    async def pay_batch(self, requests:List[PaymentRequest])->List[bool]:
+        pass
+
+
+# Runs one of the existing synchronous strategies (CreditCardPayment, UPIPayment, ...) off the event loop.
+# The strategies know nothing of request ids and a timed out call keeps running in its thread, so it is never retried.
+class SyncPaymentAdapter(AsyncPaymentProvider):
+    def __init__(self, method, max_batch:int=1, max_concurrency:int=4):
+        super().__init__(max_batch, max_concurrency, idempotent=False)
+        self.method=method
+
+    async def pay_batch(self, requests:List[PaymentRequest])->List[bool]:
+        return await asyncio.to_thread(lambda: [self.method.pay(request.amount) for request in requests])
+
+
+# Local stand-in for a remote provider, every call costs latency + per_request_latency * batch size
+class FakePaymentProvider(AsyncPaymentProvider):
+    def __init__(self, latency:float=0.05, per_request_latency:float=0.0, failure_rate:float=0.0, timeout_rate:float=0.0,
+                 max_batch:int=50, max_concurrency:int=8, seed:int=None):
+        """
+        :param failure_rate: Share of requests declined by the provider
+        :param timeout_rate: Share of calls that hang, to exercise timeouts and retries
+        """
+        super().__init__(max_batch, max_concurrency, idempotent=True)
+        self.latency=latency
+        self.per_request_latency=per_request_latency
+        self.failure_rate=failure_rate
+        self.timeout_rate=timeout_rate
+        self.rng=random.Random(seed)
+        self.processed:Dict[str,bool]={}
+        self.calls=0
+
+    async def pay_batch(self, requests:List[PaymentRequest])->List[bool]:
+        self.calls+=1
+        if self.rng.random()<self.timeout_rate:
+            await asyncio.sleep(3600)
+        await asyncio.sleep(self.latency+self.per_request_latency*len(requests))
+        results=[]
+        for request in requests:
+            if request.id not in self.processed:
+                self.processed[request.id]=request.amount>0 and self.rng.random()>=self.failure_rate
+            results.append(self.processed[request.id])
+        return results
+
+
+class PaymentPipeline:
+    def __init__(self, providers:Dict[int,AsyncPaymentProvider], batch_window:float=0.002, timeout:float=2.0,
+                 retries:int=2, backoff:float=0.05):
+        """
+        Batches payment requests per provider on a private event loop thread.
+
+        :param providers: Payment type (same ids as PaymentManager) -> provider
+        :param batch_window: How long a batch waits for more requests once it has its first one
+        :param timeout: Seconds allowed for one provider call
+        :param retries: Extra attempts after a timeout or provider error, with exponential backoff.
+                        Only for idempotent providers, others get a single attempt
+        """
+        self.providers=providers
+        self.batch_window=batch_window
+        self.timeout=timeout
+        self.retries=retries
+        self.backoff=backoff
+        self.loop:Optional[asyncio.AbstractEventLoop]=None
+        self.thread:Optional[Thread]=None
+        self.ready=Event()
+        # submit() and stop() agree under this lock, so nothing is scheduled onto the loop once stopping has begun
+        self.lock=Lock()
+        self.closing=False
+        self.stats={"batches": 0, "requests": 0, "retries": 0, "timeouts": 0, "errors": 0, "failed_batches": 0}
+
+    @classmethod
+    def from_payment_manager(cls, payment_manager, **kwargs)->'PaymentPipeline':
+        return cls({id: SyncPaymentAdapter(method) for id, method in enumerate(payment_manager.paymentMethods)}, **kwargs)
+
+    def start(self)->'PaymentPipeline':
+        if self.thread is None:
+            self.closing=False
+            self.loop=asyncio.new_event_loop()
+            self.thread=Thread(target=self.loop.run_until_complete, args=(self._main(),), name="payment-pipeline", daemon=True)
+            self.thread.start()
+            self.ready.wait()
+        return self
+
+    def stop(self):
+        if self.thread is not None:
+            with self.lock:
+                self.closing=True
+                self.loop.call_soon_threadsafe(self.stopping.set)
+            self.thread.join()
+            self.loop.close()
+            self.thread=None
+            self.ready.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def submit(self, payment_type:int, amount:float)->Future:
+        """Thread safe, returns a concurrent.futures.Future resolving to the payment's success flag."""
+        if payment_type not in self.providers:
+            future=Future()
+            future.set_result(False)
+            return future
+        with self.lock:
+            if self.thread is None or self.closing:
+                raise RuntimeError("PaymentPipeline is not running")
+            return asyncio.run_coroutine_threadsafe(self._enqueue(payment_type, amount), self.loop)
+
+    def pay(self, id:int, price:float)->bool:
+        """Blocking call with the same signature as PaymentManager.pay."""
+        return self.submit(id, price).result()
+
+    async def pay_async(self, payment_type:int, amount:float)->bool:
+        """Awaitable from any event loop."""
+        return await asyncio.wrap_future(self.submit(payment_type, amount))
+
+    async def _enqueue(self, payment_type:int, amount:float)->bool:
+        if self.stopping.is_set():
+            # accepted just before stop(), the batchers' None sentinel may already be queued ahead of it
+            return False
+        request=PaymentRequest(amount)
+        request.future=self.loop.create_future()
+        self.queues[payment_type].put_nowait(request)
+        return await request.future
+
+    async def _main(self):
+        self.stopping=asyncio.Event()
+        self.queues={id: asyncio.Queue() for id in self.providers}
+        self.semaphores={id: asyncio.Semaphore(provider.max_concurrency) for id, provider in self.providers.items()}
+        self.in_flight=set()
+        batchers=[asyncio.create_task(self._batcher(id)) for id in self.providers]
+        self.ready.set()
+        await self.stopping.wait()
+        for queue in self.queues.values():
+            await queue.put(None)
+        await asyncio.gather(*batchers)
+        await asyncio.gather(*self.in_flight)
+        # nothing should be left behind a sentinel, but a request that is would otherwise never resolve
+        for queue in self.queues.values():
+            while not queue.empty():
+                request=queue.get_nowait()
+                if request is not None and not request.future.done():
+                    request.future.set_result(False)
+
+    async def _batcher(self, payment_type:int):
+        provider=self.providers[payment_type]
+        queue=self.queues[payment_type]
+        semaphore=self.semaphores[payment_type]
+        closing=False
+        while not closing:
+            first=await queue.get()
+            if first is None:
+                break
+            batch=[first]
+            deadline=self.loop.time()+self.batch_window
+            while len(batch)<provider.max_batch:
+                if queue.empty():
+                    remaining=deadline-self.loop.time()
+                    if remaining<=0:
+                        break
+                    try:
+                        request=await asyncio.wait_for(queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    request=queue.get_nowait()
+                if request is None:
+                    closing=True
+                    break
+                batch.append(request)
+            # waiting here while the provider is saturated lets the queue build up into larger batches
+            await semaphore.acquire()
+            task=asyncio.create_task(self._dispatch(provider, batch, semaphore))
+            self.in_flight.add(task)
+            task.add_done_callback(self.in_flight.discard)
+
+    async def _dispatch(self, provider:AsyncPaymentProvider, batch:List[PaymentRequest], semaphore:asyncio.Semaphore):
+        try:
+            self.stats["batches"]+=1
+            self.stats["requests"]+=len(batch)
+            results=None
+            for attempt in range(self.retries+1 if provider.idempotent else 1):
+                if attempt:
+                    self.stats["retries"]+=1
+                    await asyncio.sleep(self.backoff*2**(attempt-1))
+                try:
+                    results=await asyncio.wait_for(provider.pay_batch(batch), self.timeout)
+                    break
+                except asyncio.TimeoutError:
+                    self.stats["timeouts"]+=1
+                except Exception:
+                    self.stats["errors"]+=1
+            if results is None:
+                self.stats["failed_batches"]+=1
+                results=[False]*len(batch)
+            # requests the provider gave no answer for count as declined instead of staying pending
+            for request, paid in itertools.zip_longest(batch, list(results)[:len(batch)], fillvalue=False):
+                if not request.future.done():
+                    request.future.set_result(bool(paid))
+        finally:
+            semaphore.release()
@@ -0,0 +1,282 @@
+import time
+from datetime import date, timedelta
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Tuple
+from HotelBookingSystem import Room, RoomType
+
+
+# Nightly price factors of one room type over the booking horizon starting at `start` (a date ordinal). The price
+# of a night is the room's list price times the factor, the factor being season x weekday x occupancy surge.
+# prefix[i] is the sum of the first i factors so the factor sum of any stay is prefix[last+1]-prefix[first], i.e.
+# O(1) per quote. Changed factors only mark the prefix sums dirty from the first changed night, they are rebuilt on
+# the next quote, and only the cached quotes of stays overlapping a changed night are evicted then.
+class RateTable:
+    def __init__(self, start:int, base:List[float]):
+        self.start=start
+        self.days=len(base)
+        self.base=list(base)
+        self.surge=[1.0]*self.days
+        self.booked=[0]*self.days
+        self.beyond:Dict[int,int]={}  # booked rooms per night past the horizon, by ordinal, moved in as it rolls
+        self.rooms=0
+        self.factors=list(base)
+        self.prefix=[0.0]*(self.days+1)
+        self.dirty_from=0
+        self.dirty_to=self.days-1
+        # first night -> {last night: factor sum}, so a change only visits the stays that can overlap it
+        self.quotes:Dict[int,Dict[int,float]]={}
+        self.cached=0
+        self.longest=0
+        self.lock=Lock()
+
+    def _set_factor(self, day:int):
+        factor=self.base[day]*self.surge[day]
+        if factor!=self.factors[day]:
+            self.factors[day]=factor
+            self.dirty_from=min(self.dirty_from, day)
+            self.dirty_to=max(self.dirty_to, day)
+
+    def _refresh(self):
+        if self.dirty_from>=self.days:
+            return
+        prefix, factors=self.prefix, self.factors
+        for day in range(self.dirty_from, self.days):
+            prefix[day+1]=prefix[day]+factors[day]
+        # stays entirely before or after the changed nights keep their sums
+        for first in range(max(self.dirty_from-self.longest+1, 0), self.dirty_to+1):
+            quotes=self.quotes.get(first)
+            if quotes:
+                for last in [last for last in quotes if last>=self.dirty_from]:
+                    del quotes[last]
+                    self.cached-=1
+        self.dirty_from=self.days
+        self.dirty_to=-1
+
+    def factor_sum(self, first:int, last:int)->float:
+        """Sum of the factors of nights first..last, O(1) once the prefix sums are clean."""
+        self._refresh()
+        return self.prefix[last+1]-self.prefix[first]
+
+    def cached_sum(self, first:int, last:int, cache_size:int)->float:
+        """factor_sum() through a cache of up to `cache_size` stays, dropped whole once it is full."""
+        self._refresh()
+        quotes=self.quotes.get(first)
+        if quotes is not None:
+            total=quotes.get(last)
+            if total is not None:
+                return total
+        total=self.prefix[last+1]-self.prefix[first]
+        if cache_size>0:
+            if self.cached>=cache_size:
+                self.clear_quotes()
+                quotes=None
+            if quotes is None:
+                quotes=self.quotes[first]={}
+            quotes[last]=total
+            self.cached+=1
+            if last-first>=self.longest:
+                self.longest=last-first+1
+        return total
+
+    def clear_quotes(self):
+        self.quotes.clear()
+        self.cached=0
+        self.longest=0
+
+
+class PricingEngine:
+    def __init__(self, start:date=None, days:int=365, weekend_factor:float=1.0, weekend_days=(4, 5),
+                 surge_tiers=((0.7, 1.1), (0.9, 1.25)), cache_size:int=100_000, today:Callable[[],date]=date.today):
+        """
+        :param start: First night covered by the rate tables, defaults to today
+        :param days: Length of the horizon. Nights outside it are charged at the list price.
+        :param weekend_factor: Factor for the nights starting on `weekend_days` (Monday is 0)
+        :param surge_tiers: (occupancy, factor) pairs, a night whose share of booked rooms of the type
+                            reaches the occupancy gets the factor of the highest tier reached
+        :param cache_size: Quotes kept per room type, quotes overlapping a night whose factor changed are evicted
+        :param today: Clock for the horizon, quotes roll it forward once the day changes
+        """
+        self.today=today
+        self.next_check=0.0
+        self.start=(start or today()).toordinal()
+        self.days=days
+        self.weekend_factor=weekend_factor
+        self.weekend_days=weekend_days
+        self.surge_tiers=sorted(surge_tiers)
+        self.cache_size=cache_size
+        self.seasons:List[Tuple[int,int,float,Optional[RoomType]]]=[]
+        self.roll_lock=Lock()
+        self.tables:Dict[RoomType,RateTable]={room_type:RateTable(self.start, [self._base(room_type, self.start+day) for day in range(days)])
+                                              for room_type in RoomType}
+
+    def _base(self, room_type:RoomType, night:int)->float:
+        """Season x weekday factor of the night with ordinal `night`."""
+        factor=self.weekend_factor if date.fromordinal(night).weekday() in self.weekend_days else 1.0
+        for start, end, season_factor, season_type in self.seasons:
+            if start<=night<end and season_type in (None, room_type):
+                factor*=season_factor
+        return factor
+
+    def _nights(self, start:int, checkin:date, checkout:date):
+        """Night indexes of the stay clipped to the horizon starting at `start`, None if nothing overlaps."""
+        first=max(checkin.toordinal()-start, 0)
+        last=min(checkout.toordinal()-start, self.days)-1
+        return (first, last) if first<=last else None
+
+    def _advance(self):
+        # reading the date costs more than a cached quote, so it is looked at no more than once a second
+        now=time.monotonic()
+        if now<self.next_check:
+            return
+        self.next_check=now+1.0
+        today=self.today()
+        if today.toordinal()>self.start:
+            self.advance(today)
+
+    def advance(self, day:date):
+        """Move the horizon forward to start at `day`, a no-op if it already starts there or later."""
+        start=day.toordinal()
+        with self.roll_lock:
+            if start<=self.start:
+                return
+            self.seasons=[season for season in self.seasons if season[1]>start]
+            for room_type, table in self.tables.items():
+                with table.lock:
+                    self._roll(room_type, table, start)
+            self.start=start
+
+    def _roll(self, room_type:RoomType, table:RateTable, start:int):
+        shift=min(start-table.start, self.days)
+        end=start+self.days
+        kept=self.days-shift
+        table.start=start
+        table.base=table.base[shift:]+[self._base(room_type, night) for night in range(end-shift, end)]
+        table.booked=table.booked[shift:]+[table.beyond.pop(night, 0) for night in range(end-shift, end)]
+        table.beyond={night: count for night, count in table.beyond.items() if night>=end}
+        table.surge=table.surge[shift:]+[1.0]*shift
+        table.factors=table.factors[shift:]+[0.0]*shift
+        for day in range(kept, self.days):
+            table.surge[day]=self._surge(table.booked[day], table.rooms)
+            table.factors[day]=table.base[day]*table.surge[day]
+        # every night moved to a new index, so the prefix sums and the cached quotes are rebuilt from scratch
+        table.dirty_from, table.dirty_to=self.days, -1
+        table.prefix[0]=0.0
+        for day in range(self.days):
+            table.prefix[day+1]=table.prefix[day]+table.factors[day]
+        table.clear_quotes()
+
+    def _surge(self, booked:int, rooms:int)->float:
+        factor=1.0
+        if rooms:
+            occupancy=booked/rooms
+            for threshold, tier_factor in self.surge_tiers:
+                if occupancy>=threshold:
+                    factor=tier_factor
+        return factor
+
+    def _update_surge(self, table:RateTable, first:int, last:int):
+        for day in range(first, last+1):
+            surge=self._surge(table.booked[day], table.rooms)
+            if surge!=table.surge[day]:
+                table.surge[day]=surge
+                table._set_factor(day)
+
+    def _count(self, table:RateTable, checkin:date, checkout:date, delta:int):
+        """Add `delta` booked rooms to the nights of the stay, returns the nights inside the horizon."""
+        nights=self._nights(table.start, checkin, checkout)
+        if nights:
+            for day in range(nights[0], nights[1]+1):
+                table.booked[day]+=delta
+        for night in range(max(checkin.toordinal(), table.start+self.days), checkout.toordinal()):
+            count=table.beyond.get(night, 0)+delta
+            if count:
+                table.beyond[night]=count
+            else:
+                table.beyond.pop(night, None)
+        return nights
+
+    def add_season(self, start:date, end:date, factor:float, room_type:RoomType=None):
+        """Multiply the nights from start up to (not including) end by factor, for one room type or all of them."""
+        with self.roll_lock:
+            self.seasons.append((start.toordinal(), end.toordinal(), factor, room_type))
+            for table_type, table in self.tables.items():
+                if room_type is None or table_type==room_type:
+                    with table.lock:
+                        nights=self._nights(table.start, start, end)
+                        if nights:
+                            for day in range(nights[0], nights[1]+1):
+                                table.base[day]*=factor
+                                table._set_factor(day)
+
+    def add_room(self, room:Room):
+        """Count the room and its existing bookings towards the occupancy of its type."""
+        table=self.tables[room.get_type()]
+        with table.lock:
+            table.rooms+=1
+            for checkin, checkout, _ in room.calendar.get_bookings():
+                self._count(table, checkin, checkout, 1)
+            self._update_surge(table, 0, self.days-1)
+
+    def rebuild(self, rooms:List[Room]):
+        """Recount rooms and bookings from the room calendars, used when restoring a hotel."""
+        by_type={room_type:[] for room_type in RoomType}
+        for room in rooms:
+            by_type[room.get_type()].append(room)
+        for room_type, typed_rooms in by_type.items():
+            table=self.tables[room_type]
+            with table.lock:
+                table.rooms=len(typed_rooms)
+                table.booked=[0]*self.days
+                table.beyond={}
+                for room in typed_rooms:
+                    for checkin, checkout, _ in room.calendar.get_bookings():
+                        self._count(table, checkin, checkout, 1)
+                self._update_surge(table, 0, self.days-1)
+
+    def _change_occupancy(self, room:Room, checkin:date, checkout:date, delta:int):
+        table=self.tables[room.get_type()]
+        with table.lock:
+            nights=self._count(table, checkin, checkout, delta)
+            if nights:
+                self._update_surge(table, nights[0], nights[1])
+
+    def book(self, room:Room, checkin:date, checkout:date):
+        self._change_occupancy(room, checkin, checkout, 1)
+
+    def release(self, room:Room, checkin:date, checkout:date):
+        self._change_occupancy(room, checkin, checkout, -1)
+
+    def factor_sum(self, room_type:RoomType, checkin:date, checkout:date)->float:
+        """Sum of the nightly factors of the stay, nights outside the horizon count as 1."""
+        if checkin>=checkout:
+            raise ValueError("Check-out must be after check-in")
+        self._advance()
+        table=self.tables[room_type]
+        with table.lock:
+            nights=self._nights(table.start, checkin, checkout)
+            outside=(checkout-checkin).days-(nights[1]-nights[0]+1 if nights else 0)
+            if nights is None:
+                return float(outside)
+            total=table.cached_sum(nights[0], nights[1], self.cache_size)
+        return total+outside
+
+    def quote(self, room:Room, checkin:date, checkout:date)->float:
+        """Price of the stay in `room` at the current rates."""
+        return round(room.get_price()*self.factor_sum(room.get_type(), checkin, checkout), 2)
+
+    def quote_rooms(self, rooms:List[Room], checkin:date, checkout:date)->float:
+        return round(sum(self.quote(room, checkin, checkout) for room in rooms), 2)
+
+    def nightly_rates(self, room:Room, checkin:date, checkout:date)->List[Tuple[date,float]]:
+        """Per night breakdown of a quote."""
+        self._advance()
+        rates=[]
+        table=self.tables[room.get_type()]
+        with table.lock:
+            night=checkin
+            while night<checkout:
+                day=night.toordinal()-table.start
+                factor=table.factors[day] if 0<=day<self.days else 1.0
+                rates.append((night, round(room.get_price()*factor, 2)))
+                night+=timedelta(days=1)
+        return rates
@@ -0,0 +1,88 @@
+from datetime import date
+from threading import Lock
+from typing import Dict, List, Optional
+from HotelBookingSystem import Guest, Reservation
+
+
+# Secondary indexes for front desk queries, every lookup costs O(results) instead of a scan of all reservations.
+class ReservationIndex:
+    def __init__(self):
+        self.by_guest:Dict[str,Dict[str,Reservation]]={}
+        self.by_checkin:Dict[date,Dict[str,Reservation]]={}
+        self.by_checkout:Dict[date,Dict[str,Reservation]]={}
+        self.in_house:Dict[str,Reservation]={}
+        self.guests_by_phone:Dict[str,Guest]={}
+        self.guests_by_email:Dict[str,Guest]={}
+        self.lock=Lock()
+
+    @staticmethod
+    def normalize_phone(phone:str)->str:
+        return "".join(ch for ch in phone if ch.isdigit())
+
+    @staticmethod
+    def normalize_email(email:str)->str:
+        return email.strip().lower()
+
+    @staticmethod
+    def _add(index:Dict, key, reservation:Reservation):
+        index.setdefault(key, {})[reservation.get_id()]=reservation
+
+    @staticmethod
+    def _remove(index:Dict, key, reservation:Reservation):
+        bucket=index.get(key)
+        if bucket is not None:
+            bucket.pop(reservation.get_id(), None)
+            if not bucket:
+                del index[key]
+
+    def add_guest(self, guest:Guest):
+        with self.lock:
+            if guest.get_phone():
+                self.guests_by_phone[self.normalize_phone(guest.get_phone())]=guest
+            if guest.get_email():
+                self.guests_by_email[self.normalize_email(guest.get_email())]=guest
+
+    def add(self, reservation:Reservation):
+        with self.lock:
+            self._add(self.by_guest, reservation.get_guest().get_id(), reservation)
+            self._add(self.by_checkin, reservation.checkin, reservation)
+            self._add(self.by_checkout, reservation.checkout, reservation)
+
+    def remove(self, reservation:Reservation):
+        with self.lock:
+            self._remove(self.by_guest, reservation.get_guest().get_id(), reservation)
+            self._remove(self.by_checkin, reservation.checkin, reservation)
+            self._remove(self.by_checkout, reservation.checkout, reservation)
+            self.in_house.pop(reservation.get_id(), None)
+
+    def checked_in(self, reservation:Reservation):
+        with self.lock:
+            self.in_house[reservation.get_id()]=reservation
+
+    def checked_out(self, reservation:Reservation):
+        with self.lock:
+            self.in_house.pop(reservation.get_id(), None)
+
+    def find_guest_by_phone(self, phone:str)->Optional[Guest]:
+        with self.lock:
+            return self.guests_by_phone.get(self.normalize_phone(phone))
+
+    def find_guest_by_email(self, email:str)->Optional[Guest]:
+        with self.lock:
+            return self.guests_by_email.get(self.normalize_email(email))
+
+    def reservations_of(self, guest_id:str)->List[Reservation]:
+        with self.lock:
+            return list(self.by_guest.get(guest_id, {}).values())
+
+    def arriving(self, day:date)->List[Reservation]:
+        with self.lock:
+            return list(self.by_checkin.get(day, {}).values())
+
+    def departing(self, day:date)->List[Reservation]:
+        with self.lock:
+            return list(self.by_checkout.get(day, {}).values())
+
+    def staying(self)->List[Reservation]:
+        with self.lock:
+            return list(self.in_house.values())
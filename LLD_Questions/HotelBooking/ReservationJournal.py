@@ -0,0 +1,274 @@
+import glob
+import json
+import os
+import time
+from datetime import date
+from threading import Condition, Lock, Thread
+from typing import Dict, Optional
+from HotelBookingSystem import Guest, GroupReservation, Reservation, ReservationStatus, Room, RoomStatus, RoomType
+
+SNAPSHOT_FILE="snapshot.json"
+SEGMENT_PATTERN="journal-{:06d}.log"
+
+
+# Append only journal of HotelManagement events, one JSON object per line.
+# Writes go to the OS straight away and a background thread fsyncs them in batches,
+# every sync_interval seconds or as soon as max_batch events are waiting, whichever comes first.
+#
+# snapshot() rotates to a new segment, writes the live state and deletes the older segments.
+# Events racing with the snapshot may be both in it and in the new segment, so replay is idempotent.
+class ReservationJournal:
+    def __init__(self, directory:str, sync_interval:float=0.05, max_batch:int=1000):
+        self.directory=directory
+        self.sync_interval=sync_interval
+        self.max_batch=max_batch
+        self.lock=Lock()
+        self.cond=Condition(self.lock)
+        self.file=None
+        self.segment=0
+        self.pending=0
+        self.running=False
+        self.thread:Optional[Thread]=None
+        os.makedirs(directory, exist_ok=True)
+
+    def segments(self)->list:
+        """Existing segment numbers in order."""
+        names=glob.glob(os.path.join(self.directory, "journal-*.log"))
+        return sorted(int(os.path.basename(name)[8:14]) for name in names)
+
+    def open(self)->'ReservationJournal':
+        existing=self.segments()
+        with self.lock:
+            self._open_segment((existing[-1] if existing else 0)+1)
+            self.running=True
+        self.thread=Thread(target=self._sync_loop, name="journal-sync", daemon=True)
+        self.thread.start()
+        return self
+
+    def _open_segment(self, segment:int):
+        if self.file is not None:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.file.close()
+        self.segment=segment
+        self.file=open(os.path.join(self.directory, SEGMENT_PATTERN.format(segment)), "a", encoding="utf-8")
+
+    def append(self, record:Dict):
+        line=json.dumps(record, separators=(",", ":"))+"\n"
+        with self.lock:
+            self.file.write(line)
+            self.pending+=1
+            if self.pending>=self.max_batch:
+                self.cond.notify()
+
+    def sync(self):
+        with self.lock:
+            self._sync()
+
+    def _sync(self):
+        if self.pending:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.pending=0
+
+    def _sync_loop(self):
+        with self.lock:
+            while self.running:
+                self.cond.wait(self.sync_interval)
+                self._sync()
+
+    def close(self):
+        with self.lock:
+            self.running=False
+            self.cond.notify()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread=None
+        with self.lock:
+            if self.file is not None:
+                self._sync()
+                self.file.close()
+                self.file=None
+
+    def snapshot(self, hotel)->str:
+        with self.lock:
+            self._sync()
+            self._open_segment(self.segment+1)
+            first_segment=self.segment
+        state={
+            "segment": first_segment,
+            "taken_at": time.time(),
+            "guests": [guest_record(guest) for guest in list(hotel.guests.values())],
+            "rooms": [room_record(room) for room in list(hotel.rooms.values())],
+            "reservations": [],
+        }
+        in_house={reservation.get_id() for reservation in hotel.get_in_house()}
+        for reservation in hotel.reservations.values():
+            record=hold_record(reservation)
+            record["status"]=reservation.get_status().value
+            record["in_house"]=reservation.get_id() in in_house
+            state["reservations"].append(record)
+        path=os.path.join(self.directory, SNAPSHOT_FILE)
+        with open(path+".tmp", "w", encoding="utf-8") as f:
+            f.write(json.dumps(state, separators=(",", ":")))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path+".tmp", path)
+        for segment in self.segments():
+            if segment<first_segment:
+                os.remove(os.path.join(self.directory, SEGMENT_PATTERN.format(segment)))
+        return path
+
+    def recover(self, hotel)->Dict:
+        """
+        Rebuild an empty HotelManagement from the snapshot and the journal tail.
+        Holds still pending at the end are released, their payment never got confirmed.
+        """
+        start=time.perf_counter()
+        replayer=JournalReplayer(hotel)
+        first_segment=1
+        path=os.path.join(self.directory, SNAPSHOT_FILE)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                state=json.load(f)
+            first_segment=state["segment"]
+            for record in state["guests"]:
+                replayer.guest(record)
+            for record in state["rooms"]:
+                replayer.room(record)
+            for record in state["reservations"]:
+                replayer.restore(record)
+        events=0
+        for segment in self.segments():
+            if segment<first_segment:
+                continue
+            with open(os.path.join(self.directory, SEGMENT_PATTERN.format(segment)), encoding="utf-8") as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        break  # torn write at the end of the last segment
+                    replayer.apply(json.loads(line))
+                    events+=1
+        released=replayer.release_pending()
+        hotel.availability.rebuild(list(hotel.rooms.values()))
+        if hotel.pricing is not None:
+            hotel.pricing.rebuild(list(hotel.rooms.values()))
+        return {"events": events, "reservations": len(hotel.reservations), "released_holds": released,
+                "seconds": time.perf_counter()-start}
+
+
+def guest_record(guest:Guest)->Dict:
+    return {"e": "guest", "id": guest.get_id(), "name": guest.get_name(), "phone": guest.get_phone(), "email": guest.get_email()}
+
+
+def room_record(room:Room)->Dict:
+    return {"e": "room", "number": room.get_room_number(), "type": room.get_type().value, "price": room.get_price()}
+
+
+def hold_record(reservation:Reservation)->Dict:
+    return {"e": "hold", "id": reservation.get_id(), "guest": reservation.get_guest().get_id(),
+            "rooms": [room.get_room_number() for room in reservation.get_rooms()],
+            "group": isinstance(reservation, GroupReservation),
+            "in": reservation.checkin.toordinal(), "out": reservation.checkout.toordinal(), "pay": reservation.payment_type,
+            "amount": reservation.amount, "channel": reservation.channel}
+
+
+def event_record(event:str, reservation:Reservation)->Dict:
+    return {"e": event, "id": reservation.get_id()}
+
+
+# Applies journal records straight to HotelManagement's structures: no payments, no prints, no journaling.
+# The availability index is left alone and rebuilt from the room calendars once replay is done.
+class JournalReplayer:
+    def __init__(self, hotel):
+        self.hotel=hotel
+
+    def apply(self, record:Dict):
+        getattr(self, record["e"])(record)
+
+    def guest(self, record:Dict):
+        if record["id"] in self.hotel.guests:
+            return
+        guest=Guest(record["name"], record["phone"], record["email"])
+        guest.id=record["id"]
+        self.hotel.guests[guest.id]=guest
+        self.hotel.index.add_guest(guest)
+
+    def room(self, record:Dict):
+        if record["number"] in self.hotel.rooms:
+            return
+        room=Room(RoomType(record["type"]), record["number"], record["price"])
+        self.hotel.rooms[room.get_room_number()]=room
+        self.hotel.analytics.add_room(room)
+
+    def hold(self, record:Dict)->Optional[Reservation]:
+        if record["id"] in self.hotel.reservations:
+            return None
+        guest=self.hotel.guests[record["guest"]]
+        rooms=[self.hotel.rooms[number] for number in record["rooms"]]
+        checkin, checkout=date.fromordinal(record["in"]), date.fromordinal(record["out"])
+        if record.get("group"):
+            reservation=GroupReservation(guest, rooms, checkin, checkout, record["pay"], self.hotel.payment_manager, record["id"])
+        else:
+            reservation=Reservation(guest, rooms[0], checkin, checkout, record["pay"], self.hotel.payment_manager, record["id"])
+        reservation.amount=record.get("amount")
+        reservation.channel=record.get("channel", "direct")
+        for room in rooms:
+            room.calendar.book(checkin, checkout, reservation.id)
+        self.hotel.reservations[reservation.id]=reservation
+        self.hotel.index.add(reservation)
+        self.hotel.analytics.add(reservation)
+        return reservation
+
+    def restore(self, record:Dict):
+        reservation=self.hold(record)
+        if reservation is None:
+            return
+        reservation.status=ReservationStatus(record["status"])
+        self.hotel.analytics.set_status(reservation, reservation.status)
+        if record.get("in_house"):
+            self._mark_in_house(reservation)
+
+    def confirm(self, record:Dict):
+        reservation=self.hotel.reservations.get(record["id"])
+        if reservation is not None and reservation.status==ReservationStatus.pending:
+            reservation.status=ReservationStatus.confirmed
+            self.hotel.analytics.set_status(reservation, reservation.status)
+
+    def release(self, record:Dict):
+        reservation=self.hotel.reservations.pop(record["id"])
+        if reservation is not None:
+            self._drop(reservation)
+
+    def checkin(self, record:Dict):
+        reservation=self.hotel.reservations.get(record["id"])
+        if reservation is not None:
+            self._mark_in_house(reservation)
+
+    def checkout(self, record:Dict):
+        reservation=self.hotel.reservations.get(record["id"])
+        if reservation is not None:
+            for room in reservation.get_rooms():
+                room.checkout(reservation.get_id())
+            self.hotel.index.checked_out(reservation)
+
+    def _mark_in_house(self, reservation:Reservation):
+        # replay happens on a later day than the check-in, so the stay dates are not checked again
+        for room in reservation.get_rooms():
+            room.status=RoomStatus.occupied
+            room.occupant=reservation.get_id()
+        self.hotel.index.checked_in(reservation)
+
+    def _drop(self, reservation:Reservation):
+        reservation.status=ReservationStatus.cancelled
+        for room in reservation.get_rooms():
+            room.calendar.release(reservation.checkin, reservation.checkout, reservation.get_id())
+            room.checkout(reservation.get_id())
+        self.hotel.index.remove(reservation)
+        self.hotel.analytics.set_status(reservation, reservation.status)
+
+    def release_pending(self)->int:
+        pending=[reservation for reservation in self.hotel.reservations.values() if reservation.status==ReservationStatus.pending]
+        for reservation in pending:
+            self.hotel.reservations.pop(reservation.get_id())
+            self._drop(reservation)
+        return len(pending)
@@ -0,0 +1,164 @@
+from array import array
+from datetime import date, timedelta
+from threading import Lock
+from typing import Dict, List, Optional
+from HotelBookingSystem import Reservation, ReservationStatus, Room, RoomType
+
+try:
+    import numpy as np
+except ImportError:  # aggregation falls back to plain loops over the columns
+    np=None
+
+TYPE_CODES={room_type:code for code, room_type in enumerate(RoomType)}
+STATUS_CODES={status:code for code, status in enumerate(ReservationStatus)}
+CONFIRMED=STATUS_CODES[ReservationStatus.confirmed]
+
+
+# Column store of reservation history, one row per reserved room: a group reservation of three rooms is three rows
+# sharing its amount in proportion to the rooms' list prices. Rows are never deleted, cancelled stays only change
+# their status code so the history stays complete. Metrics count confirmed rows only.
+#
+# With NumPy the aggregations run over zero copy views of the columns, otherwise over the arrays with plain loops.
+class RevenueAnalytics:
+    def __init__(self):
+        self.room_index=array("i")
+        self.room_type=array("b")
+        self.channel=array("h")
+        self.checkin=array("q")
+        self.checkout=array("q")
+        self.amount=array("d")
+        self.status=array("b")
+        self.rows:Dict[str,List[int]]={}
+        self.rooms:Dict[str,int]={}
+        self.room_counts:Dict[RoomType,int]={room_type:0 for room_type in RoomType}
+        self.channels:Dict[str,int]={}
+        self.channel_names:List[str]=[]
+        self.lock=Lock()
+
+    def __len__(self)->int:
+        return len(self.status)
+
+    def add_room(self, room:Room):
+        with self.lock:
+            if room.get_room_number() not in self.rooms:
+                self.rooms[room.get_room_number()]=len(self.rooms)
+                self.room_counts[room.get_type()]+=1
+
+    def _channel_code(self, channel:str)->int:
+        code=self.channels.get(channel)
+        if code is None:
+            code=self.channels[channel]=len(self.channel_names)
+            self.channel_names.append(channel)
+        return code
+
+    def append_row(self, room_number, room_type:RoomType, channel:str, checkin:int, checkout:int, amount:float,
+                   status:ReservationStatus=ReservationStatus.confirmed)->int:
+        """Append one row straight to the columns, check-in/out as date ordinals. Used to load history in bulk."""
+        with self.lock:
+            row=len(self.status)
+            self.room_index.append(self.rooms.get(room_number, -1))
+            self.room_type.append(TYPE_CODES[room_type])
+            self.channel.append(self._channel_code(channel))
+            self.checkin.append(checkin)
+            self.checkout.append(checkout)
+            self.amount.append(amount)
+            self.status.append(STATUS_CODES[status])
+            return row
+
+    def add(self, reservation:Reservation):
+        rooms=reservation.get_rooms()
+        total=reservation.get_amount()
+        prices=sum(room.get_price() for room in rooms)
+        rows=[]
+        for room in rooms:
+            share=total*room.get_price()/prices if prices else total/len(rooms)
+            rows.append(self.append_row(room.get_room_number(), room.get_type(), reservation.channel,
+                                        reservation.checkin.toordinal(), reservation.checkout.toordinal(), share,
+                                        reservation.get_status()))
+        with self.lock:
+            self.rows[reservation.get_id()]=rows
+
+    def set_status(self, reservation:Reservation, status:ReservationStatus):
+        with self.lock:
+            for row in self.rows.get(reservation.get_id(), ()):
+                self.status[row]=STATUS_CODES[status]
+
+    def rooms_available(self, room_type:RoomType=None)->int:
+        return self.room_counts[room_type] if room_type is not None else sum(self.room_counts.values())
+
+    def _nightly(self, start:int, days:int, room_type:Optional[RoomType], channel:Optional[str]):
+        """Rooms sold and room revenue per night from `start`, a stay's amount spread evenly over its nights."""
+        type_code=TYPE_CODES[room_type] if room_type is not None else None
+        channel_code=self.channels.get(channel, -1) if channel is not None else None
+        if np is not None:
+            return self._nightly_numpy(start, days, type_code, channel_code)
+        sold=[0]*(days+1)
+        revenue=[0.0]*(days+1)
+        end=start+days
+        for type_, channel_, checkin, checkout, amount, status in zip(self.room_type, self.channel, self.checkin,
+                                                                       self.checkout, self.amount, self.status):
+            if status!=CONFIRMED or checkout<=start or checkin>=end:
+                continue
+            if (type_code is not None and type_!=type_code) or (channel_code is not None and channel_!=channel_code):
+                continue
+            rate=amount/(checkout-checkin)
+            first=checkin-start if checkin>start else 0
+            last=checkout-start if checkout<end else days
+            sold[first]+=1
+            sold[last]-=1
+            revenue[first]+=rate
+            revenue[last]-=rate
+        for day in range(1, days):
+            sold[day]+=sold[day-1]
+            revenue[day]+=revenue[day-1]
+        return sold[:days], revenue[:days]
+
+    def _nightly_numpy(self, start:int, days:int, type_code:Optional[int], channel_code:Optional[int]):
+        # the views pin the arrays, they must not outlive this call or appends would fail with BufferError
+        status=np.frombuffer(self.status, dtype=np.int8)
+        checkin=np.frombuffer(self.checkin, dtype=np.int64)
+        checkout=np.frombuffer(self.checkout, dtype=np.int64)
+        mask=status==CONFIRMED
+        if type_code is not None:
+            mask&=np.frombuffer(self.room_type, dtype=np.int8)==type_code
+        if channel_code is not None:
+            mask&=np.frombuffer(self.channel, dtype=np.int16)==channel_code
+        checkin, checkout=checkin[mask], checkout[mask]
+        rate=np.frombuffer(self.amount, dtype=np.float64)[mask]/(checkout-checkin)
+        first=np.clip(checkin-start, 0, days)
+        last=np.clip(checkout-start, 0, days)
+        sold=np.cumsum(np.bincount(first, minlength=days+1)-np.bincount(last, minlength=days+1))[:days]
+        revenue=np.cumsum(np.bincount(first, rate, days+1)-np.bincount(last, rate, days+1))[:days]
+        return sold.tolist(), revenue.tolist()
+
+    def daily(self, start:date, end:date, room_type:RoomType=None, channel:str=None)->List[Dict]:
+        """
+        Occupancy, ADR (revenue per room sold) and RevPAR (revenue per available room) for each night
+        from start up to (not including) end, optionally for one room type and/or one booking channel.
+        """
+        if start>=end:
+            raise ValueError("End must be after start")
+        days=(end-start).days
+        with self.lock:
+            sold, revenue=self._nightly(start.toordinal(), days, room_type, channel)
+        available=self.rooms_available(room_type)
+        return [{"date": start+timedelta(days=day), "rooms_available": available, "rooms_sold": sold[day],
+                 "occupancy": sold[day]/available if available else 0.0, "revenue": round(revenue[day], 2),
+                 "adr": round(revenue[day]/sold[day], 2) if sold[day] else 0.0,
+                 "revpar": round(revenue[day]/available, 2) if available else 0.0} for day in range(days)]
+
+    def summary(self, start:date, end:date, room_type:RoomType=None, channel:str=None)->Dict:
+        """The same metrics over the whole period."""
+        rows=self.daily(start, end, room_type, channel)
+        available=sum(row["rooms_available"] for row in rows)
+        sold=sum(row["rooms_sold"] for row in rows)
+        revenue=sum(row["revenue"] for row in rows)
+        return {"start": start, "end": end, "room_nights_available": available, "room_nights_sold": sold,
+                "occupancy": sold/available if available else 0.0, "revenue": round(revenue, 2),
+                "adr": round(revenue/sold, 2) if sold else 0.0, "revpar": round(revenue/available, 2) if available else 0.0}
+
+    def by_room_type(self, start:date, end:date)->Dict[RoomType,Dict]:
+        return {room_type:self.summary(start, end, room_type=room_type) for room_type in RoomType}
+
+    def by_channel(self, start:date, end:date)->Dict[str,Dict]:
+        return {channel:self.summary(start, end, channel=channel) for channel in list(self.channel_names)}
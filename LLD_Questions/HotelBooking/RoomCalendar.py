@@ -0,0 +1,69 @@
+from bisect import bisect_right
+from datetime import date
+from typing import List, Optional, Tuple
+
+# Booked date ranges of a single room, kept as sorted, non overlapping half open intervals [checkin, checkout).
+# Days are stored as date ordinals so the lookups are plain integer comparisons.
+# Availability checks and lookups are O(log n) bisects over the room's n bookings. book() and release() then
+# insert into / delete from plain lists, which is O(n): a memmove of a few hundred pointers at the booking counts
+# one room sees, cheaper in practice than a balanced tree in Python, but not logarithmic.
+class RoomCalendar:
+    def __init__(self):
+        self.starts:List[int]=[]
+        self.ends:List[int]=[]
+        self.reservation_ids:List[str]=[]
+
+    @staticmethod
+    def validate(checkin:date, checkout:date)->Tuple[int,int]:
+        start, end=checkin.toordinal(), checkout.toordinal()
+        if start>=end:
+            raise ValueError("Check-out must be after check-in")
+        return start, end
+
+    def _insert_position(self, start:int, end:int)->int:
+        # O(log n): only the interval just before `start` and the one just after can overlap
+        i=bisect_right(self.starts, start)
+        if i>0 and self.ends[i-1]>start:
+            return -1
+        if i<len(self.starts) and self.starts[i]<end:
+            return -1
+        return i
+
+    def is_available(self, checkin:date, checkout:date)->bool:
+        start, end=self.validate(checkin, checkout)
+        return self._insert_position(start, end)>=0
+
+    def book(self, checkin:date, checkout:date, reservation_id:str)->bool:
+        start, end=self.validate(checkin, checkout)
+        i=self._insert_position(start, end)
+        if i<0:
+            return False
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.reservation_ids.insert(i, reservation_id)
+        return True
+
+    def release(self, checkin:date, checkout:date, reservation_id:str)->bool:
+        start, end=self.validate(checkin, checkout)
+        i=bisect_right(self.starts, start)-1
+        if i<0 or self.starts[i]!=start or self.ends[i]!=end or self.reservation_ids[i]!=reservation_id:
+            return False
+        del self.starts[i]
+        del self.ends[i]
+        del self.reservation_ids[i]
+        return True
+
+    def reservation_on(self, day:date)->Optional[str]:
+        """Id of the reservation holding the night of `day`, None if the room is free that night."""
+        night=day.toordinal()
+        i=bisect_right(self.starts, night)-1
+        if i>=0 and self.ends[i]>night:
+            return self.reservation_ids[i]
+        return None
+
+    def get_bookings(self)->List[Tuple[date,date,str]]:
+        return [(date.fromordinal(start), date.fromordinal(end), reservation_id)
+                for start, end, reservation_id in zip(self.starts, self.ends, self.reservation_ids)]
+
+    def __len__(self)->int:
+        return len(self.starts)
@@ -0,0 +1,69 @@
+from threading import Lock
+from typing import Any, Dict, Hashable, List, Optional
+
+
+# Dictionary split into independently locked shards, so writers touching different keys rarely contend.
+class ShardedMap:
+    def __init__(self, shards:int=16):
+        self.shards:List[Dict]=[{} for _ in range(shards)]
+        self.locks:List[Lock]=[Lock() for _ in range(shards)]
+
+    def _shard(self, key:Hashable)->int:
+        return hash(key)%len(self.shards)
+
+    def get(self, key:Hashable, default:Any=None)->Any:
+        i=self._shard(key)
+        with self.locks[i]:
+            return self.shards[i].get(key, default)
+
+    def put(self, key:Hashable, value:Any):
+        i=self._shard(key)
+        with self.locks[i]:
+            self.shards[i][key]=value
+
+    def put_if_absent(self, key:Hashable, value:Any)->Any:
+        """Store value unless the key exists; returns the value now stored under the key."""
+        i=self._shard(key)
+        with self.locks[i]:
+            return self.shards[i].setdefault(key, value)
+
+    def pop(self, key:Hashable, default:Any=None)->Optional[Any]:
+        i=self._shard(key)
+        with self.locks[i]:
+            return self.shards[i].pop(key, default)
+
+    def __getitem__(self, key:Hashable)->Any:
+        i=self._shard(key)
+        with self.locks[i]:
+            return self.shards[i][key]
+
+    def __setitem__(self, key:Hashable, value:Any):
+        self.put(key, value)
+
+    def __delitem__(self, key:Hashable):
+        i=self._shard(key)
+        with self.locks[i]:
+            del self.shards[i][key]
+
+    def __contains__(self, key:Hashable)->bool:
+        i=self._shard(key)
+        with self.locks[i]:
+            return key in self.shards[i]
+
+    def __len__(self)->int:
+        return sum(len(shard) for shard in self.shards)
+
+    def values(self)->List[Any]:
+        """Snapshot of the values, taken one shard at a time."""
+        result=[]
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                result.extend(shard.values())
+        return result
+
+    def items(self)->List[tuple]:
+        result=[]
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                result.extend(shard.items())
+        return result
@@ -0,0 +1,101 @@
+import contextlib
+import io
+import random
+import shutil
+import sys
+import tempfile
+import threading
+from datetime import date, timedelta
+from HotelBookingSystem import Guest, Room, RoomStatus, RoomType
+from HotelManagement import HotelManagement
+from ReservationJournal import ReservationJournal
+
+
+@contextlib.contextmanager
+def hotel_with_rooms(count:int, room_type:RoomType=RoomType.single):
+    hotel=HotelManagement.create()
+    rooms=[Room(room_type, f"R{i}", 100.0) for i in range(1, count+1)]
+    for room in rooms:
+        hotel.add_rooms(room)
+    guest=Guest("Test", "0000000000", "test@example.com")
+    hotel.add_guests(guest)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield hotel, rooms, guest
+    finally:
+        hotel.shutdown()
+
+
+def test_availability_index_matches_calendars_after_hold_release_storm():
+    switch_interval=sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    start=date.today()
+    try:
+        with hotel_with_rooms(3) as (hotel, rooms, guest):
+            def worker(seed:int):
+                rng=random.Random(seed)
+                for _ in range(1500):
+                    checkin=start+timedelta(days=rng.randrange(5))
+                    id=hotel.hold_room(guest, rng.choice(rooms), checkin, checkin+timedelta(days=rng.randrange(1, 3)), 0)
+                    if id is not None and rng.random()<0.9:
+                        hotel.release_hold(id)
+
+            threads=[threading.Thread(target=worker, args=(seed,)) for seed in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            for offset in range(7):
+                night=start+timedelta(days=offset)
+                indexed=sorted(room.get_room_number() for room in hotel.search_available(RoomType.single, night, night+timedelta(days=1)))
+                free=sorted(room.get_room_number() for room in rooms if room.calendar.reservation_on(night) is None)
+                assert indexed==free, night
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+
+def test_group_check_in_is_all_or_nothing():
+    today=date.today()
+    with hotel_with_rooms(2) as (hotel, rooms, guest):
+        # last night's guest of R2 has not checked out yet
+        overstay=hotel.book_room(guest, rooms[1], today-timedelta(days=1), today, 0)
+        assert hotel.check_in(overstay, today-timedelta(days=1))
+        group=hotel.book_rooms(guest, {RoomType.single: 2}, today, today+timedelta(days=2), 0)
+        assert group is not None
+
+        assert not hotel.check_in(group)
+        assert [room.get_status() for room in rooms]==[RoomStatus.available, RoomStatus.occupied]
+        assert hotel.get_in_house()==[hotel.reservations[overstay]]
+
+        assert hotel.check_out(overstay)
+        assert hotel.check_in(group)
+        assert all(room.get_status()==RoomStatus.occupied for room in rooms)
+        assert hotel.check_out(group)
+        assert all(room.get_status()==RoomStatus.available for room in rooms)
+
+
+def test_journal_recovers_guests_and_rooms_added_before_it():
+    today=date.today()
+    directory=tempfile.mkdtemp(prefix="hotel-journal-")
+    try:
+        with hotel_with_rooms(2) as (hotel, rooms, guest):
+            # the rooms and the registered guest predate the journal, the walk-in never went through add_guests
+            hotel.attach_journal(ReservationJournal(directory).open())
+            walk_in=Guest("Walk In", "1111111111", "walkin@example.com")
+            booked=hotel.book_room(walk_in, rooms[0], today, today+timedelta(days=2), 0)
+            regular=hotel.book_room(guest, rooms[1], today, today+timedelta(days=1), 0)
+            assert booked is not None and regular is not None
+
+        recovered=HotelManagement.create()
+        try:
+            stats=ReservationJournal(directory).recover(recovered)
+            assert stats["reservations"]==2
+            assert recovered.reservations[booked].get_guest().get_id()==walk_in.get_id()
+            assert recovered.find_guest_by_email("walkin@example.com").get_id()==walk_in.get_id()
+            assert sorted(recovered.rooms)==["R1", "R2"]
+            assert recovered.rooms["R1"].calendar.reservation_on(today)==booked
+            assert recovered.count_available(RoomType.single, today, today+timedelta(days=1))==0
+        finally:
+            recovered.shutdown()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
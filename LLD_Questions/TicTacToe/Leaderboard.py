@@ -0,0 +1,100 @@
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+
+class PlayerStats:
+    def __init__(self):
+        self.games=0
+        self.wins=0
+        self.draws=0
+        self.losses=0
+
+    def to_dict(self)->Dict[str,int]:
+        return {"games": self.games, "wins": self.wins, "draws": self.draws, "losses": self.losses}
+
+
+# Players ranked by wins. A Fenwick tree counts players per win total, so the rank of a player (1 + players
+# with more wins, ties share a rank) is one prefix sum and the next non empty win total below a given one is
+# found by descending the tree, both O(log W) for W the highest win total. top(n) visits the buckets it needs,
+# O(log W) each, and takes only the names it still needs from a large tie bucket of b players in O(b log n).
+# Not thread safe, Scoreboard calls it under its lock.
+class Leaderboard:
+    def __init__(self, capacity:int=64):
+        self.capacity=capacity
+        self.tree=[0]*(capacity+1)
+        self.wins:Dict[str,int]={}
+        self.buckets:Dict[int,set]={}
+
+    def __len__(self)->int:
+        return len(self.wins)
+
+    def _add(self, wins:int, delta:int):
+        index=wins+1
+        while index<=self.capacity:
+            self.tree[index]+=delta
+            index+=index & -index
+
+    def _prefix(self, wins:int)->int:
+        """Players with at most `wins` wins."""
+        index=min(wins+1, self.capacity)
+        total=0
+        while index>0:
+            total+=self.tree[index]
+            index-=index & -index
+        return total
+
+    def _grow(self, wins:int):
+        capacity=self.capacity
+        while capacity<wins+1:
+            capacity*=2
+        self.capacity=capacity
+        self.tree=[0]*(capacity+1)
+        for bucket_wins, names in self.buckets.items():
+            self._add(bucket_wins, len(names))
+
+    def _find(self, count:int)->int:
+        """Smallest win total w with at least `count` players at w wins or fewer."""
+        index=0
+        step=1<<self.capacity.bit_length()
+        while step:
+            if index+step<=self.capacity and self.tree[index+step]<count:
+                index+=step
+                count-=self.tree[index]
+            step>>=1
+        return index
+
+    def set(self, name:str, wins:int):
+        old=self.wins.get(name)
+        if old==wins:
+            return
+        if wins+1>self.capacity:
+            self._grow(wins)
+        if old is not None:
+            bucket=self.buckets[old]
+            bucket.discard(name)
+            if not bucket:
+                del self.buckets[old]
+            self._add(old, -1)
+        self.wins[name]=wins
+        self.buckets.setdefault(wins, set()).add(name)
+        self._add(wins, 1)
+
+    def rank(self, name:str)->Optional[int]:
+        wins=self.wins.get(name)
+        if wins is None:
+            return None
+        return len(self.wins)-self._prefix(wins)+1
+
+    def top(self, n:int)->List[Tuple[str,int]]:
+        """The n best players as (name, wins), ties by name."""
+        result=[]
+        remaining=len(self.wins)
+        while len(result)<n and remaining>0:
+            wins=self._find(remaining)
+            bucket=self.buckets[wins]
+            needed=n-len(result)
+            # heapq's per name overhead only pays off on buckets much larger than what is taken from them
+            names=heapq.nsmallest(needed, bucket) if len(bucket)>32*needed else sorted(bucket)[:needed]
+            result.extend((name, wins) for name in names)
+            remaining-=len(bucket)
+        return result
@@ -0,0 +1,215 @@
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+from TicTacToeAI import BoardGeometry
+
+MAGIC=b"TTB2"
+HEADER=struct.Struct("<4sBBxxI")  # magic, board size, win length, positions stored
+MAX_BOOK_CELLS=16  # canonical codes below 3**16 fit the 32 bit code column
+
+# Entry layout, one byte per position: bit 7 set for positions in the book, bits 5-6 the value for the player
+# to move plus one (0 loss, 1 draw, 2 win), bits 0-4 the best cell plus one (0 for finished games)
+PRESENT=0x80
+LOSS, DRAW, WIN=-1, 0, 1
+
+
+# Solved opening book. Every position reachable under Game's rules (X first, players alternate, the game ends
+# at k in a row or a full board) is solved once by a full game tree search and stored by its canonical code:
+# the smallest base 3 encoding (empty 0, X 1, O 2) over the 8 symmetries of the square.
+# The file holds only the reachable positions, the header, their sorted codes as 32 bit integers in native byte
+# order and one entry byte per code, 5 bytes a position (about 6 MB for 4x4). It is memory mapped and a lookup
+# is a binary search over the codes, about 20 steps at 4x4. Best moves prefer the fastest win and the slowest loss.
+# Books are built explicitly with generate() or `python OpeningBook.py DIRECTORY SIZE [K]`, nothing else writes them.
+class OpeningBook:
+    _books:Dict[Tuple[str,int,int],'OpeningBook']={}
+    _books_lock=threading.Lock()
+
+    def __init__(self, path:str):
+        self.path=path
+        with open(path, "rb") as f:
+            self.table=mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.size, self.win_length, self.positions=HEADER.unpack_from(self.table)
+        if magic!=MAGIC:
+            self.table.close()
+            raise ValueError(f"{path} is not an opening book")
+        view=memoryview(self.table)
+        self.codes=view[HEADER.size:HEADER.size+4*self.positions].cast("I")
+        self.entries=view[HEADER.size+4*self.positions:HEADER.size+5*self.positions]
+        view.release()
+        self.geometry=BoardGeometry.get(self.size, self.win_length)
+        self.powers=self._powers(self.geometry)
+
+    @staticmethod
+    def _powers(geometry:BoardGeometry)->List[List[int]]:
+        """powers[t][cell]: weight of `cell` in the code of the position seen through symmetry t."""
+        return [[3**perm[cell] for cell in range(geometry.cells)] for perm in geometry.perms]
+
+    @staticmethod
+    def _codes(powers:List[List[int]], x:int, o:int)->List[int]:
+        codes=[0]*len(powers)
+        for weight, mask in ((1, x), (2, o)):
+            while mask:
+                low=mask & -mask
+                cell=low.bit_length()-1
+                mask^=low
+                for t in range(len(codes)):
+                    codes[t]+=weight*powers[t][cell]
+        return codes
+
+    def __len__(self)->int:
+        return self.positions
+
+    def close(self):
+        self.codes.release()
+        self.entries.release()
+        self.table.close()
+
+    def probe(self, x:int, o:int)->Optional[Tuple[int,Optional[int]]]:
+        """(value for the player to move, best cell or None if the game is over), None if the position is not in the book."""
+        codes=self._codes(self.powers, x, o)
+        code=min(codes)
+        i=bisect_left(self.codes, code)
+        if i==self.positions or self.codes[i]!=code:
+            return None
+        entry=self.entries[i]
+        move=entry & 0x1f
+        move=self.geometry.inverse[codes.index(code)][move-1] if move else None
+        return (entry>>5 & 3)-1, move
+
+    def best_move(self, me:int, opponent:int, side:int)->Optional[Tuple[int,int]]:
+        """Same contract as MinimaxSearch.best_move, None when the book has no move for the position."""
+        result=self.probe(me, opponent) if side==0 else self.probe(opponent, me)
+        if result is None or result[1] is None:
+            return None
+        return divmod(result[1], self.size)
+
+    def value(self, x:int, o:int)->Optional[int]:
+        """Game theoretic value for the player to move: 1 win, 0 draw, -1 loss."""
+        result=self.probe(x, o)
+        return result[0] if result is not None else None
+
+    @staticmethod
+    def book_path(directory:str, size:int, win_length:int)->str:
+        return os.path.join(directory, f"book-{size}x{size}-k{win_length}.ttb")
+
+    @classmethod
+    def generate(cls, size:int, win_length:int=None, path:str=None, directory:str=None)->Dict:
+        """Solve every reachable position and write the book to `path` or into `directory`, returns generation statistics."""
+        win_length=size if win_length is None else win_length
+        geometry=BoardGeometry.get(size, win_length)
+        if geometry.cells>MAX_BOOK_CELLS:
+            raise ValueError(f"Opening books go up to {MAX_BOOK_CELLS} cells, {size}x{size} has {geometry.cells}")
+        if path is None:
+            if directory is None:
+                raise ValueError("generate() needs a path or a directory to write the book to")
+            os.makedirs(directory, exist_ok=True)
+            path=cls.book_path(directory, size, win_length)
+        start=time.perf_counter()
+        solver=_Solver(geometry, cls._powers(geometry))
+        solver.solve()
+        solve_seconds=time.perf_counter()-start
+        codes=array("I", sorted(solver.entries))
+        if codes.itemsize!=4:
+            raise RuntimeError("array('I') is not 32 bits on this platform")
+        temporary=f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(HEADER.pack(MAGIC, size, win_length, len(codes)))
+            f.write(codes.tobytes())
+            f.write(bytes(solver.entries[code] for code in codes))
+        os.replace(temporary, path)
+        return {"size": size, "k": win_length, "positions": len(codes), "file_bytes": os.path.getsize(path),
+                "seconds": round(time.perf_counter()-start, 3), "solve_seconds": round(solve_seconds, 3)}
+
+    @classmethod
+    def get(cls, directory:str, size:int, win_length:int=None)->Optional['OpeningBook']:
+        """The book for this board from `directory`, mapped once per process. None if it has not been built."""
+        win_length=size if win_length is None else win_length
+        key=(directory, size, win_length)
+        book=cls._books.get(key)
+        if book is not None:
+            return book
+        with cls._books_lock:
+            book=cls._books.get(key)
+            if book is None:
+                path=cls.book_path(directory, size, win_length)
+                if not os.path.exists(path):
+                    return None
+                book=cls._books[key]=cls(path)
+        return book
+
+
+# Full negamax over the game tree, memoised on the canonical code so each position up to symmetry is solved once.
+# Scores are DISTANCE-plies to the end for wins, the negation for losses and 0 for draws.
+class _Solver:
+    DISTANCE=100
+
+    def __init__(self, geometry:BoardGeometry, powers:List[List[int]]):
+        self.geometry=geometry
+        self.powers=powers
+        self.entries:Dict[int,int]={}
+        self.scores:Dict[int,int]={}
+        self.order=sorted(range(geometry.cells), key=geometry.rank.__getitem__)
+
+    def solve(self):
+        limit=sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limit, self.geometry.cells+100))
+        try:
+            self._solve(0, 0, 0, [0]*len(self.powers))
+        finally:
+            sys.setrecursionlimit(limit)
+
+    def _store(self, code:int, value:int, move:int):
+        self.entries[code]=PRESENT | (value+1)<<5 | move
+
+    def _solve(self, x:int, o:int, side:int, codes:List[int])->int:
+        code=min(codes)
+        score=self.scores.get(code)
+        if score is not None:
+            return score
+        geometry=self.geometry
+        occupied=x|o
+        me=x if side==0 else o
+        weight=side+1
+        best, best_cell=-self.DISTANCE-1, None
+        for cell in self.order:
+            bit=1<<cell
+            if occupied & bit:
+                continue
+            child=[codes[t]+weight*self.powers[t][cell] for t in range(len(codes))]
+            if geometry.wins(me|bit, cell):
+                score=self.DISTANCE-1
+                self._store(min(child), LOSS, 0)
+            elif occupied|bit==geometry.full:
+                score=0
+                self._store(min(child), DRAW, 0)
+            else:
+                if side==0:
+                    score=-self._solve(x|bit, o, 1, child)
+                else:
+                    score=-self._solve(x, o|bit, 0, child)
+                score-=score>0
+                score+=score<0
+            if score>best:
+                best, best_cell=score, cell
+        self.scores[code]=best
+        value=WIN if best>0 else LOSS if best<0 else DRAW
+        self._store(code, value, self.geometry.perms[codes.index(code)][best_cell]+1)
+        return best
+
+
+def main(args:List[str]):
+    if len(args) not in (2, 3):
+        print("usage: python OpeningBook.py DIRECTORY SIZE [K]")
+        sys.exit(2)
+    size=int(args[1])
+    print(OpeningBook.generate(size, int(args[2]) if len(args)==3 else None, directory=args[0]))
+
+
+if __name__=='__main__':
+    main(sys.argv[1:])
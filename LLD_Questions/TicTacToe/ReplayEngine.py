@@ -0,0 +1,119 @@
+import struct
+from array import array
+from typing import Dict, Iterable, List, Tuple
+from TicTacToeAbstraction import GameStatus
+from TicTacToeAI import BoardGeometry
+
+MAGIC=b"TTT1"
+MAX_LOG_SIZE=15  # cell index row*size+col has to fit in a byte
+
+# Outcome codes used in replay results
+IN_PROGRESS, DRAW, X_WON, O_WON, INVALID=range(5)
+OUTCOMES=(GameStatus.InProgress.value, GameStatus.Draw.value, GameStatus.X_Won.value, GameStatus.O_Won.value, "Invalid")
+
+
+# Binary game log. Header: MAGIC, board size, win length. Then per game one length byte followed by one byte
+# per move holding the cell index row*size+col, X moving first. Boards up to 15x15 fit.
+class MoveLog:
+    @staticmethod
+    def encode_game(moves:Iterable[Tuple[int,int]], size:int)->bytes:
+        return bytes(row*size+col for row, col in moves)
+
+    @staticmethod
+    def write(path:str, size:int, win_length:int, games:Iterable[bytes])->int:
+        """Write already encoded games, returns how many were written."""
+        if size>MAX_LOG_SIZE:
+            raise ValueError(f"Boards above {MAX_LOG_SIZE}x{MAX_LOG_SIZE} do not fit one byte per move")
+        count=0
+        with open(path, "wb") as f:
+            f.write(MAGIC+struct.pack("BB", size, win_length))
+            chunk=bytearray()
+            for game in games:
+                if len(game)>255:
+                    raise ValueError("A game has more than 255 moves")
+                chunk.append(len(game))
+                chunk+=game
+                count+=1
+                if len(chunk)>=1<<20:
+                    f.write(chunk)
+                    chunk.clear()
+            f.write(chunk)
+        return count
+
+    @staticmethod
+    def read(path:str)->Tuple[int,int,List[bytes]]:
+        """(size, win_length, games) of a log."""
+        with open(path, "rb") as f:
+            data=f.read()
+        if data[:4]!=MAGIC:
+            raise ValueError(f"{path} is not a move log")
+        size, win_length=data[4], data[5]
+        games=[]
+        position=6
+        end=len(data)
+        while position<end:
+            length=data[position]
+            games.append(data[position+1:position+1+length])
+            position+=1+length
+        return size, win_length, games
+
+
+# Headless replay: applies move sequences to two bitmasks with no Game objects, observers or output.
+# Every game is validated (cells in range and empty, no moves after the game ended) and classified.
+# Identical move sequences are classified once, repeated openings and short games cost one dict lookup.
+class ReplayEngine:
+    def __init__(self, size:int=3, win_length:int=None, cache_size:int=1_000_000):
+        self.size=size
+        self.win_length=size if win_length is None else win_length
+        self.geometry=BoardGeometry.get(size, self.win_length)
+        self.cache_size=cache_size
+        self.cache:Dict[bytes,int]={}
+
+    def classify(self, moves:bytes)->int:
+        """Outcome code of one game given as cell indexes."""
+        outcome=self.cache.get(moves)
+        if outcome is None:
+            outcome=self._replay(moves)
+            if len(self.cache)>=self.cache_size:
+                self.cache.clear()
+            self.cache[moves]=outcome
+        return outcome
+
+    def _replay(self, moves:bytes)->int:
+        geometry=self.geometry
+        cells=geometry.cells
+        cell_windows=geometry.cell_windows
+        masks=[0, 0]
+        occupied=0
+        side=0
+        for turn, cell in enumerate(moves):
+            bit=1<<cell
+            if cell>=cells or occupied & bit:
+                return INVALID
+            mask=masks[side]|bit
+            masks[side]=mask
+            occupied|=bit
+            for window in cell_windows[cell]:
+                if mask & window==window:
+                    return X_WON+side if turn==len(moves)-1 else INVALID
+            side^=1
+        return DRAW if occupied==geometry.full else IN_PROGRESS
+
+    def replay(self, games:Iterable[bytes])->array:
+        """Outcome code per game, in order."""
+        classify=self.classify
+        return array("b", [classify(game) for game in games])
+
+    def summarize(self, outcomes:array)->Dict[str,int]:
+        counts=[0]*len(OUTCOMES)
+        for outcome in outcomes:
+            counts[outcome]+=1
+        return {name: count for name, count in zip(OUTCOMES, counts)}
+
+    @classmethod
+    def replay_log(cls, path:str, **kwargs)->Tuple[array,Dict[str,int]]:
+        size, win_length, games=MoveLog.read(path)
+        engine=cls(size, win_length, **kwargs)
+        outcomes=engine.replay(games)
+        return outcomes, engine.summarize(outcomes)
+
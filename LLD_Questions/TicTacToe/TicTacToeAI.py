@@ -0,0 +1,330 @@
+import random
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from TicTacToeAbstraction import BitBoard, Board, Player, Symbol
+
+WIN=1_000_000
+EXACT, LOWER, UPPER=0, 1, 2
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+# Everything the search needs about an N x N board with a k in a row rule, built once per (size, k):
+# the k cell windows as bitmasks (and the ones through each cell), radius one neighbourhoods for move
+# generation, the 8 symmetries of the square as cell permutations and Zobrist keys.
+# Boards up to LOCAL_MOVES_FROM-1 wide search every empty cell, larger ones only cells next to a stone.
+class BoardGeometry:
+    _cache={}
+    LOCAL_MOVES_FROM=6
+
+    def __init__(self, size:int, k:int, seed:int=2024):
+        self.size=size
+        self.k=k
+        self.cells=size*size
+        self.full=(1<<self.cells)-1
+        self.windows=[]
+        self.cell_windows=[[] for _ in range(self.cells)]
+        for row in range(size):
+            for col in range(size):
+                for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_row, end_col=row+(k-1)*d_row, col+(k-1)*d_col
+                    if 0<=end_row<size and 0<=end_col<size:
+                        cells=[(row+i*d_row)*size+col+i*d_col for i in range(k)]
+                        mask=sum(1<<cell for cell in cells)
+                        self.windows.append(mask)
+                        for cell in cells:
+                            self.cell_windows[cell].append(mask)
+        self.neighbours=[]
+        for row in range(size if size>=self.LOCAL_MOVES_FROM else 0):
+            for col in range(size):
+                mask=0
+                for d_row in (-1, 0, 1):
+                    for d_col in (-1, 0, 1):
+                        if 0<=row+d_row<size and 0<=col+d_col<size:
+                            mask|=1<<(row+d_row)*size+col+d_col
+                self.neighbours.append(mask)
+        if size<self.LOCAL_MOVES_FROM:
+            self.neighbours=[self.full]*self.cells
+        centre=(size-1)/2
+        self.rank=[abs(cell//size-centre)+abs(cell%size-centre) for cell in range(self.cells)]
+        n=size-1
+        transforms=(lambda r, c: (r, c), lambda r, c: (c, n-r), lambda r, c: (n-r, n-c), lambda r, c: (n-c, r),
+                    lambda r, c: (r, n-c), lambda r, c: (n-r, c), lambda r, c: (c, r), lambda r, c: (n-c, n-r))
+        self.perms=[]
+        for transform in transforms:
+            perm=[0]*self.cells
+            for cell in range(self.cells):
+                row, col=transform(cell//size, cell%size)
+                perm[cell]=row*size+col
+            self.perms.append(perm)
+        self.inverse=[[0]*self.cells for _ in self.perms]
+        for t, perm in enumerate(self.perms):
+            for cell, image in enumerate(perm):
+                self.inverse[t][image]=cell
+        rng=random.Random(seed)
+        keys=[[rng.getrandbits(64) for _ in range(self.cells)] for _ in range(2)]
+        # zobrist[t][side][cell]: key of `side` on `cell` seen through symmetry t
+        self.zobrist=[[[keys[side][perm[cell]] for cell in range(self.cells)] for side in range(2)] for perm in self.perms]
+
+    @classmethod
+    def get(cls, size:int, k:int)->'BoardGeometry':
+        geometry=cls._cache.get((size, k))
+        if geometry is None:
+            geometry=cls._cache[(size, k)]=cls(size, k)
+        return geometry
+
+    def wins(self, mask:int, cell:int)->bool:
+        for window in self.cell_windows[cell]:
+            if mask & window==window:
+                return True
+        return False
+
+
+# Bounded transposition table, least recently used entries are evicted first
+class TranspositionTable:
+    def __init__(self, max_entries:int=200_000):
+        self.max_entries=max_entries
+        self.entries:OrderedDict=OrderedDict()
+        self.probes=0
+        self.hits=0
+        self.evictions=0
+
+    def get(self, key:int)->Optional[tuple]:
+        self.probes+=1
+        entry=self.entries.get(key)
+        if entry is not None:
+            self.hits+=1
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key:int, entry:tuple):
+        self.entries[key]=entry
+        self.entries.move_to_end(key)
+        if len(self.entries)>self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions+=1
+
+    def hit_rate(self)->float:
+        return self.hits/self.probes if self.probes else 0.0
+
+    def clear(self):
+        self.entries.clear()
+
+
+# Negamax with alpha-beta pruning over bitmasks. Positions are keyed by the smallest of their 8 symmetric
+# Zobrist hashes, which are all updated incrementally, so mirrored and rotated positions share table entries.
+# Iterative deepening keeps the best move of the last finished depth when the time budget runs out.
+class MinimaxSearch:
+    def __init__(self, size:int, k:int, time_budget:float=1.0, max_depth:int=None, table_size:int=200_000,
+                 symmetry:bool=True, clock=time.perf_counter):
+        self.geometry=BoardGeometry.get(size, k)
+        self.time_budget=time_budget
+        self.max_depth=max_depth
+        self.table=TranspositionTable(table_size)
+        self.symmetry=symmetry
+        self.clock=clock
+        self.nodes=0
+        self.deadline=None
+        self.stats:Dict={}
+
+    def _hashes(self, masks:Tuple[int,int])->List[int]:
+        geometry=self.geometry
+        hashes=[0]*(8 if self.symmetry else 1)
+        for side, mask in enumerate(masks):
+            while mask:
+                low=mask & -mask
+                cell=low.bit_length()-1
+                mask^=low
+                for t in range(len(hashes)):
+                    hashes[t]^=geometry.zobrist[t][side][cell]
+        return hashes
+
+    def _candidates(self, occupied:int, near:int)->List[int]:
+        geometry=self.geometry
+        mask=(near if occupied else geometry.full) & ~occupied & geometry.full
+        cells=[]
+        while mask:
+            low=mask & -mask
+            cells.append(low.bit_length()-1)
+            mask^=low
+        cells.sort(key=geometry.rank.__getitem__)
+        return cells
+
+    def _evaluate(self, me:int, opponent:int)->int:
+        score=0
+        for window in self.geometry.windows:
+            mine=me & window
+            theirs=opponent & window
+            if mine and not theirs:
+                score+=4**mine.bit_count()
+            elif theirs and not mine:
+                score-=4**theirs.bit_count()
+        return score
+
+    def _search(self, me:int, opponent:int, side:int, hashes:List[int], near:int, depth:int, alpha:int, beta:int, ply:int)->int:
+        self.nodes+=1
+        if self.deadline is not None and not self.nodes & 1023 and self.clock()>self.deadline:
+            raise SearchTimeout()
+        geometry=self.geometry
+        occupied=me|opponent
+        if occupied==geometry.full:
+            return 0
+        if depth==0:
+            return self._evaluate(me, opponent)
+        key=min(hashes)
+        t=hashes.index(key)
+        table_move=None
+        entry=self.table.get(key)
+        if entry is not None:
+            entry_depth, value, flag, move=entry
+            if value>WIN-1000:
+                value-=ply
+            elif value<-WIN+1000:
+                value+=ply
+            if entry_depth>=depth:
+                if flag==EXACT:
+                    return value
+                if flag==LOWER:
+                    alpha=max(alpha, value)
+                elif flag==UPPER:
+                    beta=min(beta, value)
+                if alpha>=beta:
+                    return value
+            table_move=geometry.inverse[t][move] if move is not None else None
+        moves=self._candidates(occupied, near)
+        if table_move is not None and table_move in moves:
+            moves.remove(table_move)
+            moves.insert(0, table_move)
+        original_alpha=alpha
+        best, best_move=-WIN-1, None
+        zobrist=[geometry.zobrist[i][side] for i in range(len(hashes))]
+        for cell in moves:
+            played=me|1<<cell
+            if geometry.wins(played, cell):
+                score=WIN-ply-1
+            else:
+                child=[hashes[i]^zobrist[i][cell] for i in range(len(hashes))]
+                score=-self._search(opponent, played, 1-side, child, near|geometry.neighbours[cell], depth-1, -beta, -alpha, ply+1)
+            if score>best:
+                best, best_move=score, cell
+            alpha=max(alpha, score)
+            if alpha>=beta:
+                break
+        flag=UPPER if best<=original_alpha else LOWER if best>=beta else EXACT
+        stored=best+ply if best>WIN-1000 else best-ply if best<-WIN+1000 else best
+        self.table.put(key, (depth, stored, flag, geometry.perms[t][best_move]))
+        return best
+
+    def best_move(self, me:int, opponent:int, side:int)->Tuple[int,int]:
+        """Best cell for the player owning `me`, side 0 plays X and 1 plays O. Returns (row, col)."""
+        geometry=self.geometry
+        start=self.clock()
+        self.nodes=0
+        self.deadline=None
+        hashes=self._hashes((me, opponent) if side==0 else (opponent, me))
+        occupied=me|opponent
+        near=0
+        for cell in range(geometry.cells):
+            if occupied>>cell & 1:
+                near|=geometry.neighbours[cell]
+        moves=self._candidates(occupied, near)
+        if not moves:
+            raise ValueError("No moves left")
+        empty=geometry.cells-occupied.bit_count()
+        max_depth=min(self.max_depth or empty, empty)
+        zobrist=[geometry.zobrist[i][side] for i in range(len(hashes))]
+        best_move, best_score, depth_reached=moves[0], None, 0
+        for depth in range(1, max_depth+1):
+            # depth 1 always completes so there is a move even with a tiny budget
+            self.deadline=start+self.time_budget if depth>1 else None
+            try:
+                alpha, beta=-WIN-1, WIN+1
+                depth_best, depth_score=None, -WIN-1
+                for cell in moves:
+                    played=me|1<<cell
+                    if geometry.wins(played, cell):
+                        score=WIN-1
+                    else:
+                        child=[hashes[i]^zobrist[i][cell] for i in range(len(hashes))]
+                        score=-self._search(opponent, played, 1-side, child, near|geometry.neighbours[cell], depth-1, -beta, -alpha, 1)
+                    if score>depth_score:
+                        depth_best, depth_score=cell, score
+                    alpha=max(alpha, score)
+            except SearchTimeout:
+                break
+            best_move, best_score, depth_reached=depth_best, depth_score, depth
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+            if abs(best_score)>WIN-1000:
+                break
+        elapsed=self.clock()-start
+        self.stats={"depth": depth_reached, "nodes": self.nodes, "seconds": elapsed,
+                    "nodes_per_sec": self.nodes/elapsed if elapsed else 0.0, "score": best_score,
+                    "tt_hit_rate": self.table.hit_rate(), "tt_entries": len(self.table.entries),
+                    "tt_evictions": self.table.evictions}
+        return divmod(best_move, geometry.size)
+
+
+class AIPlayer(Player):
+    def __init__(self, name:str, symbol:Symbol, time_budget:float=1.0, max_depth:int=None, table_size:int=200_000,
+                 symmetry:bool=True, book=None):
+        """
+        :param time_budget: Seconds per move for iterative deepening, the first depth always completes
+        :param max_depth: Cap on the search depth, defaults to the number of empty cells
+        :param table_size: Transposition table entries kept, least recently used ones are evicted
+        :param book: OpeningBook consulted before searching, used only on the board it was built for
+        """
+        super().__init__(name, symbol)
+        self.time_budget=time_budget
+        self.max_depth=max_depth
+        self.table_size=table_size
+        self.symmetry=symmetry
+        self.searches:Dict[Tuple[int,int],MinimaxSearch]={}
+        self.book=book
+        self.last_search:Optional[MinimaxSearch]=None
+        self.last_stats:Dict={}
+
+    def _search(self, size:int, k:int)->MinimaxSearch:
+        search=self.searches.get((size, k))
+        if search is None:
+            search=self.searches[(size, k)]=MinimaxSearch(size, k, self.time_budget, self.max_depth, self.table_size, self.symmetry)
+        return search
+
+    @staticmethod
+    def read_board(board:Board)->Dict[Symbol,int]:
+        if isinstance(board, BitBoard):
+            return dict(board.masks)
+        masks={Symbol.X:0, Symbol.O:0}
+        size=board.get_size()
+        for row in range(size):
+            for col in range(size):
+                symbol=board.get_cell(row, col).get_symbol()
+                if symbol!=Symbol.Empty:
+                    masks[symbol]|=1<<row*size+col
+        return masks
+
+    def choose_move(self, game)->Tuple[int,int]:
+        board=game.get_board()
+        masks=self.read_board(board)
+        symbol=self.get_symbol()
+        opponent=Symbol.O if symbol==Symbol.X else Symbol.X
+        side=0 if symbol==Symbol.X else 1
+        book=self.book
+        if book is not None and book.size==board.get_size() and book.win_length==game.get_win_length():
+            start=time.perf_counter()
+            move=book.best_move(masks[symbol], masks[opponent], side)
+            if move is not None:
+                self.last_stats={"book": True, "seconds": time.perf_counter()-start}
+                return move
+        search=self._search(board.get_size(), game.get_win_length())
+        self.last_search=search
+        move=search.best_move(masks[symbol], masks[opponent], side)
+        self.last_stats=search.stats
+        return move
+
+    def get_stats(self)->Dict:
+        """Statistics of the last move: depth, nodes, nodes/sec, transposition table hit rate, or book for book moves."""
+        return self.last_stats
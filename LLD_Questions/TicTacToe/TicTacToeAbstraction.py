@@ -1,7 +1,11 @@
 from enum import Enum
-from typing import Optional
+from typing import Dict, List, Optional
 from abc import ABC, abstractmethod
+import queue
 import threading
+import time
+import uuid
+from Leaderboard import Leaderboard, PlayerStats
 
 class InvalidMoveException(Exception):
     def __init__(self, message:str):
@@ -42,11 +46,48 @@ class Cell:
     def get_symbol(self)->Symbol:
         return self.symbol
     
+# Per symbol line counters, updated on every move. A line is won once its counter reaches the board size,
+# so checking for a winner after a move is O(1) instead of rescanning the board.
+class WinTracker:
+    def __init__(self, size:int):
+        self.size=size
+        self.rows={}
+        self.cols={}
+        self.diagonal={}
+        self.anti_diagonal={}
+        self.winners=set()
+
+    def record(self, row:int, col:int, symbol:Symbol)->bool:
+        """Count the move, returns True if it completes a line for the symbol."""
+        if symbol not in self.rows:
+            self.rows[symbol]=[0]*self.size
+            self.cols[symbol]=[0]*self.size
+            self.diagonal[symbol]=0
+            self.anti_diagonal[symbol]=0
+        rows, cols=self.rows[symbol], self.cols[symbol]
+        rows[row]+=1
+        cols[col]+=1
+        won=rows[row]==self.size or cols[col]==self.size
+        if row==col:
+            self.diagonal[symbol]+=1
+            won=won or self.diagonal[symbol]==self.size
+        if row+col==self.size-1:
+            self.anti_diagonal[symbol]+=1
+            won=won or self.anti_diagonal[symbol]==self.size
+        if won:
+            self.winners.add(symbol)
+        return won
+
+    def has_won(self, symbol:Symbol)->bool:
+        return symbol in self.winners
+
 class Board:
     def __init__(self, size:int):
         self.size=size
         self.board=[]
         self.moves_made=0
+        self.last_move=None
+        self.tracker=WinTracker(size)
 
         for _ in range(self.size):
             board_row=[]
@@ -78,12 +119,128 @@ class Board:
             raise InvalidMoveException("Invalid position: Cell already occupied")
         
         self.board[row][col].set_symbol(player.get_symbol())
+        self.tracker.record(row, col, player.get_symbol())
+        self.last_move=(row, col)
         self.moves_made+=1
         return True
     
     def is_full(self)->bool:
         return self.moves_made==self.size*self.size
 
+    def has_won(self, symbol:Symbol)->bool:
+        """True once the symbol has completed a full row, column or diagonal."""
+        return self.tracker.has_won(symbol)
+
+    def copy(self)->'Board':
+        board=Board(self.size)
+        for row in range(self.size):
+            for col in range(self.size):
+                board.board[row][col].set_symbol(self.board[row][col].get_symbol())
+        board.moves_made=self.moves_made
+        board.last_move=self.last_move
+        board.tracker.rows={symbol:list(counts) for symbol, counts in self.tracker.rows.items()}
+        board.tracker.cols={symbol:list(counts) for symbol, counts in self.tracker.cols.items()}
+        board.tracker.diagonal=dict(self.tracker.diagonal)
+        board.tracker.anti_diagonal=dict(self.tracker.anti_diagonal)
+        board.tracker.winners=set(self.tracker.winners)
+        return board
+
+# Same API as Board with one integer bitmask per symbol, bit row*size+col set where the symbol played.
+# The full row, column and diagonal masks through every cell are precomputed once per board size,
+# so a move checks at most four masks. Copies are two ints, boards hash and compare by their masks.
+# get_cell returns a fresh Cell holding the symbol, changing it does not change the board.
+class BitBoard(Board):
+    _lines={}
+
+    def __init__(self, size:int):
+        self.size=size
+        self.masks={Symbol.X:0, Symbol.O:0}
+        self.occupied=0
+        self.full=(1<<size*size)-1
+        self.moves_made=0
+        self.last_move=None
+        self.winners=set()
+        self.lines=self._cell_lines(size)
+
+    @classmethod
+    def _cell_lines(cls, size:int)->list:
+        lines=cls._lines.get(size)
+        if lines is None:
+            rows=[sum(1<<row*size+col for col in range(size)) for row in range(size)]
+            cols=[sum(1<<row*size+col for row in range(size)) for col in range(size)]
+            diagonal=sum(1<<i*size+i for i in range(size))
+            anti_diagonal=sum(1<<i*size+size-1-i for i in range(size))
+            lines=[]
+            for row in range(size):
+                for col in range(size):
+                    cell_lines=[rows[row], cols[col]]
+                    if row==col:
+                        cell_lines.append(diagonal)
+                    if row+col==size-1:
+                        cell_lines.append(anti_diagonal)
+                    lines.append(tuple(cell_lines))
+            lines=cls._lines[size]=lines
+        return lines
+
+    def get_cell(self, row:int, col:int)->Optional[Cell]:
+        if row<0 or row>=self.size or col<0 or col>=self.size:
+            return None
+        cell=Cell()
+        bit=1<<row*self.size+col
+        for symbol, mask in self.masks.items():
+            if mask & bit:
+                cell.set_symbol(symbol)
+        return cell
+
+    def get_symbol(self, row:int, col:int)->Symbol:
+        return self.get_cell(row, col).get_symbol()
+
+    def print_board(self):
+        print("--------------------")
+        for row in range(self.size):
+            print("| ", end="")
+            for col in range(self.size):
+                print(f"{self.get_symbol(row, col).get_char()} | ", end="")
+            print("\n--------------------")
+
+    def make_move(self, row:int, col:int, player:Player)->bool:
+        if row<0 or row>=self.size or col<0 or col>=self.size:
+            raise InvalidMoveException("Invalid position: Out of bounds")
+        index=row*self.size+col
+        bit=1<<index
+        if self.occupied & bit:
+            raise InvalidMoveException("Invalid position: Cell already occupied")
+        symbol=player.get_symbol()
+        mask=self.masks[symbol]|bit
+        self.masks[symbol]=mask
+        self.occupied|=bit
+        for line in self.lines[index]:
+            if mask & line==line:
+                self.winners.add(symbol)
+                break
+        self.last_move=(row, col)
+        self.moves_made+=1
+        return True
+
+    def is_full(self)->bool:
+        return self.occupied==self.full
+
+    def has_won(self, symbol:Symbol)->bool:
+        return symbol in self.winners
+
+    def copy(self)->'BitBoard':
+        board=BitBoard.__new__(BitBoard)
+        board.__dict__.update(self.__dict__)
+        board.masks=dict(self.masks)
+        board.winners=set(self.winners)
+        return board
+
+    def __eq__(self, other)->bool:
+        return isinstance(other, BitBoard) and self.size==other.size and self.masks==other.masks
+
+    def __hash__(self)->int:
+        return hash((self.size, self.masks[Symbol.X], self.masks[Symbol.O]))
+
 # Strategy Pattern for winning condition
 class WinningStrategy(ABC):
     @abstractmethod
@@ -146,6 +303,43 @@ class DiagonalWinningStrategy(WinningStrategy):
                     anti_diag_win=False
                     break
         return anti_diag_win
+
+# Strategy 4: asks the board, Board answers from its WinTracker counters and BitBoard from its line masks.
+# O(1) and equivalent to strategies 1-3 together
+class IncrementalWinningStrategy(WinningStrategy):
+    def check_winner(self, board:Board, player:Player)->bool:
+        return board.has_won(player.get_symbol())
+
+# Strategy 5: k in a row (gomoku style). Only the four lines through the last move can have changed,
+# so it counts the player's run outwards from that cell in both directions of each line, O(k) per move.
+class KInARowWinningStrategy(WinningStrategy):
+    DIRECTIONS=((0, 1), (1, 0), (1, 1), (1, -1))
+
+    def __init__(self, k:int):
+        self.k=k
+
+    def _run(self, board:Board, row:int, col:int, d_row:int, d_col:int, symbol:Symbol)->int:
+        count=0
+        row, col=row+d_row, col+d_col
+        while count<self.k-1:
+            cell=board.get_cell(row, col)
+            if cell is None or cell.get_symbol()!=symbol:
+                break
+            count+=1
+            row, col=row+d_row, col+d_col
+        return count
+
+    def check_winner(self, board:Board, player:Player)->bool:
+        if board.last_move is None:
+            return False
+        row, col=board.last_move
+        symbol=player.get_symbol()
+        if board.get_cell(row, col).get_symbol()!=symbol:
+            return False
+        for d_row, d_col in self.DIRECTIONS:
+            if 1+self._run(board, row, col, d_row, d_col, symbol)+self._run(board, row, col, -d_row, -d_col, symbol)>=self.k:
+                return True
+        return False
     
 
 # Observer Pattern for game state changes
@@ -169,38 +363,131 @@ class GameSubject(ABC):
             observer.update(self)
 
 # Concrete Observer: Scoreboard
+# update() runs on the move path of whichever thread finished a game, so it only queues the result.
+# A background thread applies queued results in batches under one lock; queries see applied results,
+# flush() waits for everything queued so far.
 class Scoreboard(GameObserver):
-    def __init__(self):
-        self.scores={}
+    def __init__(self, max_batch:int=512, verbose:bool=True):
+        """
+        :param max_batch: Most results applied per lock acquisition
+        :param verbose: Print every win once it is applied
+        """
+        self.max_batch=max_batch
+        self.verbose=verbose
+        self.stats:Dict[str,PlayerStats]={}
+        self.leaderboard=Leaderboard()
+        self.lock=threading.Lock()
+        self.pending=queue.SimpleQueue()
+        self.progress=threading.Condition()
+        self.submitted=0
+        self.applied=0
+        self.thread=None
 
     def update(self, game):
-        if game.get_winner() is not None:
-            winner=game.get_winner().get_name()
-            self.scores[winner]=self.scores.get(winner,0)+1
-            print(f"[Scoreboard] {winner} wins! Their new score is {self.scores[winner]}.")
+        if game.get_status()==GameStatus.InProgress:
+            return
+        winner=game.get_winner()
+        players=(game.player1.get_name(), game.player2.get_name())
+        with self.progress:
+            self.submitted+=1
+            if self.thread is None:
+                self.thread=threading.Thread(target=self._apply_loop, name="scoreboard", daemon=True)
+                self.thread.start()
+        self.pending.put((winner.get_name() if winner is not None else None, players))
+
+    def _apply_loop(self):
+        while True:
+            batch=[self.pending.get()]
+            while len(batch)<self.max_batch:
+                try:
+                    batch.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            with self.lock:
+                for winner, players in batch:
+                    self._apply(winner, players)
+            with self.progress:
+                self.applied+=len(batch)
+                self.progress.notify_all()
+
+    def _apply(self, winner:Optional[str], players:tuple):
+        for name in players:
+            stats=self.stats.get(name)
+            if stats is None:
+                stats=self.stats[name]=PlayerStats()
+            stats.games+=1
+            if winner is None:
+                stats.draws+=1
+            elif name==winner:
+                stats.wins+=1
+            else:
+                stats.losses+=1
+            self.leaderboard.set(name, stats.wins)
+        if winner is not None and self.verbose:
+            print(f"[Scoreboard] {winner} wins! Their new score is {self.stats[winner].wins}.")
+
+    def flush(self, timeout:float=None)->bool:
+        """Wait until every result queued before the call is applied."""
+        with self.progress:
+            target=self.submitted
+            return self.progress.wait_for(lambda: self.applied>=target, timeout)
+
+    def get_stats(self, name:str)->Optional[Dict[str,int]]:
+        with self.lock:
+            stats=self.stats.get(name)
+            return stats.to_dict() if stats is not None else None
+
+    def get_rank(self, name:str)->Optional[int]:
+        """1 for the most wins, players with equal wins share a rank. O(log n)."""
+        with self.lock:
+            return self.leaderboard.rank(name)
+
+    def top(self, n:int=10)->List[tuple]:
+        """(name, wins) of the n best players."""
+        with self.lock:
+            return self.leaderboard.top(n)
     
     def print_scores(self):
+        self.flush()
         print("\n--- Overall Scoreboard ---")
-        if not self.scores:
-            print("No games with a winner have been played yet.")
-            return
-        
-        for player_name, score in self.scores.items():
-            print(f"Player: {player_name:<10} | Wins: {score}")
+        with self.lock:
+            if not self.stats:
+                print("No games have been played yet.")
+                return
+            ranking=self.leaderboard.top(len(self.leaderboard))
+            for player_name, score in ranking:
+                stats=self.stats[player_name]
+                print(f"Player: {player_name:<10} | Wins: {score} | Draws: {stats.draws} | Games: {stats.games}")
         print("--------------------------\n")
         
 
 class Game(GameSubject):
-    def __init__(self, player1:Player, player2:Player):
+    def __init__(self, player1:Player, player2:Player, size:int=3, win_length:int=None, bitboard:bool=False):
+        """
+        :param size: Board is size x size
+        :param win_length: Symbols in a row needed to win, defaults to a full row, column or diagonal
+        :param bitboard: Play on a BitBoard instead of a board of Cells
+        """
         super().__init__()
-        self.board=Board(3)
+        win_length=size if win_length is None else win_length
+        if size<1 or not 1<=win_length<=size:
+            raise ValueError(f"Invalid rules: {win_length} in a row on a {size}x{size} board")
+        self.board=BitBoard(size) if bitboard else Board(size)
+        self.win_length=win_length
         self.player1=player1
         self.player2=player2
         self.state=InProgressState()
         self.status=GameStatus.InProgress
         self.winner=None
-        self.winning_strategies=[RowWinningStrategy(), ColumnWinningStrategy(), DiagonalWinningStrategy()]
+        if win_length==size:
+            self.winning_strategies=[IncrementalWinningStrategy()]
+        else:
+            self.winning_strategies=[KInARowWinningStrategy(win_length)]
         self.current_player=player1
+        self.id=str(uuid.uuid4())
+        # moves on one game are serialized, moves on different games never contend
+        self.lock=threading.Lock()
+        self.last_active=time.monotonic()
 
     def make_move(self, player:Player, row:int, col:int):
         self.state.handle_move(self, player, row, col)
@@ -239,6 +526,21 @@ class Game(GameSubject):
 
     def get_board(self)->Board:
         return self.board
+
+    def get_win_length(self)->int:
+        return self.win_length
+
+    def get_id(self)->str:
+        return self.id
+
+    def get_player(self, name:str)->Optional[Player]:
+        for player in (self.player1, self.player2):
+            if player.get_name()==name:
+                return player
+        return None
+
+    def touch(self):
+        self.last_active=time.monotonic()
     
     def get_current_player(self)->Player:
         return self.current_player
@@ -0,0 +1,544 @@
+"""TicTacToe Benchmarks
+Run from this directory:
+    python TicTacToeBenchmark.py win_check           # WinTracker vs rescanning strategies, per move, across board sizes
+    python TicTacToeBenchmark.py k_in_a_row          # move + k in a row check latency vs board size and k
+    python TicTacToeBenchmark.py bitboard            # BitBoard vs Cell board: memory, moves/s, copies/s
+    python TicTacToeBenchmark.py ai                  # minimax search: depth, nodes/sec, transposition table hit rate
+    python TicTacToeBenchmark.py server              # thousands of concurrent matches against TicTacToeServer
+    python TicTacToeBenchmark.py scoreboard          # async batched Scoreboard updates and leaderboard queries
+    python TicTacToeBenchmark.py replay              # games replayed per second from a binary move log
+    python TicTacToeBenchmark.py book                # opening book generation, lookups vs searching, agreement with minimax
+    python TicTacToeBenchmark.py --output results.json win_check
+
+With --output every benchmark's rows are written as JSON for regression tracking.
+Rows with a "mismatches" column compare a fast path against the reference code; the run exits with status 1
+if any of them is non zero.
+"""
+import asyncio
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+import tracemalloc
+from TicTacToeAbstraction import (BitBoard, Board, ColumnWinningStrategy, DiagonalWinningStrategy, Game, GameStatus,
+                                  IncrementalWinningStrategy, InvalidMoveException, KInARowWinningStrategy, Player, RowWinningStrategy, Scoreboard,
+                                  Symbol)
+from TicTacToeAI import WIN, AIPlayer, MinimaxSearch
+from OpeningBook import LOSS, OpeningBook
+from ReplayEngine import OUTCOMES, MoveLog, ReplayEngine
+from TicTacToeServer import TicTacToeServer
+from TicTacToeSystem import TicTacToeSystem
+
+
+def random_moves(size:int, rng:random.Random, limit:int=None)->list:
+    cells=[(row, col) for row in range(size) for col in range(size)]
+    rng.shuffle(cells)
+    return cells[:limit] if limit is not None else cells
+
+
+def line_game(size:int, kind:str, rng:random.Random)->list:
+    """Moves of a game where X completes one row, column or diagonal (in random order) while O plays elsewhere."""
+    index=rng.randrange(size)
+    line={"row": [(index, col) for col in range(size)], "col": [(row, index) for row in range(size)],
+          "diagonal": [(i, i) for i in range(size)], "anti_diagonal": [(i, size-1-i) for i in range(size)]}[kind]
+    rng.shuffle(line)
+    taken=set(line)
+    others=[cell for cell in random_moves(size, rng) if cell not in taken]
+    moves=[]
+    for x_move, o_move in zip(line, others):
+        moves.extend((x_move, o_move))
+    return moves
+
+
+def win_check(sizes=(3, 10, 30, 100), games:int=20, max_moves:int=2000, seed:int=41)->list[dict]:
+    """
+    Plays `games` random games per size, up to `max_moves` moves each, plus one game per line kind that X wins,
+    and times the win check after every move: the three rescanning strategies together against
+    IncrementalWinningStrategy. Both answers are compared on every move, mismatches must be 0.
+    Games keep going after a win so late, dense positions are measured too.
+    """
+    rng=random.Random(seed)
+    players=[Player("X", Symbol.X), Player("O", Symbol.O)]
+    scanning=[RowWinningStrategy(), ColumnWinningStrategy(), DiagonalWinningStrategy()]
+    incremental=IncrementalWinningStrategy()
+    results=[]
+    for size in sizes:
+        moves=scan_ns=tracker_ns=mismatches=wins=0
+        kinds=("row", "col", "diagonal", "anti_diagonal")
+        for game in [random_moves(size, rng, max_moves) for _ in range(games)]+[line_game(size, kind, rng) for kind in kinds]:
+            board=Board(size)
+            for turn, (row, col) in enumerate(game):
+                player=players[turn%2]
+                board.make_move(row, col, player)
+                t0=time.perf_counter_ns()
+                scanned=any(strategy.check_winner(board, player) for strategy in scanning)
+                t1=time.perf_counter_ns()
+                tracked=incremental.check_winner(board, player)
+                t2=time.perf_counter_ns()
+                scan_ns+=t1-t0
+                tracker_ns+=t2-t1
+                moves+=1
+                mismatches+=scanned!=tracked
+                wins+=tracked
+        results.append({"size": size, "moves": moves, "scan_us_per_move": round(scan_ns/moves/1000, 3),
+                        "tracker_us_per_move": round(tracker_ns/moves/1000, 3),
+                        "speedup": round(scan_ns/max(tracker_ns, 1), 1), "positions_won": wins, "mismatches": mismatches})
+    return results
+
+
+def scan_k_in_a_row(board:Board, symbol:Symbol, k:int)->bool:
+    """Reference check: every window of k cells on the board."""
+    size=board.get_size()
+    for row in range(size):
+        for col in range(size):
+            for d_row, d_col in KInARowWinningStrategy.DIRECTIONS:
+                end_row, end_col=row+(k-1)*d_row, col+(k-1)*d_col
+                if not (0<=end_row<size and 0<=end_col<size):
+                    continue
+                if all(board.get_cell(row+i*d_row, col+i*d_col).get_symbol()==symbol for i in range(k)):
+                    return True
+    return False
+
+
+def k_in_a_row(sizes=(15, 50, 100, 200), lengths=(3, 5), games:int=5, max_moves:int=4000, verify_up_to:int=15, seed:int=42)->list[dict]:
+    """
+    Plays random games (continuing past wins) and times make_move plus the KInARowWinningStrategy check per move.
+    On boards up to `verify_up_to` the answer after each move is checked against a full board scan;
+    a symbol counts as won once any of its moves completed a run, as a game would have stopped there.
+    """
+    rng=random.Random(seed)
+    players=[Player("X", Symbol.X), Player("O", Symbol.O)]
+    results=[]
+    for size in sizes:
+        for k in lengths:
+            strategy=KInARowWinningStrategy(k)
+            moves=elapsed_ns=wins=0
+            mismatches=0 if size<=verify_up_to else None
+            for _ in range(games):
+                board=Board(size)
+                won=set()
+                for turn, (row, col) in enumerate(random_moves(size, rng, max_moves)):
+                    player=players[turn%2]
+                    t0=time.perf_counter_ns()
+                    board.make_move(row, col, player)
+                    result=strategy.check_winner(board, player)
+                    elapsed_ns+=time.perf_counter_ns()-t0
+                    moves+=1
+                    wins+=result
+                    if result:
+                        won.add(player.get_symbol())
+                    if mismatches is not None and (player.get_symbol() in won)!=scan_k_in_a_row(board, player.get_symbol(), k):
+                        mismatches+=1
+            results.append({"size": size, "k": k, "moves": moves, "us_per_move": round(elapsed_ns/moves/1000, 3),
+                            "winning_moves": wins, "mismatches": mismatches})
+    return results
+
+
+def board_memory(board_class, size:int)->int:
+    tracemalloc.start()
+    before=tracemalloc.take_snapshot()
+    board=board_class(size)
+    after=tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del board
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+
+def bitboard(sizes=(3, 15, 50), games:int=20, copies:int=2000, seed:int=43)->list[dict]:
+    """
+    Per backend and size: memory of an empty board (tracemalloc, for BitBoard the shared per size line tables
+    are built beforehand), moves per second over full random games including the win check, and copies per
+    second of a half full board. Both backends replay the same games and must agree after every move.
+    """
+    rng=random.Random(seed)
+    players=[Player("X", Symbol.X), Player("O", Symbol.O)]
+    results=[]
+    for size in sizes:
+        BitBoard(size)
+        plays=[random_moves(size, rng) for _ in range(games)]
+        outcomes={}
+        for board_class in (Board, BitBoard):
+            memory=board_memory(board_class, size)
+            trace=[]
+            start=time.perf_counter()
+            for moves in plays:
+                board=board_class(size)
+                for turn, (row, col) in enumerate(moves):
+                    player=players[turn%2]
+                    board.make_move(row, col, player)
+                    trace.append(board.has_won(player.get_symbol()))
+                board.is_full()
+            elapsed=time.perf_counter()-start
+            outcomes[board_class]=trace
+            board=board_class(size)
+            for turn, (row, col) in enumerate(plays[0][:size*size//2]):
+                board.make_move(row, col, players[turn%2])
+            copy_start=time.perf_counter()
+            for _ in range(copies):
+                board.copy()
+            copy_elapsed=time.perf_counter()-copy_start
+            results.append({"backend": board_class.__name__, "size": size, "empty_board_bytes": memory,
+                            "moves_per_sec": round(len(trace)/elapsed), "copies_per_sec": round(copies/copy_elapsed)})
+        results[-1]["mismatches"]=sum(a!=b for a, b in zip(outcomes[Board], outcomes[BitBoard]))
+    return results
+
+
+def ai_search(configs=((3, 3), (4, 3), (4, 4), (7, 4), (15, 5)), time_budget:float=1.0, table_size:int=200_000,
+              small_table:int=500)->list[dict]:
+    """
+    First move search from an empty board per (size, k), with and without symmetry canonicalisation,
+    plus a run with a `small_table` entry table to exercise eviction. Then a full 3x3 game between
+    two AI players, which must be a draw.
+    """
+    results=[]
+    for size, k in configs:
+        for symmetry, entries in ((True, table_size), (False, table_size), (True, small_table)):
+            search=MinimaxSearch(size, k, time_budget, table_size=entries, symmetry=symmetry)
+            move=search.best_move(0, 0, 0)
+            stats=search.stats
+            results.append({"size": size, "k": k, "symmetry": symmetry, "table_size": entries, "move": move,
+                            "depth": stats["depth"], "nodes": stats["nodes"], "seconds": round(stats["seconds"], 3),
+                            "nodes_per_sec": round(stats["nodes_per_sec"]), "tt_hit_rate": round(stats["tt_hit_rate"], 3),
+                            "tt_evictions": stats["tt_evictions"]})
+    x, o=AIPlayer("X", Symbol.X, time_budget), AIPlayer("O", Symbol.O, time_budget)
+    game=Game(x, o, bitboard=True)
+    while game.get_status()==GameStatus.InProgress:
+        player=game.get_current_player()
+        game.make_move(player, *player.choose_move(game))
+    results.append({"size": 3, "k": 3, "self_play": game.get_status().value})
+    return results
+
+
+async def play_matches(port:int, games:int, size:int, rng:random.Random, latencies:list)->int:
+    """One client connection keeping `games` matches open, playing one random move in each of them in turn."""
+    reader, writer=await asyncio.open_connection("127.0.0.1", port)
+
+    async def call(request:dict)->dict:
+        start=time.perf_counter()
+        writer.write(json.dumps(request).encode()+b"\n")
+        await writer.drain()
+        response=json.loads(await reader.readline())
+        latencies.append(time.perf_counter()-start)
+        return response
+
+    matches=[]
+    for _ in range(games):
+        response=await call({"op": "create", "players": ["x", "o"], "size": size})
+        matches.append([response["game"], random_moves(size, rng), 0])
+    moves=0
+    while matches:
+        for match in list(matches):
+            game_id, cells, turn=match
+            row, col=cells[turn]
+            response=await call({"op": "move", "game": game_id, "player": "xo"[turn%2], "row": row, "col": col})
+            moves+=1
+            match[2]+=1
+            if not response["ok"] or response["status"]!="InProgress":
+                matches.remove(match)
+    writer.close()
+    return moves
+
+
+def server_load(clients:int=100, games_per_client:int=30, size:int=3, seed:int=45)->list[dict]:
+    """
+    `clients` connections each keep `games_per_client` matches in flight against a TicTacToeServer in this process,
+    so clients*games_per_client games are open at once. Finished games are then evicted as idle.
+    """
+    rng=random.Random(seed)
+    system=TicTacToeSystem.get_instance()
+
+    async def run()->dict:
+        async with TicTacToeServer(system) as server:
+            latencies=[]
+            start=time.perf_counter()
+            moves=await asyncio.gather(*(play_matches(server.port, games_per_client, size, random.Random(rng.random()), latencies)
+                                         for _ in range(clients)))
+            elapsed=time.perf_counter()-start
+            system.scoreboard.flush()
+            open_games=len(system.games)
+            evicted=system.evict_idle(0)
+            latencies.sort()
+            return {"clients": clients, "concurrent_games": clients*games_per_client, "moves": sum(moves),
+                    "seconds": round(elapsed, 3), "moves_per_sec": round(sum(moves)/elapsed),
+                    "requests_per_sec": round(len(latencies)/elapsed),
+                    "p50_ms": round(latencies[len(latencies)//2]*1000, 3),
+                    "p99_ms": round(latencies[int(len(latencies)*0.99)]*1000, 3),
+                    "errors": server.stats["errors"], "games_before_eviction": open_games, "evicted": evicted}
+
+    with redirect_stdout(io.StringIO()):
+        row=asyncio.run(run())
+    return [row]
+
+
+class FinishedGame:
+    """Just enough of a finished Game for Scoreboard.update."""
+    def __init__(self, player1:Player, player2:Player, winner:Player=None):
+        self.player1=player1
+        self.player2=player2
+        self.winner=winner
+
+    def get_status(self)->GameStatus:
+        if self.winner is None:
+            return GameStatus.Draw
+        return GameStatus.X_Won if self.winner.get_symbol()==Symbol.X else GameStatus.O_Won
+
+    def get_winner(self)->Player:
+        return self.winner
+
+
+def scoreboard_updates(threads:int=8, results_per_thread:int=20_000, players:int=100_000, queries:int=20_000, seed:int=46)->list[dict]:
+    """
+    Threads report finished games to one Scoreboard; the time spent in update() is what a move that ends a game pays.
+    "inline" applies each result under a lock inside update(), as a synchronous observer would.
+    Then rank and top-10 queries over `players` players, against sorting all players per query.
+    """
+    rng=random.Random(seed)
+    roster=[Player(f"p{i}", Symbol.X) for i in range(players)]
+    games=[]
+    for _ in range(threads*results_per_thread):
+        first, second=rng.sample(roster, 2)
+        games.append(FinishedGame(first, second, rng.choice((first, second, None))))
+    results=[]
+    for mode in ("async", "inline"):
+        scoreboard=Scoreboard(verbose=False)
+        update=scoreboard.update
+        if mode=="inline":
+            def update(game, scoreboard=scoreboard):
+                winner=game.get_winner()
+                with scoreboard.lock:
+                    scoreboard._apply(winner.get_name() if winner else None, (game.player1.get_name(), game.player2.get_name()))
+        latencies=[[] for _ in range(threads)]
+
+        def worker(i:int):
+            for game in games[i*results_per_thread:(i+1)*results_per_thread]:
+                t0=time.perf_counter_ns()
+                update(game)
+                latencies[i].append(time.perf_counter_ns()-t0)
+
+        pool=[threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        start=time.perf_counter()
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        submitted=time.perf_counter()-start
+        scoreboard.flush()
+        elapsed=time.perf_counter()-start
+        samples=sorted(latency for thread_latencies in latencies for latency in thread_latencies)
+        games_counted=sum(stats.games for stats in scoreboard.stats.values())//2
+        results.append({"mode": mode, "threads": threads, "results": len(games), "update_p50_us": round(samples[len(samples)//2]/1000, 3),
+                        "update_p99_us": round(samples[int(len(samples)*0.99)]/1000, 3), "submit_seconds": round(submitted, 3),
+                        "applied_per_sec": round(len(games)/elapsed), "games_counted": games_counted})
+
+    wins={name: stats.wins for name, stats in scoreboard.stats.items()}
+    names=list(wins)
+    sample=[rng.choice(names) for _ in range(queries)]
+    start=time.perf_counter()
+    ranks=[scoreboard.get_rank(name) for name in sample]
+    rank_seconds=time.perf_counter()-start
+    start=time.perf_counter()
+    for _ in range(1000):
+        top=scoreboard.top(10)
+    top_seconds=(time.perf_counter()-start)/1000
+    start=time.perf_counter()
+    ordered=sorted(wins.items(), key=lambda item: (-item[1], item[0]))
+    sort_seconds=time.perf_counter()-start
+    mismatches=sum(rank!=1+sum(1 for other in wins.values() if other>wins[name]) for name, rank in zip(sample[:50], ranks[:50]))
+    mismatches+=top!=ordered[:10]
+    results.append({"mode": "queries", "players": len(wins), "rank_us": round(rank_seconds/queries*1e6, 3),
+                    "top10_us": round(top_seconds*1e6, 3), "full_sort_us": round(sort_seconds*1e6, 3), "mismatches": mismatches})
+    return results
+
+
+def random_game(engine:ReplayEngine, rng:random.Random, corrupt:float=0.0)->bytes:
+    """Random moves until someone wins or the board is full; with probability `corrupt` one move is replaced by a random cell."""
+    cells=list(range(engine.geometry.cells))
+    rng.shuffle(cells)
+    masks=[0, 0]
+    moves=bytearray()
+    for turn, cell in enumerate(cells):
+        masks[turn%2]|=1<<cell
+        moves.append(cell)
+        if engine.geometry.wins(masks[turn%2], cell):
+            break
+    if rng.random()<corrupt:
+        moves[rng.randrange(len(moves))]=rng.randrange(engine.geometry.cells)
+    return bytes(moves)
+
+
+def replay_games(games:int=500_000, big_games:int=20_000, object_games:int=20_000, corrupt:float=0.01, seed:int=47)->list[dict]:
+    """
+    Writes `games` random 3x3 games (`corrupt` of them with a bad move) and `big_games` 15x15 five in a row games
+    to move logs, then replays them with ReplayEngine with and without its outcome cache. The baseline replays
+    `object_games` of the 3x3 games through TicTacToeSystem in quiet mode with real Game objects;
+    its outcomes must match the engine's.
+    """
+    rng=random.Random(seed)
+    directory=tempfile.mkdtemp(prefix="tictactoe-replay-")
+    results=[]
+    try:
+        for size, k, count in ((3, 3, games), (15, 5, big_games)):
+            engine=ReplayEngine(size, k)
+            path=os.path.join(directory, f"games-{size}.log")
+            start=time.perf_counter()
+            MoveLog.write(path, size, k, (random_game(engine, rng, corrupt) for _ in range(count)))
+            generate_seconds=time.perf_counter()-start
+            for cached in (False, True):
+                start=time.perf_counter()
+                outcomes, summary=ReplayEngine.replay_log(path, cache_size=1_000_000 if cached else 0)
+                elapsed=time.perf_counter()-start
+                row={"engine": "cached" if cached else "uncached", "size": size, "k": k, "games": count,
+                     "log_bytes": os.path.getsize(path), "seconds": round(elapsed, 3), "games_per_sec": round(count/elapsed)}
+                row.update(summary)
+                results.append(row)
+            if size==3:
+                _, _, logged=MoveLog.read(path)
+                sample=logged[:object_games]
+                system=TicTacToeSystem.get_instance()
+                x, o=Player("x", Symbol.X), Player("o", Symbol.O)
+                mismatches=0
+                with redirect_stdout(io.StringIO()):
+                    start=time.perf_counter()
+                    for moves, outcome in zip(sample, outcomes):
+                        game=system.start_game(x, o)
+                        try:
+                            status=OUTCOMES.index(system.play_moves(game.get_id(), [divmod(cell, size) for cell in moves]).value)
+                        except InvalidMoveException:
+                            status=OUTCOMES.index("Invalid")
+                        system.end_game(game.get_id())
+                        mismatches+=status!=outcome
+                    elapsed=time.perf_counter()-start
+                    system.scoreboard.flush()
+                results.append({"engine": "game_objects", "size": size, "k": k, "games": len(sample), "seconds": round(elapsed, 3),
+                                "games_per_sec": round(len(sample)/elapsed), "mismatches": mismatches})
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+    return results
+
+
+def book_positions(book:OpeningBook, rng:random.Random, count:int, min_stones:int=0)->list:
+    """Distinct in progress positions (x, o) from random playouts with at least `min_stones` stones."""
+    geometry=book.geometry
+    positions=set()
+    while len(positions)<count:
+        cells=list(range(geometry.cells))
+        rng.shuffle(cells)
+        masks=[0, 0]
+        for turn, cell in enumerate(cells[:-1]):
+            masks[turn%2]|=1<<cell
+            if geometry.wins(masks[turn%2], cell):
+                break
+            if turn+1>=min_stones:
+                positions.add(tuple(masks))
+    return list(positions)[:count]
+
+
+def book_lookup(configs=((3, 3, 0), (4, 3, 4), (4, 4, 7)), lookups:int=200_000, searches:int=300, seed:int=48)->list[dict]:
+    """
+    Builds the opening book per (size, k) in a temporary directory and times best move lookups against
+    MinimaxSearch on the same positions (in progress ones with at least the given number of stones, so the
+    exact search finishes). Mismatches count positions where the search value differs from the book's,
+    or where the book move does not keep the value. Then a 3x3 game between two book players, which must be a draw.
+    """
+    rng=random.Random(seed)
+    directory=tempfile.mkdtemp(prefix="tictactoe-book-")
+    results=[]
+    try:
+        for size, k, min_stones in configs:
+            stats=OpeningBook.generate(size, k, directory=directory)
+            book=OpeningBook(OpeningBook.book_path(directory, size, k))
+            geometry=book.geometry
+            positions=book_positions(book, rng, searches, min_stones)
+            probes=[positions[i%len(positions)] for i in range(lookups)]
+            start=time.perf_counter()
+            for x, o in probes:
+                book.probe(x, o)
+            lookup_seconds=time.perf_counter()-start
+            search=MinimaxSearch(size, k, time_budget=60.0)
+            mismatches=0
+            start=time.perf_counter()
+            for x, o in positions:
+                side=(x|o).bit_count()%2
+                me, opponent=(x, o) if side==0 else (o, x)
+                search.best_move(me, opponent, side)
+                score=search.stats["score"]
+                expected=(score>0)-(score<0) if abs(score)>WIN-1000 else 0
+                value, cell=book.probe(x, o)
+                child=(x|1<<cell, o) if side==0 else (x, o|1<<cell)
+                child_value=book.value(*child)
+                if value!=expected or -child_value!=value and not (value==1 and child_value==LOSS):
+                    mismatches+=1
+            search_seconds=time.perf_counter()-start
+            results.append({"size": size, "k": k, "positions": stats["positions"], "file_bytes": stats["file_bytes"],
+                            "generate_seconds": stats["seconds"], "lookups_per_sec": round(lookups/lookup_seconds),
+                            "search_ms_per_move": round(search_seconds/len(positions)*1000, 3), "checked": len(positions),
+                            "mismatches": mismatches})
+            book.close()
+        book=OpeningBook(OpeningBook.book_path(directory, 3, 3))
+        x, o=AIPlayer("X", Symbol.X, book=book), AIPlayer("O", Symbol.O, book=book)
+        game=Game(x, o, bitboard=True)
+        book_moves=0
+        while game.get_status()==GameStatus.InProgress:
+            player=game.get_current_player()
+            game.make_move(player, *player.choose_move(game))
+            book_moves+=player.get_stats().get("book", False)
+        results.append({"size": 3, "k": 3, "self_play": game.get_status().value, "book_moves": book_moves})
+        book.close()
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+    return results
+
+
+def print_rows(rows:list[dict])->None:
+    for row in rows:
+        print(" | ".join(f"{key}: {value}" for key, value in row.items()))
+
+
+BENCHMARKS={
+    "win_check": win_check,
+    "k_in_a_row": k_in_a_row,
+    "bitboard": bitboard,
+    "ai": ai_search,
+    "server": server_load,
+    "scoreboard": scoreboard_updates,
+    "replay": replay_games,
+    "book": book_lookup,
+}
+
+
+def main(args:list[str])->None:
+    output=None
+    if "--output" in args:
+        position=args.index("--output")
+        output=args[position+1]
+        args=args[:position]+args[position+2:]
+    report={"python": platform.python_version(), "timestamp": time.time(), "benchmarks": {}}
+    failed=[]
+    for name in args or list(BENCHMARKS):
+        print(f"--- {name} ---")
+        rows=BENCHMARKS[name]()
+        print_rows(rows)
+        report["benchmarks"][name]=rows
+        if any(row.get("mismatches") for row in rows):
+            failed.append(name)
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {output}")
+    if failed:
+        print(f"Mismatches against the reference implementation in: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__=='__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,128 @@
+import asyncio
+import json
+from typing import Dict, Optional
+from TicTacToeAbstraction import InvalidMoveException, Player, Symbol
+from TicTacToeSystem import TicTacToeSystem
+
+
+# asyncio front end for TicTacToeSystem on a local TCP socket. The protocol is one JSON object per line each way:
+#   {"op": "create", "players": ["alice", "bob"], "size": 3, "win_length": 3}  -> {"ok": true, "game": id}
+#   {"op": "move", "game": id, "player": "alice", "row": 0, "col": 0}          -> {"ok": true, "status": "InProgress", "winner": null}
+#   {"op": "state", "game": id}                                                -> {"ok": true, "status": ..., "current": "bob", "moves": 1}
+#   {"op": "end", "game": id}                                                  -> {"ok": true}
+# Errors come back as {"ok": false, "error": message}, also for malformed requests and unexpected failures,
+# the connection stays open. Boards are capped at max_size. Games without a move for idle_timeout seconds are evicted.
+class TicTacToeServer:
+    def __init__(self, system:TicTacToeSystem=None, host:str="127.0.0.1", port:int=0, idle_timeout:float=300.0,
+                 sweep_interval:float=30.0, max_size:int=50):
+        self.system=system or TicTacToeSystem.get_instance()
+        self.max_size=max_size
+        self.host=host
+        self.port=port
+        self.idle_timeout=idle_timeout
+        self.sweep_interval=sweep_interval
+        self.server:Optional[asyncio.AbstractServer]=None
+        self.sweeper:Optional[asyncio.Task]=None
+        self.stats={"requests": 0, "errors": 0, "evicted": 0}
+
+    async def start(self)->int:
+        """Start listening, returns the bound port."""
+        self.server=await asyncio.start_server(self._serve, self.host, self.port)
+        self.port=self.server.sockets[0].getsockname()[1]
+        self.sweeper=asyncio.create_task(self._sweep())
+        return self.port
+
+    async def stop(self):
+        if self.sweeper is not None:
+            self.sweeper.cancel()
+            self.sweeper=None
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server=None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _sweep(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            self.stats["evicted"]+=self.system.evict_idle(self.idle_timeout)
+
+    async def _serve(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter):
+        try:
+            while True:
+                line=await reader.readline()
+                if not line:
+                    break
+                writer.write(json.dumps(self.handle(line)).encode()+b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def handle(self, line:bytes)->Dict:
+        self.stats["requests"]+=1
+        try:
+            request=json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("A request must be a JSON object")
+            handler=getattr(self, f"_op_{request.get('op')}", None)
+            if handler is None:
+                raise ValueError(f"Unknown op {request.get('op')}")
+            return handler(request)
+        except (InvalidMoveException, ValueError, KeyError, TypeError) as e:
+            self.stats["errors"]+=1
+            return {"ok": False, "error": str(e)}
+        except Exception as e:
+            self.stats["errors"]+=1
+            return {"ok": False, "error": f"Internal error: {type(e).__name__}"}
+
+    def _game(self, request:Dict):
+        game=self.system.get_game(request["game"])
+        if game is None:
+            raise InvalidMoveException(f"No game with id {request['game']}")
+        return game
+
+    def _op_create(self, request:Dict)->Dict:
+        first, second=request["players"]
+        size, win_length=request.get("size", 3), request.get("win_length")
+        if type(size) is not int or not 1<=size<=self.max_size:
+            raise ValueError(f"size must be an integer from 1 to {self.max_size}")
+        if win_length is not None and type(win_length) is not int:
+            raise ValueError("win_length must be an integer")
+        game=self.system.start_game(Player(first, Symbol.X), Player(second, Symbol.O),
+                                    size, win_length, request.get("bitboard", True))
+        return {"ok": True, "game": game.get_id()}
+
+    def _op_move(self, request:Dict)->Dict:
+        game=self._game(request)
+        player=game.get_player(request["player"])
+        if player is None:
+            raise InvalidMoveException(f"{request['player']} is not playing this game")
+        self.system.submit_move(game.get_id(), player, request["row"], request["col"])
+        winner=game.get_winner()
+        return {"ok": True, "status": game.get_status().value, "winner": winner.get_name() if winner else None}
+
+    def _op_state(self, request:Dict)->Dict:
+        game=self._game(request)
+        return {"ok": True, "status": game.get_status().value, "current": game.get_current_player().get_name(),
+                "moves": game.get_board().moves_made}
+
+    def _op_end(self, request:Dict)->Dict:
+        return {"ok": self.system.end_game(request["game"])}
+
+
+async def main(port:int=8765):
+    async with TicTacToeServer(port=port) as server:
+        print(f"TicTacToe server listening on {server.host}:{server.port}")
+        await asyncio.Event().wait()
+
+
+if __name__=='__main__':
+    asyncio.run(main())
@@ -1,5 +1,9 @@
 import threading
-from TicTacToeAbstraction import Scoreboard, Game, Player, InvalidMoveException
+import time
+from typing import Dict, List, Optional, Tuple
+from TicTacToeAbstraction import Scoreboard, Game, GameStatus, Player, InvalidMoveException, Symbol
+from TicTacToeAI import AIPlayer, BoardGeometry, MinimaxSearch
+from OpeningBook import OpeningBook
 
 class TicTacToeSystem:
     _instance=None
@@ -14,36 +18,156 @@ class TicTacToeSystem:
     
     def __init__(self):
         if not hasattr(self, 'initialized'):
-            self.games={}
+            # registry of every running game by id, games_lock only guards adding and removing entries
+            self.games:Dict[str,Game]={}
+            self.games_lock=threading.Lock()
+            self.game=None
+            self.quiet=False
+            # directory of opening books built with OpeningBook.generate, hint() searches when it is None
+            self.book_dir=None
             self.scoreboard=Scoreboard()  # The system now manages a scoreboard
             self.initialized=True
 
     @classmethod
     def get_instance(cls):
         return cls._instance or cls()
+
+    def start_game(self, player1:Player, player2:Player, size:int=3, win_length:int=None, bitboard:bool=False)->Game:
+        """Register a new game without printing, its id is game.get_id()."""
+        game=Game(player1, player2, size, win_length, bitboard)
+        game.add_observer(self.scoreboard)
+        with self.games_lock:
+            self.games[game.get_id()]=game
+        return game
     
-    def create_game(self, player1:Player, player2:Player)->Game:
-        self.game = Game(player1, player2)
-        self.game.add_observer(self.scoreboard)
+    def create_game(self, player1:Player, player2:Player, size:int=3, win_length:int=None, bitboard:bool=False)->Game:
+        self.game = self.start_game(player1, player2, size, win_length, bitboard)
         # self.game = game  # Track the current game instance
         print(f"Game started between {player1.get_name()} (X) and {player2.get_name()} (O).")
+        return self.game
+
+    def get_game(self, game_id:str)->Optional[Game]:
+        return self.games.get(game_id)
 
-    def make_move(self,player:Player, row:int, col:int):
-        game=self.game
+    def submit_move(self, game_id:str, player:Player, row:int, col:int)->Game:
+        """Play a move on the game with this id under the game's own lock, raises InvalidMoveException."""
+        game=self.games.get(game_id)
         if game is None:
+            raise InvalidMoveException(f"No game with id {game_id}")
+        with game.lock:
+            game.make_move(player, row, col)
+            game.touch()
+        return game
+
+    def end_game(self, game_id:str)->bool:
+        with self.games_lock:
+            game=self.games.pop(game_id, None)
+        if game is self.game:
+            self.game=None
+        return game is not None
+
+    def evict_idle(self, max_idle:float, now:float=None)->int:
+        """Drop games without a move for more than max_idle seconds, finished or not. Returns how many."""
+        now=time.monotonic() if now is None else now
+        idle=[game_id for game_id, game in list(self.games.items()) if now-game.last_active>max_idle]
+        for game_id in idle:
+            self.end_game(game_id)
+        return len(idle)
+
+    def set_quiet(self, quiet:bool):
+        """In quiet mode make_move prints nothing and raises InvalidMoveException instead of printing it."""
+        self.quiet=quiet
+
+    @staticmethod
+    def _check_moves(game:Game, moves:List[Tuple[int,int]]):
+        """Raise InvalidMoveException unless every move can be played in turn, nothing is applied."""
+        board=game.get_board()
+        size=board.get_size()
+        geometry=BoardGeometry.get(size, game.get_win_length())
+        masks=AIPlayer.read_board(board)
+        stones=[masks[Symbol.X], masks[Symbol.O]]
+        side=0 if game.get_current_player().get_symbol()==Symbol.X else 1
+        over=game.get_status()!=GameStatus.InProgress
+        for turn, (row, col) in enumerate(moves):
+            if over:
+                raise InvalidMoveException(f"Move {turn} at ({row}, {col}) comes after the end of the game")
+            if not (0<=row<size and 0<=col<size):
+                raise InvalidMoveException(f"Move {turn} at ({row}, {col}) is off the board")
+            cell=row*size+col
+            if (stones[0]|stones[1])>>cell & 1:
+                raise InvalidMoveException(f"Move {turn} at ({row}, {col}) is on a taken cell")
+            stones[side]|=1<<cell
+            over=geometry.wins(stones[side], cell) or stones[0]|stones[1]==geometry.full
+            side^=1
+
+    def play_moves(self, game_id:str, moves:List[Tuple[int,int]])->GameStatus:
+        """
+        Apply a move sequence without any output, players alternate starting with the player to move.
+        The whole sequence is checked first, an invalid move raises InvalidMoveException and leaves the game untouched.
+        """
+        game=self.games.get(game_id)
+        if game is None:
+            raise InvalidMoveException(f"No game with id {game_id}")
+        with game.lock:
+            self._check_moves(game, moves)
+            for row, col in moves:
+                game.make_move(game.get_current_player(), row, col)
+            game.touch()
+        return game.get_status()
+
+    def make_move(self,player:Player, row:int, col:int, game_id:str=None):
+        game=self.game if game_id is None else self.games.get(game_id)
+        if game is None:
+            if self.quiet:
+                raise InvalidMoveException("No game in progress")
             print("No game in progress. Please create a game first.")
             return
+        if self.quiet:
+            self.submit_move(game.get_id(), player, row, col)
+            return
         
         try:
             print(f"{player.get_name()} plays at ({row}, {col})")
-            self.game.make_move(player, row, col)
-            self.print_board()
-            print(f"Game Status: {self.game.get_status().value}")
-            if self.game.get_winner() is not None:
-                print(f"Winner: {self.game.get_winner().get_name()}")
+            self.submit_move(game.get_id(), player, row, col)
+            if game.get_status()!=GameStatus.InProgress:
+                # interactive play: let the scoreboard line print before the board
+                self.scoreboard.flush()
+            game.get_board().print_board()
+            print(f"Game Status: {game.get_status().value}")
+            if game.get_winner() is not None:
+                print(f"Winner: {game.get_winner().get_name()}")
         except InvalidMoveException as e:
             print(f"Error: {e}")
 
+    def make_ai_move(self, player:AIPlayer, game_id:str=None):
+        """Let an AIPlayer pick its move on the game (the current one by default) and play it."""
+        game=self.game if game_id is None else self.games.get(game_id)
+        if game is None:
+            print("No game in progress. Please create a game first.")
+            return
+        row, col=player.choose_move(game)
+        self.make_move(player, row, col, game.get_id())
+
+    def set_book_dir(self, directory:Optional[str]):
+        """Let hint() read opening books from `directory`, books are only read there, never built."""
+        self.book_dir=directory
+
+    def hint(self, game_id:str=None, time_budget:float=1.0)->Optional[Tuple[int,int]]:
+        """Best (row, col) for the player to move, from an opening book in book_dir when there is one, else a search."""
+        game=self.game if game_id is None else self.games.get(game_id)
+        if game is None or game.get_status()!=GameStatus.InProgress:
+            return None
+        board=game.get_board()
+        masks=AIPlayer.read_board(board)
+        symbol=game.get_current_player().get_symbol()
+        me, opponent=(masks[Symbol.X], masks[Symbol.O]) if symbol==Symbol.X else (masks[Symbol.O], masks[Symbol.X])
+        side=0 if symbol==Symbol.X else 1
+        book=OpeningBook.get(self.book_dir, board.get_size(), game.get_win_length()) if self.book_dir else None
+        move=book.best_move(me, opponent, side) if book is not None else None
+        if move is None:
+            move=MinimaxSearch(board.get_size(), game.get_win_length(), time_budget).best_move(me, opponent, side)
+        return move
+
     def print_board(self):
         if hasattr(self, 'game') and self.game is not None:
             self.game.get_board().print_board()
@@ -51,4 +175,4 @@ class TicTacToeSystem:
             print("No game in progress. Please create a game first.")
     
     def print_score_board(self):
-        self.scoreboard.print_scores()
\ No newline at end of file
+        self.scoreboard.print_scores()
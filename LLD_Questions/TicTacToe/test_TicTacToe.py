@@ -0,0 +1,83 @@
+import random
+import pytest
+from Leaderboard import Leaderboard
+from TicTacToeAbstraction import (BitBoard, Board, ColumnWinningStrategy, DiagonalWinningStrategy, IncrementalWinningStrategy,
+                                  InvalidMoveException, KInARowWinningStrategy, Player, RowWinningStrategy, Symbol)
+from TicTacToeBenchmark import line_game, random_moves, scan_k_in_a_row
+
+PLAYERS=[Player("X", Symbol.X), Player("O", Symbol.O)]
+
+
+def test_incremental_strategy_matches_scanning_strategies():
+    rng=random.Random(1)
+    scanning=[RowWinningStrategy(), ColumnWinningStrategy(), DiagonalWinningStrategy()]
+    incremental=IncrementalWinningStrategy()
+    for size in (1, 2, 3, 4, 7):
+        games=[random_moves(size, rng) for _ in range(30)]
+        games+=[line_game(size, kind, rng) for kind in ("row", "col", "diagonal", "anti_diagonal")]
+        for game in games:
+            board=Board(size)
+            for turn, (row, col) in enumerate(game):
+                player=PLAYERS[turn%2]
+                board.make_move(row, col, player)
+                scanned=any(strategy.check_winner(board, player) for strategy in scanning)
+                assert incremental.check_winner(board, player)==scanned, (size, game[:turn+1])
+
+
+def test_k_in_a_row_matches_full_scan():
+    rng=random.Random(2)
+    for size, k in ((5, 3), (6, 4), (9, 5), (4, 4)):
+        strategy=KInARowWinningStrategy(k)
+        for _ in range(20):
+            board=Board(size)
+            won=set()
+            for turn, (row, col) in enumerate(random_moves(size, rng)):
+                player=PLAYERS[turn%2]
+                board.make_move(row, col, player)
+                if strategy.check_winner(board, player):
+                    won.add(player.get_symbol())
+                # a symbol stays won once one of its moves completed a run, as the game would have ended there
+                assert (player.get_symbol() in won)==scan_k_in_a_row(board, player.get_symbol(), k), (size, k)
+
+
+def test_bitboard_matches_board():
+    rng=random.Random(3)
+    for size in (1, 3, 4, 8):
+        for _ in range(20):
+            board, bits=Board(size), BitBoard(size)
+            moves=random_moves(size, rng)
+            for turn, (row, col) in enumerate(moves):
+                player=PLAYERS[turn%2]
+                assert board.make_move(row, col, player)==bits.make_move(row, col, player)
+                for symbol in (Symbol.X, Symbol.O):
+                    assert board.has_won(symbol)==bits.has_won(symbol)
+                assert board.is_full()==bits.is_full()
+                # an occupied cell is refused by both
+                for backend in (board, bits):
+                    with pytest.raises(InvalidMoveException):
+                        backend.make_move(row, col, player)
+            copy=bits.copy()
+            assert copy==bits
+            for row in range(size):
+                for col in range(size):
+                    assert board.get_cell(row, col).get_symbol()==bits.get_cell(row, col).get_symbol()
+                    assert copy.get_cell(row, col).get_symbol()==bits.get_cell(row, col).get_symbol()
+
+
+def test_leaderboard_rank_and_top_match_full_sort():
+    rng=random.Random(4)
+    leaderboard=Leaderboard(capacity=4)
+    wins={}
+    for step in range(3000):
+        name=f"p{rng.randrange(200)}"
+        # mostly one more win, sometimes a jump past the tree's capacity or a correction downwards
+        wins[name]=max(0, wins.get(name, 0)+rng.choice((1, 1, 1, 0, -1, rng.randrange(100))))
+        leaderboard.set(name, wins[name])
+        if step%50==0:
+            ordered=sorted(wins.items(), key=lambda item: (-item[1], item[0]))
+            for n in (0, 1, 10, len(wins), len(wins)+5):
+                assert leaderboard.top(n)==ordered[:n]
+            for other in wins:
+                assert leaderboard.rank(other)==1+sum(1 for count in wins.values() if count>wins[other])
+    assert leaderboard.rank("nobody") is None
+    assert len(leaderboard)==len(wins)
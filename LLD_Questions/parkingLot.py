@@ -15,6 +15,7 @@ Entities: ParkingSpot: the smallest entity, spot where the vehicle is parked. Ha
             MostFreeSpotsParkingStrategy: parks vehicle in the floor with most free spots
             ParkingManager: manages parking strategies, has methods to park vehicle using different strategies
 """
+from time import perf_counter_ns
 
 
 class Solution:
@@ -27,7 +28,7 @@ class Solution:
         self.park_manager = ParkingManager()
         self.search_manager = SearchManager()
         # helper.println(f"going to initialize floors {len(parking)}")
-        self.floors = [ParkingFloor(i, parking[i], self.vehicle_types, helper) for i in range(len(parking))]
+        self.floors = [ParkingFloor(i, parking[i], self.vehicle_types) for i in range(len(parking))]
 
     def park_vehicle(self, vehicle_type:int, vechicle_number:str,ticket_id:str,parking_strategy:int)->str:
         spot_id=self.park_manager.park(self.floors, vehicle_type, parking_strategy)
@@ -45,6 +46,22 @@ class Solution:
     def search_vehicle(self, query:str)->str:
         return self.search_manager.search(query)
 
+    def enable_metrics(self, metrics)->None:
+        """
+        Attach a metrics recorder (see parkingLotMetrics.ParkingMetrics) to the manager and every floor.
+        With no recorder attached the parking path only pays a None check.
+        """
+        self.park_manager.metrics = metrics
+        for floor in self.floors:
+            floor.metrics = metrics
+            for vehicle_type in self.vehicle_types:
+                metrics.record_occupancy(floor, vehicle_type)
+
+    def disable_metrics(self)->None:
+        self.park_manager.metrics = None
+        for floor in self.floors:
+            floor.metrics = None
+
 class SearchManager:
     def __init__(self):
         self.cache={}
@@ -67,38 +84,57 @@ class ParkingFloor:
         :param parking_floor: 2D list representing parking spots on the floor
         :param vehicle_types: List of vehicle types that can be parked on this floor
         """
-        self.parking_spots=[[None for _ in range(len(parking_floor[0]))] for _ in range(len(parking_floor ))]
+        self.floor=floor
+        self.rows=len(parking_floor)
+        self.cols=len(parking_floor[0]) if parking_floor else 0
+        self.parking_spots=[[None for _ in range(self.cols)] for _ in range(self.rows)]
         self.free_spots_count={vehicle_type:0 for vehicle_type in vehicle_types}
+        self.metrics=None
 
-        for row in range(len(parking_floor)):
-            for col in range(len(parking_floor[0])):
+        for row in range(self.rows):
+            for col in range(self.cols):
                 if parking_floor[row][col]!=0:
                     vehicle_type=parking_floor[row][col]
                     spot_id=f"{floor}-{row}-{col}"
                     self.parking_spots[row][col]=ParkingSpot(spot_id, vehicle_type)
                     self.free_spots_count[vehicle_type]+=1
-        
-        def get_free_spots_count(self, vehicle_type:int)->int:
-            return self.free_spots_count.get(vehicle_type, 0)
-        
-        def park(self, vehicle_type:int)->str:
-            if self.free_spots_count.get(vehicle_type,0)==0:
-                return ""
-            for row in self.parking_spots:
-                for spot in row:
-                    if spot and spot.get_vehicle_type()==vehicle_type and not spot.is_parked():
-                        spot.park_vehicle()
-                        self.free_spots_count[vehicle_type]-=1
-                        return spot.get_spot_id()
+        self.capacity=dict(self.free_spots_count)
+
+    def get_floor(self)->int:
+        return self.floor
+
+    def get_capacity(self, vehicle_type:int)->int:
+        return self.capacity.get(vehicle_type, 0)
+
+    def get_free_spots_count(self, vehicle_type:int)->int:
+        return self.free_spots_count.get(vehicle_type, 0)
+
+    def park(self, vehicle_type:int)->str:
+        if self.free_spots_count.get(vehicle_type,0)==0:
             return ""
-        
-        def remove(self, row:int, col:int)->bool:
-            if row<0 or row>parking_floor.len() or col<0 or col>=parking_floor[0].len() or self.parking_spots[row][col].is_parked()==False:
-                return False
-            spot=self.parking_spots[row][col]
-            spot.remove_vehicle()
-            self.free_spots_count[spot.get_vehicle_type()]+=1
-            return True
+        for row in self.parking_spots:
+            for spot in row:
+                if spot and spot.get_vehicle_type()==vehicle_type and not spot.is_parked():
+                    spot.park_vehicle()
+                    self.free_spots_count[vehicle_type]-=1
+                    if self.metrics is not None:
+                        self.metrics.record_floor_park(self, vehicle_type, spot.get_spot_id())
+                    return spot.get_spot_id()
+        if self.metrics is not None:
+            self.metrics.record_floor_miss(self, vehicle_type)
+        return ""
+
+    def remove(self, row:int, col:int)->bool:
+        if row<0 or row>=self.rows or col<0 or col>=self.cols:
+            return False
+        spot=self.parking_spots[row][col]
+        if spot is None or not spot.is_parked():
+            return False
+        spot.remove_vehicle()
+        self.free_spots_count[spot.get_vehicle_type()]+=1
+        if self.metrics is not None:
+            self.metrics.record_occupancy(self, spot.get_vehicle_type())
+        return True
 
 class ParkingSpot:
     def __init__(self, spot_it:str, vehicle_type:int):
@@ -146,6 +182,7 @@ class ParkingManager:
         Initialize the park manager with parking strategies.
         """
         self.algorithms = [NearestParkingStrategy(), MostFreeSpotsParkingStrategy()]
+        self.metrics = None
 
     def park(self, floors: list, vehicle_type: int, parking_strategy: int) -> str:
         """
@@ -161,7 +198,13 @@ class ParkingManager:
         """
         if 0 <= parking_strategy < len(self.algorithms):
             strategy = self.algorithms[parking_strategy]
-            return strategy.park(floors, vehicle_type)
+            if self.metrics is None:
+                return strategy.park(floors, vehicle_type)
+            self.metrics.begin_allocation()
+            start = perf_counter_ns()
+            spot_id = strategy.park(floors, vehicle_type)
+            self.metrics.end_allocation(type(strategy).__name__, vehicle_type, perf_counter_ns() - start, spot_id)
+            return spot_id
         return ""
     
 """Strategy 1
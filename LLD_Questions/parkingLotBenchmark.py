@@ -0,0 +1,105 @@
+"""Parking Lot Benchmarks
+Run from this directory:
+    python parkingLotBenchmark.py federation      # ParkingFederation throughput vs worker count
+    python parkingLotBenchmark.py simulation      # trace replay per parking strategy
+    python parkingLotBenchmark.py --output results.json simulation
+
+With --output every benchmark's rows are written as JSON for regression tracking.
+"""
+import json
+import platform
+import random
+import sys
+import time
+from parkingLot import ParkingManager
+from parkingLotFederation import ParkingFederation
+from parkingLotSimulation import TraceGenerator, TraceReplayer
+
+
+def make_parking(floors:int, rows:int, cols:int, rng:random.Random)->list[list[list[int]]]:
+    """Random layout with ~10% empty cells, the rest split between 2 and 4 wheelers."""
+    return [[[rng.choice((0, 2, 4, 4, 4, 2, 4, 2, 4, 4)) for _ in range(cols)] for _ in range(rows)] for _ in range(floors)]
+
+
+def federation_scaling(worker_counts=(1, 2, 4, 8), lots:int=48, floors:int=4, rows:int=20, cols:int=20, rounds:int=20, batch:int=2000, seed:int=7)->list[dict]:
+    """
+    Each round parks `batch` vehicles spread over all lots in one execute_batch call, then removes half of them,
+    so lots fill up over the run. Parking uses NearestParkingStrategy, whose row-major scan grows with occupancy.
+    """
+    results=[]
+    for workers in worker_counts:
+        rng=random.Random(seed)
+        with ParkingFederation(workers) as federation:
+            lot_ids=[f"lot-{i}" for i in range(lots)]
+            for i, lot_id in enumerate(lot_ids):
+                federation.add_lot(lot_id, make_parking(floors, rows, cols, rng), (i%8, i//8))
+            ops=0
+            start=time.perf_counter()
+            for r in range(rounds):
+                parks=[("park", rng.choice(lot_ids), rng.choice((2, 4)), f"V{r}-{i}", f"T{r}-{i}", 0) for i in range(batch)]
+                spots=federation.execute_batch(parks)
+                removes=[("remove", park[1], spot_id) for park, spot_id in zip(parks[::2], spots[::2]) if spot_id!=""]
+                federation.execute_batch(removes)
+                ops+=len(parks)+len(removes)
+            elapsed=time.perf_counter()-start
+            query_start=time.perf_counter()
+            federation.find_nearest(4, (3.5, 2.5), 3)
+            federation.get_free_spots_count(4)
+            query_ms=(time.perf_counter()-query_start)*1000
+        results.append({"workers": workers, "ops": ops, "seconds": round(elapsed, 3), "ops_per_sec": round(ops/elapsed), "scatter_query_ms": round(query_ms, 3)})
+    return results
+
+
+def trace_simulation(floors:int=5, rows:int=20, cols:int=25, hours:int=48, arrivals_per_hour:int=900, seed:int=11)->list[dict]:
+    """
+    Replays a homogeneous Poisson trace and a diurnal trace (rate swinging 0.1x..1.9x around noon)
+    against a fresh Solution for every strategy in ParkingManager.algorithms.
+    """
+    parking=make_parking(floors, rows, cols, random.Random(seed))
+    replayer=TraceReplayer(parking)
+    scenarios={
+        "poisson": TraceGenerator(arrivals_per_hour, seed=seed),
+        "diurnal": TraceGenerator(arrivals_per_hour, diurnal_amplitude=0.9, seed=seed),
+    }
+    results=[]
+    for scenario, generator in scenarios.items():
+        trace=generator.generate(hours*3600)
+        for strategy in range(len(ParkingManager().algorithms)):
+            row={"scenario": scenario, "events": len(trace)}
+            row.update(replayer.replay(trace, strategy))
+            row["peak_memory_kb"]=round(replayer.peak_memory(trace, strategy)/1024, 1)
+            results.append(row)
+    return results
+
+
+def print_rows(rows:list[dict])->None:
+    for row in rows:
+        print(" | ".join(f"{key}: {value}" for key, value in row.items()))
+
+
+BENCHMARKS={
+    "federation": federation_scaling,
+    "simulation": trace_simulation,
+}
+
+
+def main(args:list[str])->None:
+    output=None
+    if "--output" in args:
+        position=args.index("--output")
+        output=args[position+1]
+        args=args[:position]+args[position+2:]
+    report={"python": platform.python_version(), "timestamp": time.time(), "benchmarks": {}}
+    for name in args or list(BENCHMARKS):
+        print(f"--- {name} ---")
+        rows=BENCHMARKS[name]()
+        print_rows(rows)
+        report["benchmarks"][name]=rows
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {output}")
+
+
+if __name__=='__main__':
+    main(sys.argv[1:])
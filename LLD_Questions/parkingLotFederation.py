@@ -0,0 +1,227 @@
+"""Parking Lot Federation
+Hosts many parking lots (one parkingLot.Solution each) across a pool of worker processes.
+
+Entities: ParkingFederation: router, owns the lot id -> worker mapping and talks to workers over pipes
+          LotWorker: runs inside a worker process, owns the Solution instances of its lots
+
+Every lot lives in exactly one worker, so park/remove/search for a lot is a single round trip.
+Cross-lot queries (nearest free spot, free counts) are scatter-gather: each worker answers for its
+own lots with a few numbers per lot, floors are never shipped back to the router.
+Batches of operations are grouped per worker and sent in one message so workers run them in parallel.
+"""
+import math
+import multiprocessing as mp
+from parkingLot import Solution
+
+
+class LotWorker:
+    def __init__(self):
+        self.lots={}
+        self.locations={}
+
+    def add_lot(self, lot_id:str, parking:list[list[list[int]]], location:tuple)->bool:
+        solution=Solution()
+        solution.init(None, parking)
+        self.lots[lot_id]=solution
+        self.locations[lot_id]=location
+        return True
+
+    def park(self, lot_id:str, vehicle_type:int, vehicle_number:str, ticket_id:str, parking_strategy:int)->str:
+        return self.lots[lot_id].park_vehicle(vehicle_type, vehicle_number, ticket_id, parking_strategy)
+
+    def remove(self, lot_id:str, spot_id:str)->bool:
+        return self.lots[lot_id].remove_vehicle(spot_id)
+
+    def search(self, lot_id:str, query:str)->str:
+        return self.lots[lot_id].search_vehicle(query)
+
+    def search_all(self, query:str)->list[tuple]:
+        return [(lot_id, spot_id) for lot_id, solution in self.lots.items() if (spot_id:=solution.search_vehicle(query))!=""]
+
+    def free_counts(self, vehicle_type:int)->dict:
+        return {lot_id: self.lot_free_count(solution, vehicle_type) for lot_id, solution in self.lots.items()}
+
+    def nearest(self, vehicle_type:int, location:tuple, limit:int)->list[tuple]:
+        """Closest lots of this worker with a free spot, as (distance, lot_id, free)."""
+        candidates=[]
+        for lot_id, solution in self.lots.items():
+            free=self.lot_free_count(solution, vehicle_type)
+            if free>0:
+                candidates.append((math.dist(location, self.locations[lot_id]), lot_id, free))
+        candidates.sort()
+        return candidates[:limit]
+
+    @staticmethod
+    def lot_free_count(solution:Solution, vehicle_type:int)->int:
+        return sum(floor.get_free_spots_count(vehicle_type) for floor in solution.floors)
+
+    def handle(self, op:str, args:tuple):
+        return getattr(self, op)(*args)
+
+    def handle_batch(self, operations:list[tuple])->list[tuple]:
+        """(ok, result or exception) per operation, a failing operation does not stop the ones after it."""
+        replies=[]
+        for op, args in operations:
+            try:
+                replies.append((True, self.handle(op, args)))
+            except Exception as e:
+                replies.append((False, e))
+        return replies
+
+
+def worker_loop(conn)->None:
+    worker=LotWorker()
+    while True:
+        message=conn.recv()
+        if message is None:
+            break
+        kind, payload=message
+        try:
+            if kind=="batch":
+                conn.send((True, worker.handle_batch(payload)))
+            else:
+                conn.send((True, worker.handle(kind, payload)))
+        except Exception as e:
+            conn.send((False, e))
+    conn.close()
+
+
+class ParkingFederation:
+    def __init__(self, workers:int=None, start_method:str=None):
+        """
+        :param workers: Number of worker processes, defaults to the CPU count
+        :param start_method: multiprocessing start method, defaults to the platform default
+        """
+        context=mp.get_context(start_method)
+        self.connections=[]
+        self.processes=[]
+        for _ in range(workers or mp.cpu_count()):
+            parent, child=context.Pipe()
+            process=context.Process(target=worker_loop, args=(child,), daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+        self.lot_workers={}
+        self.worker_load=[0]*len(self.connections)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self)->None:
+        for conn in self.connections:
+            conn.send(None)
+            conn.close()
+        for process in self.processes:
+            process.join()
+        self.connections=[]
+        self.processes=[]
+
+    def call(self, worker:int, op:str, *args):
+        conn=self.connections[worker]
+        conn.send((op, args))
+        return self.receive(conn)
+
+    def scatter(self, op:str, *args)->list:
+        for conn in self.connections:
+            conn.send((op, args))
+        return self.gather(self.connections)
+
+    @staticmethod
+    def receive(conn):
+        ok, result=conn.recv()
+        if not ok:
+            raise result
+        return result
+
+    @staticmethod
+    def gather(connections:list)->list:
+        # drain every reply before raising so no pipe is left with a stale response
+        replies=[conn.recv() for conn in connections]
+        for ok, result in replies:
+            if not ok:
+                raise result
+        return [result for _, result in replies]
+
+    def worker_of(self, lot_id:str)->int:
+        worker=self.lot_workers.get(lot_id)
+        if worker is None:
+            raise KeyError(f"Unknown parking lot {lot_id}")
+        return worker
+
+    def add_lot(self, lot_id:str, parking:list[list[list[int]]], location:tuple=(0, 0))->int:
+        """Place the lot on the least loaded worker and return the worker index."""
+        if lot_id in self.lot_workers:
+            raise ValueError(f"Parking lot {lot_id} already exists")
+        worker=self.worker_load.index(min(self.worker_load))
+        self.call(worker, "add_lot", lot_id, parking, tuple(location))
+        self.lot_workers[lot_id]=worker
+        self.worker_load[worker]+=1
+        return worker
+
+    def park_vehicle(self, lot_id:str, vehicle_type:int, vehicle_number:str, ticket_id:str, parking_strategy:int)->str:
+        return self.call(self.worker_of(lot_id), "park", lot_id, vehicle_type, vehicle_number, ticket_id, parking_strategy)
+
+    def remove_vehicle(self, lot_id:str, spot_id:str)->bool:
+        return self.call(self.worker_of(lot_id), "remove", lot_id, spot_id)
+
+    def search_vehicle(self, query:str, lot_id:str=None):
+        """
+        Search one lot and return its spot id, or search every lot and return the first (lot_id, spot_id) match.
+        """
+        if lot_id is not None:
+            return self.call(self.worker_of(lot_id), "search", lot_id, query)
+        for matches in self.scatter("search_all", query):
+            if matches:
+                return matches[0]
+        return None
+
+    def get_free_spots_count(self, vehicle_type:int)->dict:
+        """Free spots of a vehicle type as {"lots": {lot_id: free}, "total": free over every lot}."""
+        counts={}
+        for worker_counts in self.scatter("free_counts", vehicle_type):
+            counts.update(worker_counts)
+        return {"lots": counts, "total": sum(counts.values())}
+
+    def find_nearest(self, vehicle_type:int, location:tuple, limit:int=1)->list[tuple]:
+        """Closest lots with a free spot for the vehicle type, as (lot_id, distance, free)."""
+        candidates=[]
+        for worker_candidates in self.scatter("nearest", vehicle_type, tuple(location), limit):
+            candidates.extend(worker_candidates)
+        candidates.sort()
+        return [(lot_id, distance, free) for distance, lot_id, free in candidates[:limit]]
+
+    def park_nearest(self, vehicle_type:int, vehicle_number:str, ticket_id:str, parking_strategy:int, location:tuple, attempts:int=3)->tuple:
+        """Park in the nearest lot with room, returning (lot_id, spot_id) or (None, "")."""
+        for lot_id, _, _ in self.find_nearest(vehicle_type, location, attempts):
+            spot_id=self.park_vehicle(lot_id, vehicle_type, vehicle_number, ticket_id, parking_strategy)
+            if spot_id!="":
+                return lot_id, spot_id
+        return None, ""
+
+    def execute_batch(self, operations:list[tuple])->list:
+        """
+        Run many (op, lot_id, *args) operations, op being park/remove/search.
+        Operations are grouped per worker and shipped in one message each, so workers run them in parallel;
+        order is preserved within a lot. Results come back in input order; an operation that raised has its
+        exception in its place instead, the other operations of the batch still run and report their results.
+        """
+        per_worker=[[] for _ in self.connections]
+        positions=[[] for _ in self.connections]
+        for position, (op, lot_id, *args) in enumerate(operations):
+            worker=self.worker_of(lot_id)
+            per_worker[worker].append((op, (lot_id, *args)))
+            positions[worker].append(position)
+        busy=[]
+        for worker, batch in enumerate(per_worker):
+            if batch:
+                self.connections[worker].send(("batch", batch))
+                busy.append(worker)
+        results=[None]*len(operations)
+        for worker, worker_results in zip(busy, self.gather([self.connections[worker] for worker in busy])):
+            for position, (_, result) in zip(positions[worker], worker_results):
+                results[position]=result
+        return results
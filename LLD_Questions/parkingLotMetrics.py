@@ -0,0 +1,172 @@
+"""Parking Lot Metrics
+Optional instrumentation for parkingLot.Solution. Attach with Solution.enable_metrics(ParkingMetrics()).
+
+Records:
+    - allocation latency histogram per parking strategy
+    - scan length (spots inspected) per allocation, per strategy
+    - failed allocations per strategy and floors that returned "" after a full scan
+    - rolling occupancy time series per floor and vehicle type
+
+Export as a plain dict with snapshot() or as Prometheus text exposition with to_prometheus().
+"""
+from bisect import bisect_left
+from collections import deque
+import time
+
+# Upper bounds in nanoseconds, 1us .. 10ms
+LATENCY_BUCKETS_NS=(1_000, 2_500, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000, 10_000_000)
+# Upper bounds in spots inspected
+SCAN_BUCKETS=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+
+class Histogram:
+    def __init__(self, bounds:tuple):
+        """
+        Fixed bucket histogram. counts[i] holds observations <= bounds[i], the last slot is +Inf.
+        """
+        self.bounds=bounds
+        self.counts=[0]*(len(bounds)+1)
+        self.sum=0
+        self.count=0
+
+    def observe(self, value:int)->None:
+        self.counts[bisect_left(self.bounds, value)]+=1
+        self.sum+=value
+        self.count+=1
+
+    def cumulative(self)->list[int]:
+        total=0
+        result=[]
+        for count in self.counts:
+            total+=count
+            result.append(total)
+        return result
+
+    def percentile(self, q:float)->float:
+        """Upper bound of the bucket containing the q-th quantile, inf if it falls in the overflow bucket."""
+        if self.count==0:
+            return 0
+        rank=q*self.count
+        for bound, total in zip(self.bounds+(float("inf"),), self.cumulative()):
+            if total>=rank:
+                return bound
+        return float("inf")
+
+    def to_dict(self)->dict:
+        return {
+            "bounds": list(self.bounds),
+            "counts": list(self.counts),
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+class ParkingMetrics:
+    def __init__(self, window:int=1024, clock=time.time):
+        """
+        :param window: Number of occupancy samples kept per (floor, vehicle type)
+        :param clock: Timestamp source for occupancy samples
+        """
+        self.window=window
+        self.clock=clock
+        self.latency={}
+        self.scan_length={}
+        self.allocations={}
+        self.failures={}
+        self.scan_misses={}
+        self.occupancy={}
+        self.capacity={}
+        self.current_scan=0
+
+    def begin_allocation(self)->None:
+        self.current_scan=0
+
+    def end_allocation(self, strategy:str, vehicle_type:int, latency_ns:int, spot_id:str)->None:
+        if strategy not in self.latency:
+            self.latency[strategy]=Histogram(LATENCY_BUCKETS_NS)
+            self.scan_length[strategy]=Histogram(SCAN_BUCKETS)
+        self.latency[strategy].observe(latency_ns)
+        self.scan_length[strategy].observe(self.current_scan)
+        key=(strategy, vehicle_type)
+        self.allocations[key]=self.allocations.get(key, 0)+1
+        if spot_id=="":
+            self.failures[key]=self.failures.get(key, 0)+1
+
+    def record_floor_park(self, floor, vehicle_type:int, spot_id:str)->None:
+        # spots are scanned row-major, so the position of the chosen spot is the scan length
+        _, row, col=spot_id.split("-")
+        self.current_scan+=int(row)*floor.cols+int(col)+1
+        self.record_occupancy(floor, vehicle_type)
+
+    def record_floor_miss(self, floor, vehicle_type:int)->None:
+        self.current_scan+=floor.rows*floor.cols
+        key=(floor.get_floor(), vehicle_type)
+        self.scan_misses[key]=self.scan_misses.get(key, 0)+1
+
+    def record_occupancy(self, floor, vehicle_type:int)->None:
+        key=(floor.get_floor(), vehicle_type)
+        series=self.occupancy.get(key)
+        if series is None:
+            series=self.occupancy[key]=deque(maxlen=self.window)
+            self.capacity[key]=floor.get_capacity(vehicle_type)
+        series.append((self.clock(), self.capacity[key]-floor.get_free_spots_count(vehicle_type)))
+
+    def snapshot(self)->dict:
+        return {
+            "latency_ns": {strategy: histogram.to_dict() for strategy, histogram in self.latency.items()},
+            "scan_length": {strategy: histogram.to_dict() for strategy, histogram in self.scan_length.items()},
+            "allocations": [
+                {"strategy": strategy, "vehicle_type": vehicle_type, "total": total, "failed": self.failures.get((strategy, vehicle_type), 0)}
+                for (strategy, vehicle_type), total in self.allocations.items()
+            ],
+            "scan_misses": [
+                {"floor": floor, "vehicle_type": vehicle_type, "total": total}
+                for (floor, vehicle_type), total in self.scan_misses.items()
+            ],
+            "occupancy": [
+                {"floor": floor, "vehicle_type": vehicle_type, "capacity": self.capacity[(floor, vehicle_type)], "samples": list(series)}
+                for (floor, vehicle_type), series in self.occupancy.items()
+            ],
+        }
+
+    def to_prometheus(self)->str:
+        lines=[]
+
+        def histogram_lines(name:str, help_text:str, histograms:dict, scale:float):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for strategy, histogram in histograms.items():
+                for bound, total in zip(histogram.bounds, histogram.cumulative()):
+                    lines.append(f'{name}_bucket{{strategy="{strategy}",le="{bound*scale:g}"}} {total}')
+                lines.append(f'{name}_bucket{{strategy="{strategy}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{name}_sum{{strategy="{strategy}"}} {histogram.sum*scale:g}')
+                lines.append(f'{name}_count{{strategy="{strategy}"}} {histogram.count}')
+
+        histogram_lines("parking_allocation_latency_seconds", "Time spent in ParkingManager.park per strategy.", self.latency, 1e-9)
+        histogram_lines("parking_allocation_scan_length", "Spots inspected per allocation.", self.scan_length, 1)
+
+        lines.append("# HELP parking_allocations_total Allocation attempts per strategy and vehicle type.")
+        lines.append("# TYPE parking_allocations_total counter")
+        for (strategy, vehicle_type), total in self.allocations.items():
+            lines.append(f'parking_allocations_total{{strategy="{strategy}",vehicle_type="{vehicle_type}"}} {total}')
+
+        lines.append("# HELP parking_allocation_failures_total Allocations that returned no spot.")
+        lines.append("# TYPE parking_allocation_failures_total counter")
+        for (strategy, vehicle_type), total in self.failures.items():
+            lines.append(f'parking_allocation_failures_total{{strategy="{strategy}",vehicle_type="{vehicle_type}"}} {total}')
+
+        lines.append("# HELP parking_floor_scan_misses_total Floor scans that found no free spot.")
+        lines.append("# TYPE parking_floor_scan_misses_total counter")
+        for (floor, vehicle_type), total in self.scan_misses.items():
+            lines.append(f'parking_floor_scan_misses_total{{floor="{floor}",vehicle_type="{vehicle_type}"}} {total}')
+
+        lines.append("# HELP parking_occupied_spots Latest occupied spot count.")
+        lines.append("# TYPE parking_occupied_spots gauge")
+        for (floor, vehicle_type), series in self.occupancy.items():
+            lines.append(f'parking_occupied_spots{{floor="{floor}",vehicle_type="{vehicle_type}"}} {series[-1][1]}')
+
+        lines.append("# HELP parking_capacity_spots Total spots.")
+        lines.append("# TYPE parking_capacity_spots gauge")
+        for (floor, vehicle_type), capacity in self.capacity.items():
+            lines.append(f'parking_capacity_spots{{floor="{floor}",vehicle_type="{vehicle_type}"}} {capacity}')
+        return "\n".join(lines)+"\n"
@@ -0,0 +1,172 @@
+"""Parking Lot Simulation
+Generates arrival/departure traces and replays them against parkingLot.Solution.
+
+Arrivals follow a Poisson process whose rate can swing over the day (diurnal), simulated by thinning.
+Dwell times are lognormal with a separate mean per vehicle type, 2 wheelers usually staying shorter.
+"""
+import math
+import random
+import time
+import tracemalloc
+from parkingLot import Solution
+
+DAY_SECONDS=24*60*60
+ARRIVE=0
+DEPART=1
+
+
+class TraceEvent:
+    __slots__=("time", "kind", "vehicle_type", "vehicle_number")
+
+    def __init__(self, time:float, kind:int, vehicle_type:int, vehicle_number:str):
+        self.time=time
+        self.kind=kind
+        self.vehicle_type=vehicle_type
+        self.vehicle_number=vehicle_number
+
+    def __lt__(self, other:'TraceEvent')->bool:
+        return (self.time, self.kind)<(other.time, other.kind)
+
+
+class TraceGenerator:
+    def __init__(self, arrivals_per_hour:float, diurnal_amplitude:float=0.0, peak_hour:float=12.0,
+                 two_wheeler_share:float=0.35, mean_dwell_minutes:dict=None, dwell_sigma:float=0.8, seed:int=None):
+        """
+        :param arrivals_per_hour: Mean arrival rate over a day
+        :param diurnal_amplitude: 0 for a homogeneous Poisson process, up to 1 for rate swinging between 0 and 2x the mean
+        :param peak_hour: Hour of the day with the highest arrival rate
+        :param two_wheeler_share: Fraction of arrivals that are 2 wheelers
+        :param mean_dwell_minutes: Mean dwell time per vehicle type
+        :param dwell_sigma: Shape of the lognormal dwell distribution
+        """
+        if not 0<=diurnal_amplitude<=1:
+            raise ValueError("diurnal_amplitude must be between 0 and 1")
+        self.rate=arrivals_per_hour/3600
+        self.amplitude=diurnal_amplitude
+        self.peak=peak_hour*3600
+        self.two_wheeler_share=two_wheeler_share
+        self.mean_dwell=mean_dwell_minutes or {2: 45, 4: 120}
+        self.sigma=dwell_sigma
+        self.rng=random.Random(seed)
+
+    def rate_at(self, t:float)->float:
+        return self.rate*(1+self.amplitude*math.cos(2*math.pi*(t-self.peak)/DAY_SECONDS))
+
+    def dwell(self, vehicle_type:int)->float:
+        # lognormal with the requested mean: mean = exp(mu + sigma^2 / 2)
+        mu=math.log(self.mean_dwell[vehicle_type]*60)-self.sigma**2/2
+        return self.rng.lognormvariate(mu, self.sigma)
+
+    def generate(self, duration_seconds:float)->list[TraceEvent]:
+        """Arrival and departure events sorted by time. Departures past the horizon are dropped."""
+        max_rate=self.rate*(1+self.amplitude)
+        events=[]
+        t=0.0
+        count=0
+        while True:
+            t+=self.rng.expovariate(max_rate)
+            if t>=duration_seconds:
+                break
+            if self.rng.random()*max_rate>self.rate_at(t):
+                continue
+            vehicle_type=2 if self.rng.random()<self.two_wheeler_share else 4
+            vehicle_number=f"V{count}"
+            count+=1
+            events.append(TraceEvent(t, ARRIVE, vehicle_type, vehicle_number))
+            leave=t+self.dwell(vehicle_type)
+            if leave<duration_seconds:
+                events.append(TraceEvent(leave, DEPART, vehicle_type, vehicle_number))
+        events.sort()
+        return events
+
+
+def percentile(sorted_values:list, q:float):
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values)-1, int(q*len(sorted_values)))]
+
+
+def jain_index(values:list[float])->float:
+    """1.0 when all values are equal, 1/n when a single one takes everything."""
+    total=sum(values)
+    squares=sum(value*value for value in values)
+    if squares==0:
+        return 1.0
+    return total*total/(len(values)*squares)
+
+
+class TraceReplayer:
+    def __init__(self, parking:list[list[list[int]]]):
+        self.parking=parking
+
+    def new_solution(self)->Solution:
+        solution=Solution()
+        solution.init(None, self.parking)
+        return solution
+
+    def replay(self, trace:list[TraceEvent], parking_strategy:int)->dict:
+        solution=self.new_solution()
+        spots={}
+        park_latency=[]
+        remove_latency=[]
+        failed=0
+        floors=len(solution.floors)
+        allocations={vehicle_type: [0]*floors for vehicle_type in solution.vehicle_types}
+
+        start=time.perf_counter()
+        for event in trace:
+            if event.kind==ARRIVE:
+                t0=time.perf_counter_ns()
+                spot_id=solution.park_vehicle(event.vehicle_type, event.vehicle_number, event.vehicle_number, parking_strategy)
+                park_latency.append(time.perf_counter_ns()-t0)
+                if spot_id=="":
+                    failed+=1
+                else:
+                    spots[event.vehicle_number]=spot_id
+                    allocations[event.vehicle_type][int(spot_id.split("-", 1)[0])]+=1
+            else:
+                spot_id=spots.pop(event.vehicle_number, None)
+                if spot_id is not None:
+                    t0=time.perf_counter_ns()
+                    solution.remove_vehicle(spot_id)
+                    remove_latency.append(time.perf_counter_ns()-t0)
+        elapsed=time.perf_counter()-start
+
+        park_latency.sort()
+        remove_latency.sort()
+        ops=len(park_latency)+len(remove_latency)
+        fairness={}
+        for vehicle_type, per_floor in allocations.items():
+            # allocations normalised by floor capacity, floors without this vehicle type are ignored
+            shares=[count/floor.get_capacity(vehicle_type) for count, floor in zip(per_floor, solution.floors) if floor.get_capacity(vehicle_type)]
+            fairness[vehicle_type]=round(jain_index(shares), 4) if shares else None
+        return {
+            "strategy": type(solution.park_manager.algorithms[parking_strategy]).__name__,
+            "ops": ops,
+            "seconds": round(elapsed, 4),
+            "ops_per_sec": round(ops/elapsed) if elapsed else None,
+            "park_p50_us": round(percentile(park_latency, 0.50)/1000, 2),
+            "park_p99_us": round(percentile(park_latency, 0.99)/1000, 2),
+            "remove_p50_us": round(percentile(remove_latency, 0.50)/1000, 2),
+            "remove_p99_us": round(percentile(remove_latency, 0.99)/1000, 2),
+            "failed_parks": failed,
+            "allocations_per_floor": {str(vehicle_type): per_floor for vehicle_type, per_floor in allocations.items()},
+            "floor_fairness": {str(vehicle_type): value for vehicle_type, value in fairness.items()},
+        }
+
+    def peak_memory(self, trace:list[TraceEvent], parking_strategy:int)->int:
+        """Peak bytes allocated while building the lot and replaying the trace, measured in a separate run."""
+        tracemalloc.start()
+        try:
+            solution=self.new_solution()
+            spots={}
+            for event in trace:
+                if event.kind==ARRIVE:
+                    spot_id=solution.park_vehicle(event.vehicle_type, event.vehicle_number, event.vehicle_number, parking_strategy)
+                    if spot_id!="":
+                        spots[event.vehicle_number]=spot_id
+                elif event.vehicle_number in spots:
+                    solution.remove_vehicle(spots.pop(event.vehicle_number))
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()